@@ -0,0 +1,176 @@
+"""
+Reply latency benchmark for fast-path acknowledgments
+Runs scripted calls through the entrypoint with FAST_PATH off and on and measures end of turn to first agent audio per answer type
+
+Callers answer the opening's promise question with yes/no, partial, unsure
+and longer answers. A "yes, but..." and a "yeah" to the LLM asking "Did you
+skip the gym again?" must get no acknowledgment.
+Time is measured from the VAD reporting the caller stopped to the first
+agent audio of the reply (the acknowledgment when the fast path takes the
+turn) and to the LLM follow-up. A warm-up round renders the acknowledgments
+into the TTS cache first, as earlier calls on a worker would have.
+
+Usage:
+    python benchmarks/binary_turns.py --calls 40 --llm-ttft-ms 450
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_livekit  # noqa: E402
+from stubs import percentile  # noqa: E402
+from load_harness import room_metadata, start_supermemory_stub  # noqa: E402
+
+# (label, what the caller says); the first turn overlaps the opening and is not measured
+SCRIPT = [
+    ("opening", "Hey."),
+    ("yes", "Yes."),
+    ("no", "No, I didn't."),
+    ("yes", "Yeah I did it."),
+    ("partial", "Kind of, I did half."),
+    ("unsure", "I don't know."),
+    ("other", "I went for a run this morning and then worked on the landing page."),
+    ("negative", "Yeah."),  # answers "Did you skip the gym again?": no "yes" acknowledgment
+    ("no", "Nope."),
+    ("contradicted", "Yes, but I skipped the gym."),  # must not get a "yes" acknowledgment
+]
+
+# The LLM's question after the "other" turn is not the scripted promise question
+NEGATIVE_QUESTION = "Did you skip the gym again?"
+
+MOODS = ["Encouraging", "Confrontational", "Ruthless", "ColdMirror"]
+
+
+def follow_turns(agent, samples: dict):
+    """Record end of turn -> first and last agent audio of each reply; returns a flush for the last turn"""
+    labels = {text: label for label, text in SCRIPT}
+    turn = {"label": None, "stopped": None, "starts": []}
+
+    def flush(*_):
+        if turn["label"] not in (None, "opening") and turn["starts"]:
+            values = samples.setdefault(turn["label"], {"first": [], "follow_up": []})
+            values["first"].append((turn["starts"][0] - turn["stopped"]) * 1000)
+            values["follow_up"].append((turn["starts"][-1] - turn["stopped"]) * 1000)
+        turn.update(label=None, stopped=None, starts=[])
+
+    def user_stopped(*_):
+        turn.update(label=None, stopped=time.perf_counter(), starts=[])
+
+    def user_committed(message):
+        if turn["stopped"] is not None:
+            turn["label"] = labels.get(message.content)
+
+    def agent_started(*_):
+        if turn["stopped"] is not None:
+            turn["starts"].append(time.perf_counter())
+
+    agent.on("user_started_speaking", flush)
+    agent.on("user_stopped_speaking", user_stopped)
+    agent.on("user_speech_committed", user_committed)
+    agent.on("agent_started_speaking", agent_started)
+    return flush
+
+
+async def run_calls(main, args: argparse.Namespace, calls: int, offset: int) -> dict:
+    samples: dict = {}
+
+    async def call(index: int) -> None:
+        ctx = fake_livekit.FakeJobContext(f"room-{index}", room_metadata(index, MOODS, args, None))
+        task = asyncio.current_task()
+        await main.entrypoint(ctx)
+        agent = next(a for a in fake_livekit.CREATED_AGENTS if a.created_in is task)
+        fake_livekit.CREATED_AGENTS.remove(agent)
+        flush = follow_turns(agent, samples)
+        await agent.conversation
+        flush()
+        await ctx.shutdown()
+
+    await asyncio.gather(*(call(offset + index) for index in range(calls)))
+    return samples
+
+
+async def run(args: argparse.Namespace) -> None:
+    port = start_supermemory_stub(args.memory_ms)
+    workdir = tempfile.mkdtemp(prefix="youplus-binary-")
+    os.environ.update({
+        "SUPERMEMORY_API_KEY": "bench",
+        "SUPERMEMORY_BASE_URL": f"http://127.0.0.1:{port}",
+        "SUPERMEMORY_MIRROR_PATH": "",
+        "POST_CALL_SPOOL_DIR": os.path.join(workdir, "spool"),
+        "TTS_CACHE_DIR": os.path.join(workdir, "tts-cache"),
+        "AGENT_METRICS_JSONL": os.path.join(workdir, "calls.jsonl"),
+        "SPECULATIVE_LLM": "false" if args.no_speculation else "true",
+        "CARTESIA_API_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+    })
+
+    fake_livekit.install()
+    latency = fake_livekit.LATENCY
+    latency.llm_ttft_ms = args.llm_ttft_ms
+    latency.tts_ttfb_ms = args.tts_ttfb_ms
+    latency.eou_delay_ms = args.eou_ms
+    latency.speech_ms = args.speech_ms
+    latency.turns = len(SCRIPT)
+    fake_livekit.USER_TEXTS[:] = [text for _, text in SCRIPT]
+    fake_livekit.FakeLLM.REPLIES[next(text for label, text in SCRIPT if label == "other")] = NEGATIVE_QUESTION
+
+    import main
+
+    logging.getLogger().setLevel(logging.WARNING)
+    main.prewarm(fake_livekit.PROCESS)
+    await main.warm_process()
+    gpt_model = await main.resource_pool.get_llm()
+
+    os.environ["FAST_PATH"] = "true"
+    await run_calls(main, args, len(MOODS) * 4, offset=0)  # renders acknowledgments per mood and voice
+    await asyncio.sleep(0.5)
+
+    for fast_path in ("false", "true"):
+        os.environ["FAST_PATH"] = fast_path
+        requests = gpt_model.requests
+        samples = await run_calls(main, args, args.calls, offset=len(MOODS) * 4)
+        print(f"FAST_PATH={fast_path}: {gpt_model.requests - requests} LLM requests for "
+              f"{args.calls * (len(SCRIPT) - 1)} measured turns")
+        for label in ("contradicted", "negative"):
+            unacknowledged = samples.get(label, {"first": [], "follow_up": []})
+            assert unacknowledged["first"] == unacknowledged["follow_up"], f"acknowledgment played for a {label} answer"
+        for label, values in samples.items():
+            print(f"  {label:<12} end of turn -> first audio p50={percentile(values['first'], 50):4.0f}ms "
+                  f"p90={percentile(values['first'], 90):4.0f}ms  "
+                  f"-> LLM follow-up p50={percentile(values['follow_up'], 50):4.0f}ms")
+
+    print(f"tts cache: {main.tts_cache.stats()}")
+    await main.post_call_queue.drain(timeout=30)
+    await main.post_call_queue.aclose()
+    if main.memory_manager:
+        await main.memory_manager.aclose()
+    await main.tts_cache.aclose()
+    await main.audio_stores.aclose()
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--llm-ttft-ms", type=float, default=450)
+    parser.add_argument("--tts-ttfb-ms", type=float, default=150)
+    parser.add_argument("--eou-ms", type=float, default=300, help="Endpointing wait after the caller stops")
+    parser.add_argument("--speech-ms", type=float, default=300, help="Playback time of each agent utterance")
+    parser.add_argument("--memory-ms", type=float, default=50)
+    parser.add_argument("--no-speculation", action="store_true", help="Run with SPECULATIVE_LLM=false")
+    # room_metadata() options
+    parser.add_argument("--personalized-opening", action="store_true")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,151 @@
+"""
+Capacity scenario: job offers beyond what one worker can carry
+Offers calls to one simulated worker faster than they finish and shows overload is rejected at the door instead of degrading live calls
+
+With admission control it asserts that offers over the threshold were
+rejected and that concurrent calls never exceeded it. Each simulated call burns `--frame-cpu-ms` of event-loop CPU per 20ms audio
+frame, so without admission control every extra call slows all the others.
+
+Usage:
+    python benchmarks/capacity_rejection.py --offers 200 --rate 20 --max-calls 25
+    python benchmarks/capacity_rejection.py --offers 200 --rate 20 --max-calls 25 --no-admission
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_livekit  # noqa: E402
+from stubs import percentile  # noqa: E402
+from load_harness import start_supermemory_stub, room_metadata, sample_loop  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> None:
+    port = start_supermemory_stub(100)
+    workdir = tempfile.mkdtemp(prefix="youplus-capacity-")
+    os.environ.update({
+        "SUPERMEMORY_API_KEY": "bench",
+        "SUPERMEMORY_BASE_URL": f"http://127.0.0.1:{port}",
+        "SUPERMEMORY_MIRROR_PATH": os.path.join(workdir, "mirror.db"),
+        "POST_CALL_SPOOL_DIR": os.path.join(workdir, "spool"),
+        "AGENT_METRICS_JSONL": "",
+        "TTS_CACHE_DIR": os.path.join(workdir, "tts-cache"),
+        "AGENT_MAX_CALLS": str(args.max_calls),
+        "CARTESIA_API_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+    })
+    fake_livekit.install()
+    fake_livekit.LATENCY.frame_cpu_ms = args.frame_cpu_ms
+    fake_livekit.LATENCY.turns = args.turns
+
+    import main
+
+    logging.getLogger().setLevel(logging.ERROR)
+    main.prewarm(fake_livekit.PROCESS)
+    await main.warm_process()  # In a job process: must not be what feeds the worker's load
+    worker = main.create_agent_worker()
+    load_fnc = worker.options["load_fnc"]
+    load_threshold = worker.options["load_threshold"]
+    request_fnc = worker.options["request_fnc"]
+
+    lag_ms: list = []
+    rss: list = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_loop(stop, lag_ms, rss))
+    moods = ["Encouraging", "Confrontational", "Ruthless", "ColdMirror"]
+    metadata_args = argparse.Namespace(personalized_opening=False)
+    outcome = {"accepted": 0, "rejected_unavailable": 0, "rejected_request": 0}
+    active = {"now": 0, "peak": 0}
+
+    async def offer(index: int) -> None:
+        room = f"room-{index}"
+        load = load_fnc(worker)
+        if not args.no_admission:
+            # LiveKit only dispatches to workers whose last reported load is under the threshold
+            if load >= load_threshold:
+                outcome["rejected_unavailable"] += 1
+                return
+            request = fake_livekit.FakeJobRequest(room)
+            await request_fnc(request)
+            if not request.accepted:
+                outcome["rejected_request"] += 1
+                return
+        outcome["accepted"] += 1
+
+        ctx = fake_livekit.FakeJobContext(room, room_metadata(index, moods, metadata_args, None))
+        task = asyncio.current_task()
+        # Assigned a moment after the accept, as LiveKit would
+        await asyncio.sleep(0.05)
+        job = worker.job_started(f"job-{room}")
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        try:
+            await main.entrypoint(ctx)
+            agent = next(a for a in fake_livekit.CREATED_AGENTS if a.created_in is task)
+            fake_livekit.CREATED_AGENTS.remove(agent)
+            if agent.conversation is not None:
+                await agent.conversation
+        finally:
+            active["now"] -= 1
+            await ctx.shutdown()
+            worker.job_ended(job)
+
+    started = time.perf_counter()
+    calls = []
+    for index in range(args.offers):
+        calls.append(asyncio.create_task(offer(index)))
+        await asyncio.sleep(1 / args.rate)
+    await asyncio.gather(*calls)
+    wall_s = time.perf_counter() - started
+
+    stop.set()
+    await sampler
+    await main.post_call_queue.drain(timeout=30)
+    await main.post_call_queue.aclose()
+    if main.memory_manager:
+        await main.memory_manager.aclose()
+    await main.capacity.aclose()
+
+    turn = main.instrumentation.histograms.get("turn_latency")
+    ttfw = main.instrumentation.histograms.get("time_to_first_word")
+    rejected = outcome["rejected_unavailable"] + outcome["rejected_request"]
+    print(f"mode: {'no admission control' if args.no_admission else 'load-aware admission'}, "
+          f"{args.offers} offers at {args.rate}/s over {wall_s:.1f}s")
+    print(f"accepted {outcome['accepted']}, rejected {rejected} "
+          f"(worker unavailable {outcome['rejected_unavailable']}, request_fnc {outcome['rejected_request']})")
+    print(f"peak concurrent calls: {active['peak']}, peak load {main.capacity.peak_load:.2f}")
+    print(f"turn latency ms (accepted calls): p50={turn.percentile(0.5):.0f} p95={turn.percentile(0.95):.0f} "
+          f"p99={turn.percentile(0.99):.0f}")
+    print(f"time to first word ms: p50={ttfw.percentile(0.5):.0f} p95={ttfw.percentile(0.95):.0f}")
+    print(f"event-loop lag ms: p50={percentile(lag_ms, 50):.1f} p99={percentile(lag_ms, 99):.1f} "
+          f"max={max(lag_ms, default=0):.1f} (audio frames are 20ms)")
+
+    if not args.no_admission:
+        limit = int(args.max_calls * load_threshold)
+        assert rejected > 0, f"all {args.offers} offers accepted at {args.rate}/s"
+        assert active["peak"] <= limit, f"{active['peak']} concurrent calls, threshold allows {limit}"
+        print(f"ok: offers over the threshold rejected, peak {active['peak']} <= {limit} calls")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--offers", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=20, help="Job offers per second")
+    parser.add_argument("--max-calls", type=int, default=25, help="AGENT_MAX_CALLS")
+    parser.add_argument("--frame-cpu-ms", type=float, default=0.6)
+    parser.add_argument("--turns", type=int, default=4)
+    parser.add_argument("--no-admission", action="store_true", help="Accept every offer (the old behaviour)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
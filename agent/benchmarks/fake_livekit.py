@@ -0,0 +1,793 @@
+"""
+In-process stand-ins for the LiveKit SDK and provider plugins
+Installed into sys.modules by benchmark harnesses so `main.entrypoint` runs without rooms or API keys
+"""
+
+import sys
+import time
+import types
+import asyncio
+import itertools
+from enum import Enum
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class ProviderLatency:
+    """Simulated provider timings in milliseconds"""
+
+    llm_ttft_ms: float = 350.0
+    llm_ms_per_1k_prompt_tokens: float = 20.0  # prefill cost added to TTFT
+    tts_ttfb_ms: float = 150.0
+    tts_ms_per_char: float = 1.0  # synthesis time per input character before its audio is ready
+    eou_delay_ms: float = 300.0
+    plugin_init_ms: float = 50.0
+    vad_load_ms: float = 400.0  # CPU-bound model load, runs once per process
+    speech_ms: float = 1500.0  # how long each agent utterance plays
+    frame_cpu_ms: float = 0.0  # CPU burnt on the event loop per 20ms audio frame per call (VAD, resampling)
+    turns: int = 3
+
+
+LATENCY = ProviderLatency()
+
+
+# ---------------------------------------------------------------------------
+# livekit.agents.llm / metrics
+# ---------------------------------------------------------------------------
+
+
+class ChatMessage:
+    def __init__(self, role: str, content: Any = None, **kwargs: Any):
+        self.role = role
+        self.content = content
+
+
+class ChatContext:
+    def __init__(self, messages: Optional[List[ChatMessage]] = None):
+        self.messages = list(messages or [])
+
+    def append(self, message: Optional[ChatMessage] = None, *, role: str = "system", text: str = "") -> "ChatContext":
+        self.messages.append(message or ChatMessage(role=role, content=text))
+        return self
+
+    def copy(self) -> "ChatContext":
+        return ChatContext(self.messages)
+
+
+class _Emitter:
+    def __init__(self):
+        self._handlers: Dict[str, List[Callable]] = {}
+
+    def on(self, event: str, callback: Optional[Callable] = None):
+        def register(fn: Callable) -> Callable:
+            self._handlers.setdefault(event, []).append(fn)
+            return fn
+
+        return register(callback) if callback is not None else register
+
+    def off(self, event: str, callback: Callable) -> None:
+        if callback in self._handlers.get(event, []):
+            self._handlers[event].remove(callback)
+
+    def emit(self, event: str, *args: Any) -> None:
+        for handler in list(self._handlers.get(event, [])):
+            handler(*args)
+
+
+@dataclass
+class ChoiceDelta:
+    role: str
+    content: Optional[str] = None
+
+
+@dataclass
+class Choice:
+    delta: ChoiceDelta
+
+
+@dataclass
+class CompletionUsage:
+    completion_tokens: int
+    prompt_tokens: int
+    total_tokens: int
+
+
+@dataclass
+class ChatChunk:
+    request_id: str
+    choices: List[Choice] = field(default_factory=list)
+    usage: Optional[CompletionUsage] = None
+
+
+class LLM(_Emitter):
+    def chat(self, *, chat_ctx: ChatContext, fnc_ctx: Any = None, **kwargs: Any) -> "LLMStream":
+        raise NotImplementedError
+
+
+class LLMStream:
+    """Starts generating on creation like the real stream; yields ChatChunks"""
+
+    _DONE = object()
+
+    def __init__(self, llm: LLM, *, chat_ctx: ChatContext, fnc_ctx: Any = None, **kwargs: Any):
+        self._llm = llm
+        self.chat_ctx = chat_ctx
+        self._event_ch = _EventChannel()
+        self._task = asyncio.ensure_future(self._main())
+
+    async def _run(self) -> None:
+        raise NotImplementedError
+
+    async def _main(self) -> None:
+        try:
+            await self._run()
+        finally:
+            self._event_ch.send_nowait(self._DONE)
+
+    def __aiter__(self) -> "LLMStream":
+        return self
+
+    async def __anext__(self) -> ChatChunk:
+        item = await self._event_ch._queue.get()
+        if item is self._DONE:
+            await self._task
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+# ---------------------------------------------------------------------------
+# livekit.agents.stt
+# ---------------------------------------------------------------------------
+
+
+class SpeechEventType(Enum):
+    START_OF_SPEECH = "start_of_speech"
+    INTERIM_TRANSCRIPT = "interim_transcript"
+    FINAL_TRANSCRIPT = "final_transcript"
+    END_OF_SPEECH = "end_of_speech"
+
+
+@dataclass
+class SpeechData:
+    text: str
+    language: str = "en"
+    confidence: float = 1.0
+
+
+@dataclass
+class SpeechEvent:
+    type: SpeechEventType
+    request_id: str = ""
+    alternatives: List[SpeechData] = field(default_factory=list)
+
+
+@dataclass
+class STTCapabilities:
+    streaming: bool = True
+    interim_results: bool = True
+
+
+class STT(_Emitter):
+    def __init__(self, *, capabilities: STTCapabilities, **kwargs: Any):
+        super().__init__()
+        self.capabilities = capabilities
+
+    def stream(self, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+    async def recognize(self, buffer: Any, **kwargs: Any) -> Any:
+        return await self._recognize_impl(buffer, **kwargs)
+
+    async def _recognize_impl(self, buffer: Any, **kwargs: Any) -> Any:
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        pass
+
+
+class AgentMetrics:
+    pass
+
+
+@dataclass
+class PipelineEOUMetrics(AgentMetrics):
+    sequence_id: str
+    end_of_utterance_delay: float
+    transcription_delay: float = 0.0
+
+
+@dataclass
+class PipelineLLMMetrics(AgentMetrics):
+    sequence_id: str
+    ttft: float
+    duration: float
+    completion_tokens: int = 20
+    prompt_tokens: int = 800
+
+
+@dataclass
+class PipelineTTSMetrics(AgentMetrics):
+    sequence_id: str
+    ttfb: float
+    duration: float
+    characters_count: int = 60
+
+
+@dataclass
+class UsageSummary:
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    tts_characters_count: int = 0
+
+
+class UsageCollector:
+    def __init__(self):
+        self._summary = UsageSummary()
+
+    def collect(self, metrics: AgentMetrics) -> None:
+        if isinstance(metrics, PipelineLLMMetrics):
+            self._summary.llm_prompt_tokens += metrics.prompt_tokens
+            self._summary.llm_completion_tokens += metrics.completion_tokens
+        elif isinstance(metrics, PipelineTTSMetrics):
+            self._summary.tts_characters_count += metrics.characters_count
+
+    def get_summary(self) -> UsageSummary:
+        return UsageSummary(**vars(self._summary))
+
+
+# ---------------------------------------------------------------------------
+# livekit.rtc / livekit.agents.tts
+# ---------------------------------------------------------------------------
+
+
+class AudioFrame:
+    def __init__(self, data: bytes, sample_rate: int, num_channels: int, samples_per_channel: int):
+        self._data = bytes(data)
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.samples_per_channel = samples_per_channel
+
+    @property
+    def data(self) -> memoryview:
+        return memoryview(self._data).cast("h")
+
+
+@dataclass
+class TTSCapabilities:
+    streaming: bool = True
+
+
+@dataclass
+class SynthesizedAudio:
+    request_id: str
+    frame: AudioFrame
+    is_final: bool = False
+    segment_id: str = ""
+    delta_text: str = ""
+
+
+class TTS(_Emitter):
+    def __init__(self, *, capabilities: TTSCapabilities, sample_rate: int, num_channels: int, **kwargs: Any):
+        super().__init__()
+        self.capabilities = capabilities
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+
+    def synthesize(self, text: str, **kwargs: Any) -> "ChunkedStream":
+        raise NotImplementedError
+
+    def stream(self, **kwargs: Any) -> "SynthesizeStream":
+        raise NotImplementedError
+
+
+class _EventChannel:
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def send_nowait(self, item: Any) -> None:
+        self._queue.put_nowait(item)
+
+
+class ChunkedStream:
+    """Runs `_run` in a task and yields whatever it sends to `_event_ch`"""
+
+    _DONE = object()
+
+    def __init__(self, *, tts: TTS, input_text: str, **kwargs: Any):
+        self._tts = tts
+        self._input_text = input_text
+        self._event_ch = _EventChannel()
+        self._task = asyncio.ensure_future(self._main())
+
+    @property
+    def input_text(self) -> str:
+        return self._input_text
+
+    async def _run(self) -> None:
+        raise NotImplementedError
+
+    async def _main(self) -> None:
+        try:
+            await self._run()
+        finally:
+            self._event_ch.send_nowait(self._DONE)
+
+    def __aiter__(self) -> "ChunkedStream":
+        return self
+
+    async def __anext__(self) -> SynthesizedAudio:
+        item = await self._event_ch._queue.get()
+        if item is self._DONE:
+            await self._task  # re-raise errors from _run
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        self._task.cancel()
+
+
+class SynthesizeStream:
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Provider plugins
+# ---------------------------------------------------------------------------
+
+
+class FakeLLM(LLM):
+    REPLY = "Did you do it? YES or NO."
+    # Replies to specific user messages (the latest one in the request); REPLY otherwise
+    REPLIES: Dict[str, str] = {}
+
+    def __init__(self):
+        super().__init__()
+        self.requests = 0
+
+    @classmethod
+    def with_model(cls, model: str = "gpt-4o-mini", **kwargs: Any) -> "FakeLLM":
+        return cls()
+
+    def chat(self, *, chat_ctx: ChatContext, fnc_ctx: Any = None, **kwargs: Any) -> "FakeLLMStream":
+        self.requests += 1
+        return FakeLLMStream(self, chat_ctx=chat_ctx, fnc_ctx=fnc_ctx)
+
+
+class FakeLLMStream(LLMStream):
+    """One chunk after TTFT plus prefill time for the prompt"""
+
+    async def _run(self) -> None:
+        prompt_tokens = sum(len(str(message.content or "")) for message in self.chat_ctx.messages) // 4
+        await asyncio.sleep((LATENCY.llm_ttft_ms + LATENCY.llm_ms_per_1k_prompt_tokens * prompt_tokens / 1000) / 1000)
+        user_text = next((str(m.content) for m in reversed(self.chat_ctx.messages) if m.role == "user"), "")
+        reply = FakeLLM.REPLIES.get(user_text, FakeLLM.REPLY)
+        self._event_ch.send_nowait(ChatChunk("fake", [Choice(ChoiceDelta("assistant", reply))]))
+        self._event_ch.send_nowait(ChatChunk("fake", usage=CompletionUsage(20, prompt_tokens, prompt_tokens + 20)))
+
+
+class FakeSTT(STT):
+    def __init__(self):
+        super().__init__(capabilities=STTCapabilities(streaming=True, interim_results=True))
+
+    @classmethod
+    async def create(cls, **kwargs: Any) -> "FakeSTT":
+        await asyncio.sleep(LATENCY.plugin_init_ms / 1000)
+        return cls()
+
+    def stream(self, **kwargs: Any) -> "FakeSpeechStream":
+        return FakeSpeechStream()
+
+
+class FakeSpeechStream:
+    """Yields the events a simulated caller produces (`push_event`) instead of recognizing audio"""
+
+    _ids = itertools.count()
+
+    def __init__(self):
+        self.request_id = f"stt-{next(self._ids)}"
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def push_event(self, event_type: SpeechEventType, text: str = "") -> None:
+        alternatives = [SpeechData(text)] if text else []
+        self._queue.put_nowait(SpeechEvent(event_type, self.request_id, alternatives))
+
+    def push_frame(self, frame: Any) -> None:
+        pass
+
+    def __aiter__(self) -> "FakeSpeechStream":
+        return self
+
+    async def __anext__(self) -> SpeechEvent:
+        event = await self._queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    async def aclose(self) -> None:
+        self._queue.put_nowait(None)
+
+
+class FakeTTS(TTS):
+    SAMPLE_RATE = 24000
+
+    def __init__(self, voice: str = "default", model: str = "sonic-3"):
+        super().__init__(capabilities=TTSCapabilities(streaming=True), sample_rate=self.SAMPLE_RATE, num_channels=1)
+        self.voice = voice
+        self.model = model
+        self.synthesized_chars = 0
+
+    @classmethod
+    async def create(cls, voice: str = "default", model: str = "sonic-3", **kwargs: Any) -> "FakeTTS":
+        await asyncio.sleep(LATENCY.plugin_init_ms / 1000)
+        return cls(voice=voice, model=model)
+
+    def synthesize(self, text: str, **kwargs: Any) -> ChunkedStream:
+        return FakeChunkedStream(tts=self, input_text=text)
+
+
+class FakeChunkedStream(ChunkedStream):
+    """Silence after TTFB + per-character synthesis time, 20ms frames, ~60ms of audio per character"""
+
+    async def _run(self) -> None:
+        self._tts.synthesized_chars += len(self.input_text)
+        await asyncio.sleep((LATENCY.tts_ttfb_ms + LATENCY.tts_ms_per_char * len(self.input_text)) / 1000)
+        samples = FakeTTS.SAMPLE_RATE // 50
+        for _ in range(max(1, len(self.input_text) * 3)):
+            frame = AudioFrame(bytes(samples * 2), FakeTTS.SAMPLE_RATE, 1, samples)
+            self._event_ch.send_nowait(SynthesizedAudio(request_id="fake", frame=frame))
+
+
+class FakeVAD:
+    @classmethod
+    def load(cls, **kwargs: Any) -> "FakeVAD":
+        # Called from the sync prewarm or via asyncio.to_thread; blocking is what a real model load does
+        time.sleep(LATENCY.vad_load_ms / 1000)
+        return cls()
+
+
+# ---------------------------------------------------------------------------
+# livekit.agents.pipeline
+# ---------------------------------------------------------------------------
+
+
+class VoicePipelineAgent(_Emitter):
+    """
+    Pipeline stand-in: `say` waits TTS first byte, `start` runs scripted turns
+
+    Time to first audio is TTS TTFB plus synthesis of the first input chunk,
+    so a whole string waits on all of it while an async iterable waits only
+    on its first sentence.
+
+    Each scripted turn waits EOU + LLM TTFT + TTS TTFB, emits the matching
+    metrics events (measured, so event-loop lag shows up in them) and commits
+    user/agent messages like the real pipeline. The caller's words reach the
+    STT stream as an interim transcript when they stop speaking and as the
+    final one at EOU; the LLM stream comes from before_llm_cb when it returns
+    one. When it returns False the turn waits for whatever the callback
+    started saying instead. The caller says `USER_TEXTS` in turn when set.
+    While the call runs, every 20ms audio frame costs `frame_cpu_ms` of
+    event-loop CPU.
+    """
+
+    def __init__(self, vad: Any = None, stt: Any = None, llm: Any = None, tts: Any = None,
+                 chat_ctx: Optional[ChatContext] = None, before_llm_cb: Optional[Callable] = None,
+                 min_endpointing_delay: float = 0.5, **kwargs: Any):
+        super().__init__()
+        self.vad, self.stt, self.llm, self.tts = vad, stt, llm, tts
+        self.chat_ctx = chat_ctx or ChatContext()
+        self.before_llm_cb = before_llm_cb
+        self._opts = types.SimpleNamespace(min_endpointing_delay=min_endpointing_delay)
+        self.options = kwargs
+        self._sequence = 0
+        self._stt_stream: Any = None
+        self.conversation: Optional[asyncio.Task] = None
+        self.first_audio_at: Optional[float] = None
+        self._speaking = 0  # say() calls in flight
+
+    async def start(self, room: Any, participant: Any = None) -> None:
+        await asyncio.sleep(0)
+        if isinstance(self.stt, STT):
+            self._stt_stream = self.stt.stream()
+            asyncio.ensure_future(self._recognize())
+        self.conversation = asyncio.ensure_future(self._converse())
+        if LATENCY.frame_cpu_ms > 0:
+            asyncio.ensure_future(self._process_audio())
+
+    async def _process_audio(self) -> None:
+        while not self.conversation.done():
+            deadline = time.perf_counter() + LATENCY.frame_cpu_ms / 1000
+            while time.perf_counter() < deadline:
+                pass
+            await asyncio.sleep(0.02)
+
+    async def say(self, source: Any, allow_interruptions: bool = True, add_to_chat_ctx: bool = True) -> None:
+        sequence_id = self._next_sequence()
+        self._speaking += 1
+        try:
+            if isinstance(source, str) and isinstance(self.tts, TTS):
+                # Whole strings go through tts.synthesize(), like the real pipeline
+                text = await self._speak_synthesized(sequence_id, source)
+            elif isinstance(source, str):
+                text = await self._speak(sequence_id, [source])
+            elif isinstance(source, LLMStream):
+                text = await self._speak(sequence_id, ["".join(
+                    [chunk.choices[0].delta.content or "" async for chunk in source if chunk.choices]
+                )])
+            else:
+                # Each chunk from an async iterable is pushed to TTS as its own input
+                text = await self._speak(sequence_id, [chunk async for chunk in source])
+            if add_to_chat_ctx:
+                self.chat_ctx.append(ChatMessage(role="assistant", content=text))
+        finally:
+            self._speaking -= 1
+
+    async def _recognize(self) -> None:
+        async for _ in self._stt_stream:
+            pass
+
+    def _push_speech(self, event_type: SpeechEventType, text: str = "") -> None:
+        if self._stt_stream is not None:
+            self._stt_stream.push_event(event_type, text)
+
+    async def _converse(self) -> None:
+        try:
+            for turn in range(LATENCY.turns):
+                await self._turn(turn)
+        finally:
+            if self._stt_stream is not None:
+                await self._stt_stream.aclose()
+
+    async def _turn(self, turn: int) -> None:
+        sequence_id = self._next_sequence()
+        if USER_TEXTS:
+            user_text = USER_TEXTS[turn % len(USER_TEXTS)]
+        else:
+            user_text = f"user turn {turn}: I will finish the report tomorrow"
+        self.emit("user_started_speaking")
+        self._push_speech(SpeechEventType.START_OF_SPEECH)
+        self._push_speech(SpeechEventType.INTERIM_TRANSCRIPT, user_text)
+        self.emit("user_stopped_speaking")
+        started = time.perf_counter()
+        await asyncio.sleep(LATENCY.eou_delay_ms / 1000)
+        self._push_speech(SpeechEventType.FINAL_TRANSCRIPT, user_text)
+        self._push_speech(SpeechEventType.END_OF_SPEECH)
+        eou = time.perf_counter() - started
+        user_message = ChatMessage(role="user", content=user_text)
+        self.emit("metrics_collected", PipelineEOUMetrics(sequence_id, eou))
+
+        # Like the real pipeline: the LLM sees a copy of chat_ctx plus the new user message
+        started = time.perf_counter()
+        call_ctx = self.chat_ctx.copy().append(user_message)
+        result = None
+        if self.before_llm_cb is not None:
+            result = self.before_llm_cb(self, call_ctx)
+            if asyncio.iscoroutine(result):
+                result = await result
+        if result is False:
+            # The callback answers the turn itself (and commits the user message)
+            await asyncio.sleep(0)
+            while self._speaking:
+                await asyncio.sleep(0.005)
+            return
+        self.emit("user_speech_committed", user_message)
+        stream = result if isinstance(result, LLMStream) else self.llm.chat(chat_ctx=call_ctx)
+        ttft, reply, prompt_tokens = None, "", 0
+        async for chunk in stream:
+            if ttft is None:
+                ttft = time.perf_counter() - started
+            if chunk.choices:
+                reply += chunk.choices[0].delta.content or ""
+            if chunk.usage is not None:
+                prompt_tokens = chunk.usage.prompt_tokens
+        self.emit("metrics_collected", PipelineLLMMetrics(sequence_id, ttft, ttft, prompt_tokens=prompt_tokens))
+        self.chat_ctx.append(user_message)
+        await self._speak(sequence_id, [reply])
+        self.chat_ctx.append(ChatMessage(role="assistant", content=reply))
+
+    async def _speak(self, sequence_id: str, chunks: List[str]) -> str:
+        # Audio starts once the first input chunk is synthesized
+        started = time.perf_counter()
+        await asyncio.sleep((LATENCY.tts_ttfb_ms + LATENCY.tts_ms_per_char * len(chunks[0] if chunks else "")) / 1000)
+        ttfb = time.perf_counter() - started
+        self.emit("agent_started_speaking")
+        if self.first_audio_at is None:
+            self.first_audio_at = time.perf_counter()
+        text = "".join(chunks)
+        self.emit("metrics_collected", PipelineTTSMetrics(sequence_id, ttfb, ttfb, len(text)))
+        await asyncio.sleep(LATENCY.speech_ms / 1000)
+        self.emit("agent_speech_committed", ChatMessage(role="assistant", content=text))
+        return text
+
+    async def _speak_synthesized(self, sequence_id: str, text: str) -> str:
+        started = time.perf_counter()
+        ttfb = None
+        async for _ in self.tts.synthesize(text):
+            if ttfb is None:
+                ttfb = time.perf_counter() - started
+                self.emit("agent_started_speaking")
+                if self.first_audio_at is None:
+                    self.first_audio_at = time.perf_counter()
+        duration = time.perf_counter() - started
+        self.emit("metrics_collected", PipelineTTSMetrics(sequence_id, ttfb or duration, duration, len(text)))
+        await asyncio.sleep(LATENCY.speech_ms / 1000)
+        self.emit("agent_speech_committed", ChatMessage(role="assistant", content=text))
+        return text
+
+    def _next_sequence(self) -> str:
+        self._sequence += 1
+        return f"seq-{self._sequence}"
+
+
+# ---------------------------------------------------------------------------
+# JobContext / room
+# ---------------------------------------------------------------------------
+
+
+class FakeRoom:
+    def __init__(self, name: str, metadata: str):
+        self.name = name
+        self.metadata = metadata
+
+
+class FakeJobProcess:
+    """What LiveKit passes to the (synchronous) prewarm_fnc"""
+
+    def __init__(self):
+        self.userdata: Dict[str, Any] = {}
+
+
+class FakeJobContext:
+    def __init__(self, room_name: str, metadata: str):
+        self.room = FakeRoom(room_name, metadata)
+        self.proc = PROCESS
+        self.participant = None
+        self.agent: Optional[VoicePipelineAgent] = None
+        self._shutdown_callbacks: List[Callable] = []
+
+    def add_shutdown_callback(self, callback: Callable) -> None:
+        self._shutdown_callbacks.append(callback)
+
+    async def shutdown(self) -> None:
+        """What the job runner does when the room closes"""
+        for callback in self._shutdown_callbacks:
+            await callback()
+
+
+class FakeJobRequest:
+    """A dispatch offer; `accepted` is None until the request_fnc decides"""
+
+    def __init__(self, room_name: str):
+        self.id = f"job-{room_name}"
+        self.room_name = room_name
+        self.accepted: Optional[bool] = None
+
+    async def accept(self, **kwargs: Any) -> None:
+        self.accepted = True
+
+    async def reject(self) -> None:
+        self.accepted = False
+
+
+@dataclass
+class FakeJob:
+    id: str
+
+
+@dataclass
+class RunningJobInfo:
+    job: FakeJob
+
+
+class Worker:
+    """Options plus `active_jobs`, which harnesses fill in as the job runner would"""
+
+    def __init__(self, **kwargs: Any):
+        self.options = kwargs
+        self.active_jobs: List[RunningJobInfo] = []
+
+    def job_started(self, job_id: str) -> RunningJobInfo:
+        info = RunningJobInfo(FakeJob(job_id))
+        self.active_jobs.append(info)
+        return info
+
+    def job_ended(self, info: RunningJobInfo) -> None:
+        self.active_jobs.remove(info)
+
+
+# ---------------------------------------------------------------------------
+# Installation
+# ---------------------------------------------------------------------------
+
+# Harnesses run every call in one process, the way they share one job process's state
+PROCESS = FakeJobProcess()
+
+# What scripted callers say, one entry per turn (cycled); empty for the default filler line
+USER_TEXTS: List[str] = []
+
+# Every VoicePipelineAgent created while installed, so harnesses can await conversations
+CREATED_AGENTS: List[VoicePipelineAgent] = []
+
+
+class _TrackedAgent(VoicePipelineAgent):
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # The entrypoint task that built this agent, to match agents to calls
+        self.created_in = asyncio.current_task()
+        CREATED_AGENTS.append(self)
+
+
+def install() -> None:
+    """Register the fake `livekit` package tree in sys.modules"""
+    livekit = types.ModuleType("livekit")
+    agents = types.ModuleType("livekit.agents")
+    llm = types.ModuleType("livekit.agents.llm")
+    metrics = types.ModuleType("livekit.agents.metrics")
+    pipeline = types.ModuleType("livekit.agents.pipeline")
+    plugins = types.ModuleType("livekit.plugins")
+    rtc = types.ModuleType("livekit.rtc")
+    tts = types.ModuleType("livekit.agents.tts")
+    stt = types.ModuleType("livekit.agents.stt")
+
+    llm.ChatMessage = ChatMessage
+    llm.ChatContext = ChatContext
+    llm.LLM = LLM
+    llm.LLMStream = LLMStream
+    llm.ChatChunk = ChatChunk
+    llm.Choice = Choice
+    llm.ChoiceDelta = ChoiceDelta
+    llm.CompletionUsage = CompletionUsage
+    stt.STT = STT
+    stt.STTCapabilities = STTCapabilities
+    stt.SpeechEvent = SpeechEvent
+    stt.SpeechEventType = SpeechEventType
+    stt.SpeechData = SpeechData
+    metrics.AgentMetrics = AgentMetrics
+    metrics.UsageCollector = UsageCollector
+    metrics.PipelineEOUMetrics = PipelineEOUMetrics
+    metrics.PipelineLLMMetrics = PipelineLLMMetrics
+    metrics.PipelineTTSMetrics = PipelineTTSMetrics
+    pipeline.VoicePipelineAgent = _TrackedAgent
+    rtc.AudioFrame = AudioFrame
+    tts.TTS = TTS
+    tts.TTSCapabilities = TTSCapabilities
+    tts.ChunkedStream = ChunkedStream
+    tts.SynthesizeStream = SynthesizeStream
+    tts.SynthesizedAudio = SynthesizedAudio
+
+    agents.llm = llm
+    agents.metrics = metrics
+    agents.pipeline = pipeline
+    agents.tts = tts
+    agents.stt = stt
+    agents.JobContext = FakeJobContext
+    agents.JobProcess = FakeJobProcess
+    agents.Worker = Worker
+    agents.WorkerOptions = Worker
+    agents.AutoSubscribe = types.SimpleNamespace(SUBSCRIBE_ALL="subscribe_all", AUDIO_ONLY="audio_only")
+    agents.APIConnectOptions = lambda **kwargs: kwargs
+    agents.run_app = lambda worker: None
+
+    plugins.openai = types.SimpleNamespace(LLM=FakeLLM)
+    plugins.cartesia = types.SimpleNamespace(STT=FakeSTT, TTS=FakeTTS)
+    plugins.silero = types.SimpleNamespace(VAD=FakeVAD)
+
+    livekit.agents = agents
+    livekit.plugins = plugins
+    livekit.rtc = rtc
+
+    sys.modules.update({
+        "livekit": livekit,
+        "livekit.agents": agents,
+        "livekit.agents.llm": llm,
+        "livekit.agents.metrics": metrics,
+        "livekit.agents.pipeline": pipeline,
+        "livekit.agents.tts": tts,
+        "livekit.agents.stt": stt,
+        "livekit.plugins": plugins,
+        "livekit.rtc": rtc,
+    })
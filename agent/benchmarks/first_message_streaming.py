@@ -0,0 +1,72 @@
+"""
+Time-to-first-audio benchmark for the first message
+Speaks backend-style openings through the fake pipeline whole vs. streamed sentence by sentence
+
+The fake TTS starts audio after TTFB plus synthesis of its first input
+(`--ms-per-char` per character), which is how a provider behaves when it
+only renders complete inputs.
+
+Usage:
+    python benchmarks/first_message_streaming.py --ttfb-ms 150 --ms-per-char 1.0
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_livekit  # noqa: E402
+from ssml import split_ssml, stream_ssml  # noqa: E402
+from assistant import AssistantPersonality  # noqa: E402
+
+BACKEND_FIRST_MESSAGE = (
+    '<emotion value="confident" />Future You calling.<break time="500ms"/>'
+    "Last week you told me you'd run three times and ship the landing page by Friday. "
+    '<break time="1s"/>I checked. You ran once. The page is still a draft in your editor. '
+    '<emotion value="determined" /><speed ratio="1.1"/>I\'m not here to make you feel bad. '
+    "I'm here because the version of you that keeps promises is the one I became. "
+    "So here's the deal: tonight you pick one thing, the smallest real step, and you do it before bed. "
+    '<break time="1s"/><emotion value="contemplative" />Binary question. Did you keep your promise today? YES or NO.'
+)
+
+
+async def time_to_first_audio(message: str, streamed: bool) -> float:
+    agent = fake_livekit.VoicePipelineAgent()
+    started = time.perf_counter()
+    await agent.say(stream_ssml(message) if streamed else message)
+    return (agent.first_audio_at - started) * 1000
+
+
+async def run(args: argparse.Namespace) -> None:
+    fake_livekit.LATENCY.tts_ttfb_ms = args.ttfb_ms
+    fake_livekit.LATENCY.tts_ms_per_char = args.ms_per_char
+    fake_livekit.LATENCY.speech_ms = 0
+
+    messages = {mood: AssistantPersonality(mood).get_opening_message()
+                for mood in ("Encouraging", "Confrontational", "Ruthless", "ColdMirror")}
+    messages["backend (long)"] = BACKEND_FIRST_MESSAGE
+
+    print(f"{'message':<16} {'chars':>6} {'segments':>9} {'whole ms':>9} {'streamed ms':>12} {'saved':>7}")
+    for name, message in messages.items():
+        whole = await time_to_first_audio(message, streamed=False)
+        streamed = await time_to_first_audio(message, streamed=True)
+        print(
+            f"{name:<16} {len(message):>6} {len(split_ssml(message)):>9} {whole:>9.0f} "
+            f"{streamed:>12.0f} {(1 - streamed / whole) * 100:>6.0f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ttfb-ms", type=float, default=150)
+    parser.add_argument("--ms-per-char", type=float, default=1.0, help="TTS synthesis cost per input character")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
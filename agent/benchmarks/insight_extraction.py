@@ -0,0 +1,94 @@
+"""
+Post-call insight extraction benchmark
+Compares the single-pass matcher with the previous per-keyword scans on synthetic transcripts
+
+Usage:
+    python benchmarks/insight_extraction.py --lines 1000 10000 100000
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from insights import CATEGORY_KEYWORDS, SENTIMENT_WORDS, extract_insights  # noqa: E402
+
+UTTERANCES = [
+    "agent: Did you do it? YES or NO.",
+    "user: Yes, I finished the workout this morning",
+    "user: I'll run again tomorrow at 7",
+    "user: honestly it's been difficult with work",
+    "agent: That's the same pattern from last week.",
+    "user: my goal is to ship the app by Friday",
+    "user: I feel good about it, things improved",
+    "user: I'm worried I can't keep it up",
+    "agent: Tomorrow's your chance. What's the plan?",
+    "user: I want to sleep earlier",
+]
+
+
+def legacy_extract(transcript: str) -> dict:
+    """Previous implementation: one split + lower() per keyword per category"""
+
+    def extract(keywords):
+        found = []
+        for line in transcript.split("\n"):
+            for keyword in keywords:
+                if keyword.lower() in line.lower():
+                    found.append(line.strip())
+                    break
+        return found
+
+    positive = sum(1 for word in SENTIMENT_WORDS["positive"] if word in transcript.lower())
+    negative = sum(1 for word in SENTIMENT_WORDS["negative"] if word in transcript.lower())
+    if positive > negative:
+        sentiment = "positive"
+    elif negative > positive:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+
+    insights = {category: extract(keywords) for category, keywords in CATEGORY_KEYWORDS.items()}
+    insights["sentiment"] = sentiment
+    return insights
+
+
+def synthetic_transcript(lines: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    return "\n".join(rng.choice(UTTERANCES) for _ in range(lines))
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'legacy ms':>11} {'single-pass ms':>15} {'speedup':>8}")
+    for lines in args.lines:
+        transcript = synthetic_transcript(lines)
+
+        expected = legacy_extract(transcript)
+        actual = extract_insights(transcript)
+        for key, value in expected.items():
+            assert actual[key] == value, f"mismatch in {key}"
+
+        legacy_ms = best_of(legacy_extract, transcript, args.repeat)
+        single_ms = best_of(extract_insights, transcript, args.repeat)
+        print(f"{lines:>8} {legacy_ms:>11.1f} {single_ms:>15.1f} {legacy_ms / single_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
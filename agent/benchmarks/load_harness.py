@@ -0,0 +1,297 @@
+"""
+Load-testing harness for the agent entrypoint
+Drives many concurrent simulated calls through one worker process against stub LiveKit, providers and Supermemory
+
+LiveKit and the Cartesia/OpenAI plugins are replaced by in-process fakes
+(benchmarks/fake_livekit.py) with configurable latency; Supermemory is a local
+HTTP stub, so the real aiohttp client, cache, mirror and post-call queue run.
+
+Usage:
+    python benchmarks/load_harness.py --calls 200 --concurrency 200
+    python benchmarks/load_harness.py --calls 500 --concurrency 100 --memory-ms 400 --llm-ttft-ms 600
+    python benchmarks/load_harness.py --calls 200 --personalized-opening --first-message-audio
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import wave
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from aiohttp import web
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_livekit  # noqa: E402
+from stubs import start_stub_server, percentile  # noqa: E402
+
+
+def start_supermemory_stub(latency_ms: float) -> int:
+    """Stub Supermemory: reads, single writes and batch writes, each after `latency_ms`"""
+
+    async def get_memories(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        user_id = request.query.get("user_id", "unknown")
+        return web.json_response({"memories": [
+            {"content": f"{user_id} promised to run 5k", "tags": ["promise", "call"]},
+            {"content": f"{user_id} wants to ship the app", "tags": ["goal", "call"]},
+            {"content": f"{user_id} ran 3 times this week", "tags": ["progress"]},
+        ]})
+
+    async def post_memory(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        return web.json_response({"id": "stub"}, status=201)
+
+    async def post_batch(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        body = await request.json()
+        return web.json_response({"results": [{"success": True} for _ in body.get("memories", [])]})
+
+    def setup(app: web.Application) -> None:
+        app.router.add_get("/v1/memories", get_memories)
+        app.router.add_post("/v1/memories", post_memory)
+        app.router.add_post("/v1/memories/batch", post_batch)
+
+    return start_stub_server(setup)
+
+
+def personalized_opening(index: int) -> str:
+    """A long backend-style opening unique to the user (never served from the TTS cache)"""
+    return (
+        f'<emotion value="confident" />Future You calling, user {index}.<break time="500ms"/>'
+        "Last week you said you'd run three times and ship the landing page by Friday. "
+        "I checked. You ran once, and the page is still a draft. "
+        "I'm not here to make you feel bad, I'm here because the version of you that keeps promises is me. "
+        '<break time="1s"/>Binary question. Did you keep your promise today? YES or NO.'
+    )
+
+
+def write_silence_wav(path: str, seconds: float, sample_rate: int) -> None:
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(int(seconds * sample_rate) * 2))
+
+
+def room_metadata(index: int, moods: List[str], args: argparse.Namespace, audio_dir: Optional[str]) -> str:
+    # Without a backend first message the mood's fallback opening is said, and served from the TTS cache
+    prompts = {"systemPrompt": "You are Future You. " * 200}
+    if args.personalized_opening:
+        prompts["firstMessage"] = personalized_opening(index)
+    elif audio_dir:
+        prompts["firstMessage"] = "Future You calling. Did you keep your promise?"
+    if audio_dir:
+        # What the backend would render next to firstMessage before creating the room
+        write_silence_wav(os.path.join(audio_dir, f"call-{index}.wav"), 2.0, fake_livekit.FakeTTS.SAMPLE_RATE)
+        prompts["firstMessageAudio"] = f"call-{index}.wav"
+    return json.dumps({
+        "user_id": f"user-{index}",
+        "call_uuid": f"call-{index}",
+        "mood": moods[index % len(moods)],
+        "cartesia_voice_id": f"voice-{index % 4}",
+        "prompts": prompts,
+    })
+
+
+def watch_call_records(instrumentation, ended: set) -> List[str]:
+    """
+    Check each exported call record as it is exported; returns the problems found
+
+    A record must be exported after its call ended (`ended` holds the call ids
+    whose conversation finished) and must cover every scripted turn.
+    """
+    problems: List[str] = []
+    export = instrumentation.export
+
+    def checked_export(record: Dict) -> None:
+        if record.get("kind") == "call":
+            call_id = record["call_id"]
+            complete = sum("turn_latency_ms" in turn for turn in record["turns"])
+            if call_id not in ended:
+                problems.append(f"{call_id}: exported before the call ended")
+            elif complete < fake_livekit.LATENCY.turns or not record.get("duration_seconds"):
+                problems.append(
+                    f"{call_id}: {complete}/{fake_livekit.LATENCY.turns} turns, "
+                    f"{record.get('duration_seconds')}s"
+                )
+        export(record)
+
+    instrumentation.export = checked_export
+    return problems
+
+
+def rss_kb() -> int:
+    """Current resident set size"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+async def sample_loop(stop: asyncio.Event, lag_ms: list, rss: list, interval: float = 0.01) -> None:
+    """Event-loop lag (late wake-ups) and RSS over the run"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lag_ms.append((time.perf_counter() - start - interval) * 1000)
+        rss.append(rss_kb())
+
+
+async def run(args: argparse.Namespace) -> None:
+    port = start_supermemory_stub(args.memory_ms)
+    workdir = tempfile.mkdtemp(prefix="youplus-load-")
+    os.environ.update({
+        "SUPERMEMORY_API_KEY": "bench",
+        "SUPERMEMORY_BASE_URL": f"http://127.0.0.1:{port}",
+        "SUPERMEMORY_MIRROR_PATH": "" if args.no_mirror else os.path.join(workdir, "mirror.db"),
+        "POST_CALL_SPOOL_DIR": os.path.join(workdir, "spool"),
+        "TTS_CACHE_DIR": "" if args.no_tts_cache else os.path.join(workdir, "tts-cache"),
+        "FIRST_MESSAGE_AUDIO_DIR": os.path.join(workdir, "first-message-audio"),
+        "AGENT_METRICS_JSONL": os.path.join(workdir, "calls.jsonl"),
+        "CARTESIA_API_KEY": "bench",
+        "OPENAI_API_KEY": "bench",
+    })
+
+    fake_livekit.install()
+    latency = fake_livekit.LATENCY
+    latency.llm_ttft_ms = args.llm_ttft_ms
+    latency.tts_ttfb_ms = args.tts_ttfb_ms
+    latency.eou_delay_ms = args.eou_ms
+    latency.speech_ms = args.speech_ms
+    latency.turns = args.turns
+
+    import main
+
+    logging.getLogger().setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+
+    main.prewarm(fake_livekit.PROCESS)
+    await main.warm_process()
+    ended: set = set()
+    record_problems = watch_call_records(main.instrumentation, ended)
+
+    lag_ms: list = []
+    rss: list = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(sample_loop(stop, lag_ms, rss))
+    await asyncio.sleep(0.05)
+    baseline_rss = rss_kb()
+
+    moods = ["Encouraging", "Confrontational", "Ruthless", "ColdMirror"]
+    audio_dir = os.environ["FIRST_MESSAGE_AUDIO_DIR"] if args.first_message_audio else None
+    if audio_dir:
+        os.makedirs(audio_dir, exist_ok=True)
+    gate = asyncio.Semaphore(args.concurrency)
+    results: List[Dict[str, Optional[float]]] = []
+
+    async def simulated_call(index: int) -> None:
+        async with gate:
+            ctx = fake_livekit.FakeJobContext(f"room-{index}", room_metadata(index, moods, args, audio_dir))
+            task = asyncio.current_task()
+            started = time.perf_counter()
+            try:
+                await main.entrypoint(ctx)
+            except Exception as e:
+                results.append({"error": str(e)})
+                return
+            startup_ms = (time.perf_counter() - started) * 1000
+
+            agent = next(a for a in fake_livekit.CREATED_AGENTS if a.created_in is task)
+            fake_livekit.CREATED_AGENTS.remove(agent)
+            ttfw_ms = None
+            if agent.first_audio_at is not None:
+                ttfw_ms = (agent.first_audio_at - started) * 1000
+            if agent.conversation is not None:
+                await agent.conversation
+            ended.add(f"call-{index}")
+            await ctx.shutdown()
+            results.append({
+                "startup_ms": startup_ms,
+                "ttfw_ms": ttfw_ms,
+                "call_ms": (time.perf_counter() - started) * 1000,
+            })
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(simulated_call(index) for index in range(args.calls)))
+    wall_s = time.perf_counter() - wall_start
+
+    drained = await main.post_call_queue.drain(timeout=30)
+    stop.set()
+    await sampler
+    queue_stats = main.post_call_queue.stats()
+    await main.post_call_queue.aclose()
+    if main.memory_manager:
+        await main.memory_manager.aclose()
+    tts_stats = main.tts_cache.stats()
+    await main.tts_cache.aclose()
+    await main.audio_stores.aclose()
+
+    ok = [result for result in results if "error" not in result]
+    errors = [result["error"] for result in results if "error" in result]
+    startup = [result["startup_ms"] for result in ok]
+    ttfw = [result["ttfw_ms"] for result in ok if result["ttfw_ms"] is not None]
+    peak_active = min(args.concurrency, args.calls)
+    spans = main.instrumentation.snapshot()["spans"]
+
+    print(f"calls: {len(ok)} ok, {len(errors)} failed, concurrency {args.concurrency}, wall {wall_s:.2f}s")
+    print(f"throughput: {len(ok) / wall_s:.1f} calls/s")
+    print(
+        f"time to first word ms: p50={percentile(ttfw, 50):.0f} p95={percentile(ttfw, 95):.0f} "
+        f"p99={percentile(ttfw, 99):.0f} max={max(ttfw, default=0):.0f}"
+    )
+    print(f"entrypoint ms:         p50={percentile(startup, 50):.0f} p95={percentile(startup, 95):.0f}")
+    turn = spans.get("turn_latency", {})
+    print(f"turn latency ms:       p50={turn.get('p50_ms')} p95={turn.get('p95_ms')}")
+    print(
+        f"event-loop lag ms:     p50={percentile(lag_ms, 50):.1f} p99={percentile(lag_ms, 99):.1f} "
+        f"max={max(lag_ms, default=0):.1f}"
+    )
+    print(
+        f"memory: baseline {baseline_rss / 1024:.1f} MiB, peak {max(rss, default=baseline_rss) / 1024:.1f} MiB, "
+        f"~{(max(rss, default=baseline_rss) - baseline_rss) / peak_active:.0f} KiB per active call"
+    )
+    print(f"post-call queue: {'drained' if drained else 'NOT drained'} {queue_stats}")
+    print(f"tts cache: {tts_stats}")
+    print(f"first-message audio: {main.audio_stores.stats()}")
+    if errors:
+        print(f"first error: {errors[0]}")
+    print(f"per-call records: {os.environ['AGENT_METRICS_JSONL']}")
+    if record_problems:
+        print(f"{len(record_problems)} bad call records, first: {record_problems[0]}")
+        sys.exit(1)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--memory-ms", type=float, default=150, help="Supermemory stub latency")
+    parser.add_argument("--llm-ttft-ms", type=float, default=350)
+    parser.add_argument("--tts-ttfb-ms", type=float, default=150)
+    parser.add_argument("--eou-ms", type=float, default=300)
+    parser.add_argument("--speech-ms", type=float, default=1500)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--no-mirror", action="store_true", help="Disable the local memory mirror")
+    parser.add_argument("--no-tts-cache", action="store_true", help="Synthesize every opening live")
+    parser.add_argument("--personalized-opening", action="store_true",
+                        help="Long per-user first messages (streamed, never cached)")
+    parser.add_argument("--first-message-audio", action="store_true",
+                        help="Pre-render each first message and pass it as prompts.firstMessageAudio")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,117 @@
+"""
+Long-call prompt size benchmark for the rolling context window
+Runs a scripted 100-turn call through the chat context with and without compaction and reports prompt tokens, modeled TTFT and cost per turn
+
+TTFT is modeled as a fixed time plus prefill per 1k prompt tokens; cost uses
+the input price per 1M tokens. Compaction time is measured for real.
+
+Usage:
+    python benchmarks/long_call_context.py --turns 100 --ttft-ms 350 --prefill-ms-per-1k 20
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_livekit  # noqa: E402
+
+fake_livekit.install()
+
+from livekit.agents import llm  # noqa: E402
+
+from assistant import AssistantPersonality  # noqa: E402
+from context_window import ContextWindow, message_text  # noqa: E402
+from prompts import estimate_tokens  # noqa: E402
+from stubs import percentile  # noqa: E402
+
+# (user utterance, assistant reply) pairs cycled through the call
+SCRIPT = [
+    ("Honestly I skipped the gym again, work ran late and I was wiped.",
+     "Late work is a reason, not a plan. What time will you train tomorrow? Did you at least walk today?"),
+    ("No.",
+     "Then tomorrow is not optional. Name the time."),
+    ("I will go at 7am before work, I promise.",
+     "7am. I'll remember that. Did you finish the landing page draft like you said?"),
+    ("Yes, I finished it last night and sent it to Sam.",
+     "Good. That's the version of you I became. What's blocking the launch now?"),
+    ("I'm stuck on the pricing section, I keep rewriting it and can't decide.",
+     "Pick the simplest price and ship. You can change it next week. Will you decide by Friday?"),
+    ("Yeah.",
+     "Say it like you mean it. What's the bigger goal this quarter?"),
+    ("My goal is to get ten paying customers by the end of March.",
+     "Ten customers. Every day you don't ship pricing is a day nobody can pay you. Anything else on your mind?"),
+    ("Not really, I just keep procrastinating in the evenings.",
+     "Evenings are where your promises go to die. What will you do tonight instead of scrolling?"),
+]
+
+
+def run_call(turns: int, window: "ContextWindow | None", args: argparse.Namespace) -> dict:
+    system_prompt = AssistantPersonality(mood="Confrontational").get_system_prompt(user_context={})
+    chat_ctx = llm.ChatContext().append(role="system", text=system_prompt)
+    prompt_tokens, compact_ms = [], []
+
+    for turn in range(turns):
+        user_text, reply = SCRIPT[turn % len(SCRIPT)]
+        chat_ctx.append(llm.ChatMessage(role="user", content=user_text))
+        if window is not None:
+            started = time.perf_counter()
+            window.compact(chat_ctx)
+            compact_ms.append((time.perf_counter() - started) * 1000)
+        prompt_tokens.append(sum(estimate_tokens(message_text(message)) for message in chat_ctx.messages))
+        chat_ctx.append(llm.ChatMessage(role="assistant", content=reply))
+
+    ttft_ms = [args.ttft_ms + args.prefill_ms_per_1k * tokens / 1000 for tokens in prompt_tokens]
+    return {
+        "prompt_tokens": prompt_tokens,
+        "ttft_ms": ttft_ms,
+        "cost_usd": sum(prompt_tokens) * args.price_per_1m / 1_000_000,
+        "compact_ms": compact_ms,
+        "messages": len(chat_ctx.messages),
+        "chat_ctx": chat_ctx,
+    }
+
+
+def report(label: str, result: dict, turns: int) -> None:
+    tokens = result["prompt_tokens"]
+    checkpoints = [t for t in (1, 10, 25, 50, turns) if t <= turns]
+    print(f"{label}:")
+    print("  prompt tokens at turn " + ", ".join(f"{t}={tokens[t - 1]}" for t in checkpoints))
+    print(f"  modeled TTFT ms: turn 1={result['ttft_ms'][0]:.0f} turn {turns}={result['ttft_ms'][-1]:.0f}")
+    print(f"  input cost for the call: ${result['cost_usd']:.5f}, {result['messages']} messages kept")
+    if result["compact_ms"]:
+        compact = result["compact_ms"]
+        print(f"  compaction ms/turn: p50={percentile(compact, 50):.3f} p99={percentile(compact, 99):.3f} "
+              f"first 10 avg={sum(compact[:10]) / 10:.3f} last 10 avg={sum(compact[-10:]) / 10:.3f}")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--keep-messages", type=int, default=12, help="CONTEXT_KEEP_MESSAGES")
+    parser.add_argument("--window-tokens", type=int, default=1500, help="CONTEXT_WINDOW_TOKENS")
+    parser.add_argument("--summary-tokens", type=int, default=300, help="CONTEXT_SUMMARY_TOKENS")
+    parser.add_argument("--ttft-ms", type=float, default=350)
+    parser.add_argument("--prefill-ms-per-1k", type=float, default=20)
+    parser.add_argument("--price-per-1m", type=float, default=0.15, help="Input price, USD per 1M tokens")
+    parser.add_argument("--show-summary", action="store_true")
+    args = parser.parse_args()
+
+    full = run_call(args.turns, None, args)
+    window = ContextWindow(args.keep_messages, args.window_tokens, args.summary_tokens)
+    compacted = run_call(args.turns, window, args)
+
+    report("full history", full, args.turns)
+    report("rolling window", compacted, args.turns)
+    print(f"  window stats: {window.stats()}")
+    if args.show_summary:
+        summary = next(m for m in compacted["chat_ctx"].messages[1:] if m.role == "system")
+        print(summary.content)
+
+
+if __name__ == "__main__":
+    main_cli()
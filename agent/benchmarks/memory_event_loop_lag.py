@@ -0,0 +1,108 @@
+"""
+Event-loop lag benchmark for Supermemory context loading
+Runs N simultaneous call startups against a local stub Supermemory server
+
+Usage:
+    python benchmarks/memory_event_loop_lag.py --calls 50 --latency-ms 200
+    python benchmarks/memory_event_loop_lag.py --calls 50 --latency-ms 200 --blocking
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import statistics
+import urllib.request
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from memory import MemoryManager  # noqa: E402
+from stubs import start_stub_server, percentile  # noqa: E402
+
+
+def start_supermemory_stub(latency_ms: float) -> int:
+    """Stub Supermemory server answering GET /v1/memories after `latency_ms`"""
+
+    async def get_memories(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency_ms / 1000)
+        user_id = request.query.get("user_id", "unknown")
+        memories = [
+            {"content": f"{user_id} promised to run 5k", "tags": ["promise", "call"]},
+            {"content": f"{user_id} wants to ship the app", "tags": ["goal", "call"]},
+            {"content": f"{user_id} ran 3 times this week", "tags": ["progress"]},
+        ]
+        return web.json_response({"memories": memories})
+
+    return start_stub_server(lambda app: app.router.add_get("/v1/memories", get_memories))
+
+
+async def blocking_get_context(base_url: str, user_id: str) -> dict:
+    """Pre-async behaviour: synchronous HTTP inside an async function"""
+    url = f"{base_url}/v1/memories?user_id={user_id}&limit=10"
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return json.loads(response.read())
+
+
+async def measure_lag(stop: asyncio.Event, samples: list, interval: float = 0.01) -> None:
+    """Record how late the loop wakes a task that sleeps for `interval`"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def run(calls: int, latency_ms: float, blocking: bool) -> None:
+    port = start_supermemory_stub(latency_ms)
+    base_url = f"http://127.0.0.1:{port}"
+    manager = MemoryManager(api_key="bench", base_url=base_url)
+
+    async def simulated_entrypoint(index: int) -> float:
+        start = time.perf_counter()
+        if blocking:
+            await blocking_get_context(base_url, f"user-{index}")
+        else:
+            await manager.get_context_for_call(user_id=f"user-{index}", max_memories=10)
+        return (time.perf_counter() - start) * 1000
+
+    lag_samples: list = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_lag(stop, lag_samples))
+    await asyncio.sleep(0.05)
+
+    wall_start = time.perf_counter()
+    durations = await asyncio.gather(*(simulated_entrypoint(i) for i in range(calls)))
+    wall_ms = (time.perf_counter() - wall_start) * 1000
+
+    stop.set()
+    await lag_task
+    await manager.aclose()
+
+    mode = "blocking (sync HTTP)" if blocking else "async pooled client"
+    print(f"Mode: {mode}")
+    print(f"Calls: {calls}  stub latency: {latency_ms:.0f}ms  wall: {wall_ms:.0f}ms")
+    print(
+        f"Memory load  p50: {statistics.median(durations):.1f}ms"
+        f"  p99: {percentile(durations, 99):.1f}ms"
+    )
+    print(
+        f"Loop lag     p50: {percentile(lag_samples, 50):.1f}ms"
+        f"  p99: {percentile(lag_samples, 99):.1f}ms"
+        f"  max: {max(lag_samples, default=0):.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--blocking", action="store_true", help="Use the old sync HTTP path")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.latency_ms, args.blocking))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Room metadata parsing benchmark
+Times the per-job metadata parse for backend-sized prompt payloads: json.loads with key fallbacks vs CallConfigCache (cold and cached)
+
+Each job start parses its room's metadata. Retries and reconnects of a
+room deliver the same payload again; `--repeat` is how many job starts
+each distinct room gets.
+
+Usage:
+    python benchmarks/metadata_parse.py --prompt-kb 40 --rooms 200 --repeat 3
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import call_config  # noqa: E402
+from call_config import CallConfigCache  # noqa: E402
+
+
+def room_metadata(index: int, prompt_kb: int) -> str:
+    """Metadata as prompt-engine creates it, with a system prompt of about `prompt_kb` KB"""
+    promise = f"- Promise {index}: run 5k before work, ship the landing page, no phone after 10pm.\n"
+    return json.dumps({
+        "userId": f"user-{index}",
+        "callUUID": f"call-{index}",
+        "mood": "Confrontational",
+        "cartesiaVoiceId": f"voice-{index % 4}",
+        "supermemoryUserId": f"sm-{index}",
+        "vadProfile": "aggressive",
+        "prompts": {
+            "systemPrompt": "You are Future You.\n" + promise * (prompt_kb * 1024 // len(promise)),
+            "firstMessage": "Future You calling. Did you keep your promise? YES or NO.",
+        },
+    })
+
+
+def parse_inline(raw: str) -> tuple:
+    """What the entrypoint did before CallConfig: decode every time, then snake/camel fallbacks"""
+    metadata = json.loads(raw)
+    prompts = metadata.get("prompts") or {}
+    user_id = metadata.get("user_id") or metadata.get("userId", "unknown")
+    return (
+        user_id,
+        metadata.get("call_uuid") or metadata.get("callUUID", "unknown"),
+        metadata.get("mood", "supportive"),
+        metadata.get("cartesia_voice_id") or metadata.get("cartesiaVoiceId", "default"),
+        metadata.get("supermemory_user_id") or metadata.get("supermemoryUserId", user_id),
+        metadata.get("vad_profile") or metadata.get("vadProfile"),
+        prompts.get("systemPrompt") or prompts.get("system_prompt"),
+        prompts.get("firstMessage") or prompts.get("first_message"),
+    )
+
+
+def timed(label: str, payloads: list, parse) -> None:
+    started = time.perf_counter()
+    for raw in payloads:
+        parse(raw)
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<32} {elapsed / len(payloads) * 1e6:8.1f}us per job start  ({elapsed * 1000:.0f}ms total)")
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--prompt-kb", type=int, default=40)
+    parser.add_argument("--rooms", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3, help="Job starts per room (first start + retries/reconnects)")
+    args = parser.parse_args()
+
+    rooms = [room_metadata(index, args.prompt_kb) for index in range(args.rooms)]
+    payloads = [raw for raw in rooms for _ in range(args.repeat)]
+    print(f"{len(payloads)} job starts, {len(rooms)} rooms, {len(rooms[0]) / 1024:.0f} KB metadata each")
+
+    timed("json.loads + fallbacks", payloads, parse_inline)
+    decoder = call_config.orjson
+    for name, module in (("json", None), ("orjson", decoder)):
+        if name == "orjson" and decoder is None:
+            print("  (orjson not installed)")
+            continue
+        call_config.orjson = module
+        timed(f"CallConfigCache [{name}], no reuse", rooms, CallConfigCache().parse)
+        cache = CallConfigCache()
+        timed(f"CallConfigCache [{name}]", payloads, cache.parse)
+        print(f"    {cache.stats()}")
+    call_config.orjson = decoder
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,128 @@
+"""
+Prompt size benchmark for memory injection
+Compares first-N memory injection with relevance-ranked, token-budgeted packing on synthetic memories
+
+Uses tiktoken's gpt-4o encoding when installed, otherwise the ~4 chars/token estimate.
+
+Usage:
+    python benchmarks/prompt_size.py --memories 10 50 200 --budget 250
+"""
+
+import sys
+import random
+import argparse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from prompts import assemble_prompt, estimate_tokens, supermemory_section  # noqa: E402
+from memory_ranking import rank_context  # noqa: E402
+
+MOODS = ["Encouraging", "Confrontational", "Ruthless", "ColdMirror"]
+
+SHORT = [
+    "I will run 5k every morning before work",
+    "Ship the landing page by Friday",
+    "Meditated 10 minutes four days in a row",
+    "No phone after 10pm",
+    "Finish chapter 3 of the book",
+    "Cut sugar on weekdays",
+]
+
+LONG = (
+    "User talked at length about how work has been overwhelming, the commute is long, "
+    "their manager keeps adding scope, and they feel like there is no time left for the gym "
+    "or for the side project, but they still want to keep the streak alive somehow and asked "
+    "to be held to at least two short sessions per week until the release is out."
+)
+
+
+def token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.encoding_for_model("gpt-4o")
+        return "tiktoken gpt-4o", lambda text: len(encoding.encode(text))
+    except Exception:
+        return "estimate (~4 chars/token)", estimate_tokens
+
+
+def synthetic_memories(count: int, seed: int = 11) -> list:
+    """Mixed-age memories with long entries and near-duplicates, oldest first like a raw API page"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    memories = []
+    for index in range(count):
+        kind = rng.choice(["promise", "goal", "progress"])
+        roll = rng.random()
+        if roll < 0.15:
+            content = LONG
+        elif roll < 0.35 and memories:
+            # Restated memory with a trivial variation
+            content = memories[rng.randrange(len(memories))]["content"].rstrip(".") + "."
+        else:
+            content = f"{rng.choice(SHORT)} (call {index})"
+        age_days = (count - index) * rng.uniform(0.5, 2.0)
+        memories.append(
+            {
+                "content": content,
+                "tags": [kind, "call", rng.choice(MOODS)],
+                "metadata": {"timestamp": (now - timedelta(days=age_days)).isoformat()},
+            }
+        )
+    return memories
+
+
+def legacy_context(memories: list) -> dict:
+    """Previous behaviour: bucket by tag, then the section takes the first 5/5/3"""
+    return {
+        "promises": [m["content"] for m in memories if "promise" in m["tags"]],
+        "goals": [m["content"] for m in memories if "goal" in m["tags"]],
+        "progress": [m["content"] for m in memories if "progress" in m["tags"]],
+    }
+
+
+def injected(section: str) -> list:
+    return [line[2:] for line in section.splitlines() if line.startswith("- ")]
+
+
+def duplicates(items: list) -> int:
+    """Injected items that restate another one (ignoring case and trailing period)"""
+    return len(items) - len({item.rstrip(".").lower() for item in items})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--memories", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--budget", type=int, default=250)
+    parser.add_argument("--mood", default="Confrontational")
+    args = parser.parse_args()
+
+    name, count_tokens = token_counter()
+    print(f"tokenizer: {name}")
+    print(
+        f"{'memories':>9} {'first-N tok':>12} {'ranked tok':>11} "
+        f"{'first-N items':>14} {'ranked items':>13} {'first-N dups':>13} {'ranked dups':>12}"
+    )
+    for count in args.memories:
+        memories = synthetic_memories(count)
+        context = {**legacy_context(memories), "raw_memories": memories}
+
+        legacy = assemble_prompt("", [supermemory_section(context)], token_budget=10**9)
+        ranked = assemble_prompt(
+            "",
+            [supermemory_section(rank_context(context, args.mood, args.budget), limits=None)],
+            token_budget=10**9,
+        )
+
+        legacy_items, ranked_items = injected(legacy), injected(ranked)
+        print(
+            f"{count:>9} {count_tokens(legacy):>12} {count_tokens(ranked):>11} "
+            f"{len(legacy_items):>14} {len(ranked_items):>13} "
+            f"{duplicates(legacy_items):>13} {duplicates(ranked_items):>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Turn latency benchmark for speculative LLM turns
+Feeds scripted caller utterances through a per-call STT and measures end of speech to first LLM token with and without speculation
+
+Interim transcripts arrive word by word while the caller speaks. The turn
+ends at VAD silence + endpointing delay after the last word, and the final
+transcript is committed then; the fake LLM answers after its TTFT. Without
+speculation the LLM request starts at end of turn. Utterances that change
+after a stable interim (the caller adds to their answer) show discards.
+
+Usage:
+    python benchmarks/speculative_turns.py --silence-ms 200 --endpointing-ms 300 --llm-ttft-ms 350
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+import fake_livekit  # noqa: E402
+
+fake_livekit.install()
+
+from livekit.agents import llm  # noqa: E402
+
+from call_plugins import CallSTT  # noqa: E402
+from speculative import SpeculativeTurns  # noqa: E402
+from stubs import percentile  # noqa: E402
+
+# (label, words spoken, pause in ms after each word index, if any)
+UTTERANCES = [
+    ("binary", "Yes.", {}),
+    ("binary", "No, I didn't.", {}),
+    ("short", "I went for a run this morning.", {}),
+    ("short", "Work ran late again.", {}),
+    ("long", "I started the landing page but got stuck on pricing and then my manager pulled me into a meeting.", {}),
+    ("continued", "I did it. Well, most of it, not the last part.", {2: 450}),
+    # The reply speculated during the pause after "Yes," must be discarded
+    ("contradicted", "Yes, but I skipped the gym.", {1: 450}),
+]
+
+
+async def run_turn(turns: SpeculativeTurns, stream, fake_llm, text: str, pauses: dict, args) -> float:
+    """Milliseconds from the caller's last word to the first LLM token"""
+    words = text.split()
+    stream.push_event(fake_livekit.SpeechEventType.START_OF_SPEECH)
+    turns.user_started_speaking()
+    for index in range(len(words)):
+        await asyncio.sleep(args.word_ms / 1000)
+        stream.push_event(fake_livekit.SpeechEventType.INTERIM_TRANSCRIPT, " ".join(words[: index + 1]))
+        pause = pauses.get(index + 1, 0)
+        if pause:
+            await vad_pause(turns, pause, args)
+    speech_ended = time.perf_counter()
+
+    await vad_pause(turns, args.silence_ms, args)
+    await asyncio.sleep(args.endpointing_ms / 1000)
+    stream.push_event(fake_livekit.SpeechEventType.FINAL_TRANSCRIPT, text)
+    await asyncio.sleep(0)
+
+    chat_ctx = turns.context(text)
+    llm_stream = turns.take(chat_ctx) or fake_llm.chat(chat_ctx=chat_ctx)
+    async for _ in llm_stream:
+        break
+    await llm_stream.aclose()
+    return (time.perf_counter() - speech_ended) * 1000
+
+
+async def vad_pause(turns: SpeculativeTurns, pause_ms: float, args) -> None:
+    """Silence from the caller; the VAD reports it after `--silence-ms`"""
+    await asyncio.sleep(min(pause_ms, args.silence_ms) / 1000)
+    if pause_ms >= args.silence_ms:
+        turns.user_stopped_speaking()
+        await asyncio.sleep((pause_ms - args.silence_ms) / 1000)
+        if pause_ms > args.silence_ms:
+            turns.user_started_speaking()
+
+
+async def run_call(args: argparse.Namespace, speculative: bool) -> dict:
+    fake_llm = fake_livekit.FakeLLM()
+    chat_ctx = llm.ChatContext().append(role="system", text="You are Future You. " * 100)
+    turns = SpeculativeTurns(
+        fake_llm, lambda text: chat_ctx.copy().append(role="user", text=text), stable_ms=args.stable_ms
+    )
+    on_event = turns.on_speech_event if speculative else (lambda event: None)
+    stt = CallSTT(fake_livekit.FakeSTT(), on_event)
+    stream = stt.stream()
+    consumer = asyncio.ensure_future(_drain(stream))
+
+    latencies: dict = {}
+    for label, text, pauses in UTTERANCES:
+        discarded = turns.discarded
+        latency = await run_turn(turns, stream, fake_llm, text, pauses, args)
+        latencies.setdefault(label, []).append(latency)
+        if speculative and label == "contradicted":
+            assert turns.discarded > discarded, f"reply speculated for 'Yes' kept for {text!r}"
+
+    await stream.aclose()
+    await consumer
+    await stt.aclose()
+    return {"latencies": latencies, "requests": fake_llm.requests, "stats": turns.stats()}
+
+
+async def run(args: argparse.Namespace, speculative: bool) -> dict:
+    """`--calls` independent calls at once, each speaking every utterance"""
+    fake_livekit.LATENCY.llm_ttft_ms = args.llm_ttft_ms
+    results = await asyncio.gather(*(run_call(args, speculative) for _ in range(args.calls)))
+    latencies: dict = {}
+    stats = {"started": 0, "used": 0, "discarded": 0}
+    for result in results:
+        for label, values in result["latencies"].items():
+            latencies.setdefault(label, []).extend(values)
+        for key in stats:
+            stats[key] += result["stats"][key]
+    return {"latencies": latencies, "requests": sum(r["requests"] for r in results), "stats": stats}
+
+
+async def _drain(stream) -> None:
+    async for _ in stream:
+        pass
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    parser.add_argument("--word-ms", type=float, default=200, help="Interim transcript cadence (one word each)")
+    parser.add_argument("--silence-ms", type=float, default=200, help="VAD silence duration")
+    parser.add_argument("--endpointing-ms", type=float, default=300, help="Endpointing delay after VAD silence")
+    parser.add_argument("--stable-ms", type=float, default=200, help="SPECULATIVE_STABLE_MS")
+    parser.add_argument("--llm-ttft-ms", type=float, default=350)
+    args = parser.parse_args()
+
+    turns = args.calls * len(UTTERANCES)
+    for speculative in (False, True):
+        result = asyncio.run(run(args, speculative))
+        print(f"{'speculative' if speculative else 'baseline'}: {result['requests']} LLM requests for {turns} turns"
+              + (f", {result['stats']}" if speculative else ""))
+        for label, values in result["latencies"].items():
+            print(f"  {label:<12} end of speech -> first token p50={percentile(values, 50):.0f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,44 @@
+"""
+Local stub HTTP servers for benchmarks
+Each server runs on its own thread and event loop so a blocked client loop cannot stall it
+"""
+
+import socket
+import asyncio
+import threading
+from typing import Callable
+
+from aiohttp import web
+
+
+def start_stub_server(setup: Callable[[web.Application], None]) -> int:
+    """Start an aiohttp app configured by `setup` on 127.0.0.1, return its port"""
+    ready = threading.Event()
+    state = {}
+
+    def run() -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        app = web.Application()
+        setup(app)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        state["port"] = sock.getsockname()[1]
+        loop.run_until_complete(web.SockSite(runner, sock).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return state["port"]
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
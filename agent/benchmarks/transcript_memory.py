@@ -0,0 +1,86 @@
+"""
+Transcript memory benchmark
+Simulates a 2-hour call and compares retained memory of the old list-of-dicts
+transcript (plus the parallel line buffer) against the compact Transcript store
+
+Usage:
+    python benchmarks/transcript_memory.py --minutes 120 --turns-per-minute 12
+"""
+
+import gc
+import sys
+import time
+import random
+import argparse
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from transcript import Transcript  # noqa: E402
+
+WORDS = (
+    "did you do it yes or no I will run tomorrow morning the goal is to ship "
+    "this week honestly it was difficult but I finished the workout"
+).split()
+
+
+def utterances(turns: int, seed: int = 11):
+    rng = random.Random(seed)
+    for index in range(turns):
+        speaker = "agent" if index % 2 == 0 else "user"
+        # Fresh string objects, like text arriving from STT/LLM events
+        yield speaker, " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 30)))
+
+
+def legacy_store(turns: int):
+    transcript, transcript_lines = [], []
+    for speaker, text in utterances(turns):
+        transcript.append({"speaker": speaker, "text": text})
+        transcript_lines.append(f"{speaker.title()}: {text}")
+    return transcript, transcript_lines
+
+
+def compact_store(turns: int):
+    transcript = Transcript()
+    for speaker, text in utterances(turns):
+        transcript.append(speaker, text)
+    return transcript
+
+
+def retained_bytes(build, turns: int):
+    gc.collect()
+    tracemalloc.start()
+    store = build(turns)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=int, default=120)
+    parser.add_argument("--turns-per-minute", type=int, default=12)
+    args = parser.parse_args()
+    turns = args.minutes * args.turns_per_minute
+
+    legacy_bytes, (legacy, _) = retained_bytes(legacy_store, turns)
+    compact_bytes, compact = retained_bytes(compact_store, turns)
+
+    start = time.perf_counter()
+    legacy_text = "\n".join([f"{msg['speaker']}: {msg['text']}" for msg in legacy])
+    legacy_render_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    compact_text = compact.render()
+    compact_render_ms = (time.perf_counter() - start) * 1000
+    assert legacy_text == compact_text
+
+    print(f"Turns: {turns} ({args.minutes} min call), transcript {len(compact_text) / 1024:.0f} KiB")
+    print(f"list-of-dicts + line buffer: {legacy_bytes / 1024:8.0f} KiB  render {legacy_render_ms:.2f}ms")
+    print(f"compact Transcript:          {compact_bytes / 1024:8.0f} KiB  render {compact_render_ms:.2f}ms")
+    print(f"Reduction: {legacy_bytes / compact_bytes:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
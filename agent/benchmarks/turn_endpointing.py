@@ -0,0 +1,99 @@
+"""
+End-of-turn latency benchmark for VAD profiles and adaptive endpointing
+Simulates callers with different pause habits on a virtual clock and compares fixed presets with the adaptive delay
+
+Each turn the caller may pause mid-thought before finishing. A pause longer
+than the VAD silence plus the endpointing delay ends the turn early (the
+agent starts answering an unfinished thought). After the caller really
+finishes, the turn ends after silence + delay: that is the endpointing part
+of response latency. AdaptiveEndpointing is driven with the same speaking
+events the pipeline emits.
+
+Usage:
+    python benchmarks/turn_endpointing.py --turns 40 --calls 200
+"""
+
+import sys
+import random
+import argparse
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from config import VAD_CONFIG  # noqa: E402
+from endpointing import AdaptiveEndpointing  # noqa: E402
+
+# Caller pause habits: chance of each mid-turn pause and its length in seconds (lognormal)
+PERSONAS = {
+    "crisp": {"pause_chance": 0.05, "max_pauses": 1, "median_s": 0.4, "sigma": 0.4},
+    "mixed": {"pause_chance": 0.3, "max_pauses": 2, "median_s": 0.6, "sigma": 0.5},
+    "thinker": {"pause_chance": 0.6, "max_pauses": 3, "median_s": 0.9, "sigma": 0.4},
+}
+
+REPLY_MS = 600  # LLM first token + TTS first byte after the turn ends
+SPEECH_S = 3.0  # agent reply playback
+
+
+def simulate_call(persona: dict, profile: str, adaptive: bool, turns: int, rng: random.Random) -> dict:
+    config = VAD_CONFIG[profile]
+    silence = config["silence_duration_ms"] / 1000
+    endpointing = AdaptiveEndpointing(config["endpointing_delay_ms"] / 1000, adaptive=adaptive)
+    now = 0.0
+    latencies, cut_turns = [], 0
+
+    for _ in range(turns):
+        endpointing.user_started_speaking(now)
+        cut = False
+        pauses = [
+            rng.lognormvariate(0, persona["sigma"]) * persona["median_s"]
+            for _ in range(persona["max_pauses"])
+            if rng.random() < persona["pause_chance"]
+        ]
+        for pause in pauses:
+            now += rng.uniform(0.8, 2.5)  # speech before the pause
+            if pause <= silence:
+                now += pause  # too short for the VAD to report
+                continue
+            endpointing.user_stopped_speaking(now - pause + silence)
+            cut = cut or pause > silence + endpointing.delay
+            now += pause
+            endpointing.user_started_speaking(now)
+
+        now += rng.uniform(0.5, 2.0)  # final words
+        endpointing.user_stopped_speaking(now + silence)
+        latencies.append(silence + endpointing.delay)
+        cut_turns += cut
+        now += silence + endpointing.delay + REPLY_MS / 1000 + SPEECH_S
+
+    return {"latencies": latencies, "cut_turns": cut_turns, "final_delay": endpointing.delay}
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=40)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    modes = [(profile, False) for profile in VAD_CONFIG] + [("balanced", True)]
+    print(f"{args.calls} calls x {args.turns} turns per persona; latency = VAD silence + endpointing delay")
+    for name, persona in PERSONAS.items():
+        print(f"{name}:")
+        for profile, adaptive in modes:
+            rng = random.Random(args.seed)
+            latencies, cut_turns, final = [], 0, []
+            for _ in range(args.calls):
+                result = simulate_call(persona, profile, adaptive, args.turns, rng)
+                latencies.extend(result["latencies"])
+                cut_turns += result["cut_turns"]
+                final.append(result["final_delay"])
+            label = f"adaptive from {profile}" if adaptive else profile
+            print(f"  {label:<24} end-of-turn {sum(latencies) / len(latencies) * 1000:5.0f}ms  "
+                  f"cut off {cut_turns / len(latencies) * 100:5.1f}% of turns  "
+                  f"final delay {sum(final) / len(final) * 1000:4.0f}ms")
+
+
+if __name__ == "__main__":
+    main_cli()
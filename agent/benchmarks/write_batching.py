@@ -0,0 +1,96 @@
+"""
+Supermemory write batching check
+Ends many calls at once against a stub server that records the size of every bulk request
+
+Usage:
+    python benchmarks/write_batching.py --calls 200 --batch-size 50 --window-ms 250
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from memory import MemoryManager  # noqa: E402
+from post_call import PostCallProcessor  # noqa: E402
+from stubs import start_stub_server  # noqa: E402
+
+
+def start_batch_stub(latency_ms: float, batch_sizes: list) -> int:
+    """Stub bulk endpoint; items whose content contains 'FAIL' are rejected individually"""
+
+    async def post_batch(request: web.Request) -> web.Response:
+        body = await request.json()
+        memories = body.get("memories", [])
+        batch_sizes.append(len(memories))
+        await asyncio.sleep(latency_ms / 1000)
+        results = [
+            {"status": 400, "error": "rejected"} if "FAIL" in memory.get("content", "") else {"status": 201}
+            for memory in memories
+        ]
+        return web.json_response({"results": results}, status=207)
+
+    return start_stub_server(lambda app: app.router.add_post("/v1/memories/batch", post_batch))
+
+
+async def run(calls: int, batch_size: int, window_ms: float, latency_ms: float, fail_every: int) -> None:
+    batch_sizes: list = []
+    port = start_batch_stub(latency_ms, batch_sizes)
+    manager = MemoryManager(
+        api_key="bench",
+        base_url=f"http://127.0.0.1:{port}",
+        batch_size=batch_size,
+        batch_window=window_ms / 1000,
+    )
+    processor = PostCallProcessor(manager)
+
+    async def end_call(index: int):
+        marker = "FAIL" if fail_every and index % fail_every == 0 else "ok"
+        return await asyncio.gather(
+            processor.save_call_summary(
+                user_id=f"user-{index}",
+                call_uuid=f"call-{index}",
+                transcript=f"user: I will run tomorrow ({marker})",
+                mood="Encouraging",
+                insights={},
+            ),
+            processor.store_call_metadata(
+                user_id=f"user-{index}",
+                call_uuid=f"call-{index}",
+                metadata={"mood": "Encouraging", "duration_seconds": 120},
+            ),
+        )
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(end_call(i) for i in range(calls)))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    await manager.aclose()
+
+    saved = sum(1 for memory_ok, _ in results if memory_ok)
+    stored = sum(1 for _, metadata_ok in results if metadata_ok)
+    print(f"Calls: {calls}  writes: {calls * 2}  elapsed: {elapsed_ms:.0f}ms")
+    print(f"Bulk requests: {len(batch_sizes)}  (was {calls * 2} single POSTs)")
+    print(f"Batch sizes: {dict(sorted(Counter(batch_sizes).items()))}")
+    print(f"Per-item results: memories saved {saved}/{calls}, metadata stored {stored}/{calls}")
+    print(f"Batcher stats: {manager.batcher.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--window-ms", type=float, default=250)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--fail-every", type=int, default=25, help="Reject every Nth memory (0 = none)")
+    args = parser.parse_args()
+    asyncio.run(run(args.calls, args.batch_size, args.window_ms, args.latency_ms, args.fail_every))
+
+
+if __name__ == "__main__":
+    main()
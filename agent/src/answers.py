@@ -0,0 +1,44 @@
+"""
+Binary answer classification for You+ Agent
+Recognizes yes/no answers to the agent's questions, shared by context folding, speculation and the fast path
+"""
+
+import re
+from typing import Optional
+
+_BINARY_ANSWER = re.compile(r"^\W*(yes|yeah|yep|yup|no|nope|nah)\b", re.IGNORECASE)
+_ANSWER_WORDS = {"yes": "YES", "yeah": "YES", "yep": "YES", "yup": "YES", "no": "NO", "nope": "NO", "nah": "NO"}
+# What may follow the answer words of a bare answer: a restatement, never a new clause
+_ANSWER_TAILS = {
+    "YES": frozenset(("", "i did", "i did it", "did it", "i have")),
+    "NO": frozenset(("", "i didn't", "i did not", "didn't", "not yet", "i haven't", "i have not")),
+}
+_WORD = re.compile(r"[\w']+")
+
+
+def binary_answer(text: str) -> Optional[str]:
+    """"YES"/"NO" if a short utterance answers a binary question, else None"""
+    match = _BINARY_ANSWER.match(text)
+    if not match or len(text.split()) > 6:
+        return None
+    return "YES" if match.group(1).lower() in ("yes", "yeah", "yep", "yup") else "NO"
+
+
+def bare_binary_answer(text: str) -> Optional[str]:
+    """
+    "YES"/"NO" if the utterance is nothing but a yes/no answer, else None
+
+    "Yes.", "Yeah yeah" and "No, I didn't." are bare; "Yes but I skipped the
+    gym", "No I quit my job today" and "Yeah no, I did not" are not.
+    """
+    words = _WORD.findall(text.lower().replace("\u2019", "'"))
+    answer = None
+    index = 0
+    while index < len(words) and words[index] in _ANSWER_WORDS:
+        if answer is not None and _ANSWER_WORDS[words[index]] != answer:
+            return None  # Mixed signals
+        answer = _ANSWER_WORDS[words[index]]
+        index += 1
+    if answer is None or " ".join(words[index:]) not in _ANSWER_TAILS[answer]:
+        return None
+    return answer
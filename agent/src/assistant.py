@@ -14,8 +14,12 @@ Future You Character Traits:
 """
 
 import logging
-from typing import Optional, Dict, Any
-from .memory import MemoryManager
+from typing import Optional, Dict, Any, List
+from memory import MemoryManager
+from insights import StreamingInsights
+from transcript import Transcript
+from prompts import StaticPromptCache, assemble_prompt, fallback_context_section
+from memory_ranking import rank_context
 
 logger = logging.getLogger(__name__)
 
@@ -91,7 +95,24 @@ class AssistantPersonality:
         Returns:
             System prompt for the LLM
         """
-        base_prompt = f"""# FUTURE YOU - Wise Accountability Mentor (FALLBACK)
+        base_prompt = _BASE_PROMPTS.get(self.mood)
+
+        # Add user context if available
+        if not user_context:
+            return base_prompt
+        ranked_context = rank_context(user_context, self.mood)
+        return assemble_prompt(base_prompt, [fallback_context_section(ranked_context, limits=None)])
+
+    @classmethod
+    def precompile_prompts(cls) -> None:
+        """Render the static prompt for every known mood (called from prewarm)"""
+        _BASE_PROMPTS.precompile(cls.MOOD_PROMPTS)
+
+    @classmethod
+    def _render_base_prompt(cls, mood: str) -> str:
+        """Static part of the fallback prompt; depends only on mood"""
+        prompt_config = cls.MOOD_PROMPTS.get(mood, cls.MOOD_PROMPTS["Confrontational"])
+        return f"""# FUTURE YOU - Wise Accountability Mentor (FALLBACK)
 
 You are Future You, their older self who succeeded. Wise accountability mentor who pushes toward greatness. Not a coach/therapist/friend - their future self holding them accountable with wisdom.
 
@@ -121,51 +142,78 @@ You are Future You, their older self who succeeded. Wise accountability mentor w
 
 **Always:** Hold accountable, reference goals, push greatness, speak from wisdom, demand action, end with forward momentum.
 
-**Mood:** {self.mood} | **Tone:** {self.prompt_config['tone']} | **Approach:** {self.prompt_config['approach']}
+**Mood:** {mood} | **Tone:** {prompt_config['tone']} | **Approach:** {prompt_config['approach']}
 
 **Cartesia TTS:** Punctuation always. Dates: MM/DD/YYYY. Time: "7:00 PM". Pauses: `<break time="1s"/>` (2s after truths, 500ms after interruptions). Emotion: `<emotion value="determined" />` (determined/confident/proud/contemplative based on tone). Speed: `<speed ratio="1.3"/>` (fast) or `<speed ratio="0.8"/>` (slow). Volume: `<volume ratio="1.5"/>` (loud) or `<volume ratio="0.7"/>` (quiet). Spell: `<spell>3</spell>` for numbers. Nonverbal: `[laughter]` sparingly. Combine: `<emotion value="determined" /><speed ratio="1.2"/>Did you do it?<break time="1s"/>YES or NO.` Tags = 1 char (no spaces).
 """
 
-        # Add user context if available
-        if user_context:
-            context_section = self._build_context_section(user_context)
-            base_prompt += f"\n{context_section}"
-
-        return base_prompt
-
-    def _build_context_section(
-        self,
-        user_context: Dict[str, Any],
-    ) -> str:
-        """Build context section from user memories"""
-        context = "\nUser Context (from previous calls):\n"
+    # Fallback openings, used when the backend sends no first message
+    OPENINGS = {
+        "Encouraging": '<emotion value="determined" />You got this.<break time="1s"/>Did you do it? YES or NO.',
+        "Confrontational": '<emotion value="confident" />Future You calling.<break time="500ms"/>Binary question. Did you keep your promise?',
+        "Ruthless": '<emotion value="determined" /><speed ratio="1.1"/>Time for accountability.<break time="1s"/>Did you do what you said or not?',
+        "ColdMirror": '<emotion value="contemplative" />Future You here.<break time="1s"/>Truth time. Did you do it?',
+    }
+    DEFAULT_OPENING = '<emotion value="determined" />Future You here. Did you do it? YES or NO.'
 
-        if user_context.get("promises"):
-            context += "Recent Promises:\n"
-            for promise in user_context.get("promises", [])[:3]:
-                context += f"- {promise}\n"
+    def get_opening_message(self) -> str:
+        """Get Future You opening message based on mood with Cartesia TTS formatting"""
+        return self.OPENINGS.get(self.mood, self.DEFAULT_OPENING)
+
+    # The scripted did-you-keep-your-promise questions (openings, and the prompt's binary rule).
+    # Acknowledgments only make sense as answers to one of these (see fast_path.py).
+    PROMISE_QUESTIONS = (
+        "Did you do it? YES or NO.",
+        "Did you keep your promise?",
+        "Did you do what you said or not?",
+        "Did you do it?",
+    )
+
+    # Short first reactions to frequent answers (see fast_path.py); the LLM follows up after them.
+    # Kept to a few fixed strings per mood so their audio is served from the TTS cache.
+    ACKNOWLEDGMENTS = {
+        "Encouraging": {
+            "yes": ['<emotion value="proud" />That\'s what I thought. Good.', '<emotion value="proud" />Yes. That\'s you.'],
+            "no": ['<emotion value="determined" />Okay. Honest answer.', '<emotion value="determined" />Alright. No.'],
+            "partial": ['<emotion value="determined" />Part of it. That\'s a start.'],
+            "unsure": ['<emotion value="contemplative" />Take a second.'],
+        },
+        "Confrontational": {
+            "yes": ['<emotion value="confident" />Good.', '<emotion value="confident" />Yes. Noted.'],
+            "no": ['<emotion value="confident" />No.<break time="500ms"/>', '<emotion value="confident" />Noted.'],
+            "partial": ['<emotion value="confident" />Partly is not yes.'],
+            "unsure": ['<emotion value="confident" />You know the answer.'],
+        },
+        "Ruthless": {
+            "yes": ['<emotion value="determined" />Good. Keep it that way.', '<emotion value="determined" />Yes. Good.'],
+            "no": ['<emotion value="determined" />No. Then we talk about it.', '<emotion value="determined" />No. Own it.'],
+            "partial": ['<emotion value="determined" />Half done is not done.'],
+            "unsure": ['<emotion value="determined" />You know whether you did it.'],
+        },
+        "ColdMirror": {
+            "yes": ['<emotion value="contemplative" />Yes. Noted.'],
+            "no": ['<emotion value="contemplative" />No. Noted.'],
+            "partial": ['<emotion value="contemplative" />Partly. Noted.'],
+            "unsure": ['<emotion value="contemplative" />Not knowing is an answer too.'],
+        },
+    }
 
-        if user_context.get("goals"):
-            context += "Current Goals:\n"
-            for goal in user_context.get("goals", [])[:3]:
-                context += f"- {goal}\n"
+    def get_acknowledgments(self, intent: str) -> List[str]:
+        """Acknowledgment variants for an answer intent in this mood (empty if none)"""
+        return self.ACKNOWLEDGMENTS.get(self.mood, self.ACKNOWLEDGMENTS["Confrontational"]).get(intent, [])
 
-        if user_context.get("progress"):
-            context += "Recent Progress:\n"
-            for progress in user_context.get("progress", [])[:3]:
-                context += f"- {progress}\n"
+    @classmethod
+    def recurring_phrases(cls) -> List[str]:
+        """Every fixed utterance in any mood: fallback openings and acknowledgments (the TTS cache's allowlist)"""
+        phrases = [*cls.OPENINGS.values(), cls.DEFAULT_OPENING]
+        for acknowledgments in cls.ACKNOWLEDGMENTS.values():
+            for variants in acknowledgments.values():
+                phrases.extend(variants)
+        return phrases
 
-        return context
 
-    def get_opening_message(self) -> str:
-        """Get Future You opening message based on mood with Cartesia TTS formatting"""
-        openings = {
-            "Encouraging": '<emotion value="determined" />You got this.<break time="1s"/>Did you do it? YES or NO.',
-            "Confrontational": '<emotion value="confident" />Future You calling.<break time="500ms"/>Binary question. Did you keep your promise?',
-            "Ruthless": '<emotion value="determined" /><speed ratio="1.1"/>Time for accountability.<break time="1s"/>Did you do what you said or not?',
-            "ColdMirror": '<emotion value="contemplative" />Future You here.<break time="1s"/>Truth time. Did you do it?',
-        }
-        return openings.get(self.mood, '<emotion value="determined" />Future You here. Did you do it? YES or NO.')
+# Static fallback prompts, rendered once per mood per process
+_BASE_PROMPTS = StaticPromptCache(AssistantPersonality._render_base_prompt)
 
 
 class ConversationManager:
@@ -182,7 +230,9 @@ class ConversationManager:
         self.personality = AssistantPersonality(mood=mood)
         self.memory_manager = memory_manager
         self.user_context = {}
-        self.transcript = []
+        self.transcript = Transcript()
+        # Promise/goal/blocker/progress/sentiment state, updated per utterance
+        self.insights = StreamingInsights()
 
     async def initialize(self) -> str:
         """
@@ -212,14 +262,19 @@ class ConversationManager:
         )
 
     def add_to_transcript(self, speaker: str, text: str) -> None:
-        """Log message to transcript"""
-        self.transcript.append({"speaker": speaker, "text": text})
+        """Log message to transcript and update live insights"""
+        self.transcript.append(speaker, text)
+        matched = self.insights.add_line(f"{speaker}: {text}")
+        if matched:
+            logger.debug(f"Live insights from {speaker}: {', '.join(sorted(matched))}")
 
     def get_transcript(self) -> str:
         """Get formatted transcript"""
-        return "\n".join(
-            [f"{msg['speaker']}: {msg['text']}" for msg in self.transcript]
-        )
+        return self.transcript.render()
+
+    def get_insights(self) -> Dict[str, Any]:
+        """Insights so far (same shape as post-call extraction); final once the call has ended"""
+        return self.insights.snapshot()
 
     def get_user_context(self) -> Dict[str, Any]:
         """Get current user context"""
@@ -0,0 +1,180 @@
+"""
+Pre-rendered audio lookup for You+ Agent
+Resolves audio references from room metadata (local paths or blob keys) through pluggable stores
+"""
+
+import io
+import os
+import abc
+import time
+import wave
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+
+from tts_cache import CachedAudio
+
+logger = logging.getLogger(__name__)
+
+# Pre-rendered first messages are a few seconds of speech; anything far larger is a bad reference
+MAX_AUDIO_BYTES = 10 * 1024 * 1024
+
+
+class AudioStore(abc.ABC):
+    """Fetches the raw bytes of a 16-bit PCM WAV file by reference"""
+
+    @abc.abstractmethod
+    async def fetch(self, ref: str) -> Optional[bytes]:
+        """The file's bytes, or None if missing or over MAX_AUDIO_BYTES"""
+
+    async def aclose(self) -> None:
+        pass
+
+
+class LocalAudioStore(AudioStore):
+    """Files under `root`; references are relative paths or absolute paths inside it"""
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+
+    async def fetch(self, ref: str) -> Optional[bytes]:
+        if ref.startswith("file://"):
+            ref = ref[len("file://"):]
+        path = os.path.realpath(os.path.join(self.root, ref))
+        if os.path.commonpath([self.root, path]) != self.root:
+            logger.warning(f"⚠️ Audio reference outside {self.root}: {ref}")
+            return None
+        return await asyncio.to_thread(self._read, path)
+
+    @staticmethod
+    def _read(path: str) -> Optional[bytes]:
+        if not os.path.isfile(path) or os.path.getsize(path) > MAX_AUDIO_BYTES:
+            return None
+        with open(path, "rb") as audio_file:
+            return audio_file.read()
+
+
+class HTTPAudioStore(AudioStore):
+    """Blob keys under a base URL (e.g. the public R2 audio bucket)"""
+
+    def __init__(self, base_url: str, timeout: float = 2.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def fetch(self, ref: str) -> Optional[bytes]:
+        url = ref if ref.startswith(self.base_url + "/") else f"{self.base_url}/{ref.lstrip('/')}"
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+        async with self._session.get(url) as response:
+            if response.status != 200:
+                logger.warning(f"⚠️ Audio fetch {url} returned {response.status}")
+                return None
+            if (response.content_length or 0) > MAX_AUDIO_BYTES:
+                logger.warning(f"⚠️ Audio {url} is {response.content_length} bytes, over {MAX_AUDIO_BYTES}")
+                return None
+            # Chunked responses carry no length; cap what we buffer as it arrives
+            data = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                data.extend(chunk)
+                if len(data) > MAX_AUDIO_BYTES:
+                    logger.warning(f"⚠️ Audio {url} exceeded {MAX_AUDIO_BYTES} bytes, giving up")
+                    return None
+            return bytes(data)
+
+    async def aclose(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+def decode_wav(data: bytes) -> CachedAudio:
+    """16-bit PCM WAV bytes to CachedAudio (raises wave.Error/EOFError on anything else)"""
+    with wave.open(io.BytesIO(data), "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise wave.Error(f"expected 16-bit PCM, got {wav.getsampwidth() * 8}-bit")
+        return CachedAudio(wav.getframerate(), wav.getnchannels(), wav.readframes(wav.getnframes()))
+
+
+class AudioStores:
+    """
+    Routes audio references to stores by prefix
+
+    The longest registered prefix matching a reference wins (e.g. "file://"
+    or an https base URL); references without a scheme are blob keys and go
+    to the default store. Unknown schemes are refused rather than fetched.
+    """
+
+    def __init__(self, default: Optional[AudioStore] = None):
+        self.default = default
+        self._routes: List[Tuple[str, AudioStore]] = []
+
+        self.loaded = 0
+        self.failed = 0
+        self.last_load_ms = 0.0
+
+    def register(self, prefix: str, store: AudioStore) -> None:
+        self._routes.append((prefix, store))
+        self._routes.sort(key=lambda route: len(route[0]), reverse=True)
+
+    def store_for(self, ref: str) -> Optional[AudioStore]:
+        for prefix, store in self._routes:
+            if ref.startswith(prefix):
+                return store
+        return None if "://" in ref else self.default
+
+    async def load(self, ref: str) -> Optional[CachedAudio]:
+        """Fetch and decode a reference (never raises)"""
+        store = self.store_for(ref)
+        if store is None:
+            logger.warning(f"⚠️ No audio store for reference: {ref}")
+            self.failed += 1
+            return None
+
+        started = time.perf_counter()
+        try:
+            data = await store.fetch(ref)
+            audio = decode_wav(data) if data else None
+        except (OSError, EOFError, wave.Error, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning(f"⚠️ Could not load audio {ref}: {e}")
+            audio = None
+        self.last_load_ms = (time.perf_counter() - started) * 1000
+
+        if audio is None:
+            self.failed += 1
+        else:
+            self.loaded += 1
+        return audio
+
+    async def aclose(self) -> None:
+        stores = {id(store): store for _, store in self._routes}
+        if self.default is not None:
+            stores[id(self.default)] = self.default
+        await asyncio.gather(*(store.aclose() for store in stores.values()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"loaded": self.loaded, "failed": self.failed, "last_load_ms": self.last_load_ms}
+
+
+def init_audio_stores() -> AudioStores:
+    """
+    Audio stores from environment variables
+
+    FIRST_MESSAGE_AUDIO_DIR serves local files (file:// or absolute paths
+    inside it); FIRST_MESSAGE_AUDIO_BASE_URL serves URLs under it. Bare blob
+    keys go to the remote store when configured, otherwise the local one.
+    """
+    stores = AudioStores()
+    local_dir = os.getenv("FIRST_MESSAGE_AUDIO_DIR", "")
+    if local_dir:
+        local = LocalAudioStore(local_dir)
+        stores.register("file://", local)
+        stores.register(local.root + os.sep, local)
+        stores.default = local
+    base_url = os.getenv("FIRST_MESSAGE_AUDIO_BASE_URL", "")
+    if base_url:
+        remote = HTTPAudioStore(base_url, timeout=float(os.getenv("FIRST_MESSAGE_AUDIO_TIMEOUT", "1.0")))
+        stores.register(remote.base_url + "/", remote)
+        stores.default = remote
+    return stores
@@ -0,0 +1,201 @@
+"""
+Typed call configuration for You+ Agent
+Parses room metadata once per distinct payload, validates it and caches the result by the payload
+"""
+
+import os
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard json module
+    orjson = None
+
+from config import VAD_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# attribute -> metadata keys, first non-empty wins (the backend has sent both spellings)
+_METADATA_FIELDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("user_id", ("user_id", "userId")),
+    ("call_uuid", ("call_uuid", "callUUID")),
+    ("mood", ("mood",)),
+    ("cartesia_voice_id", ("cartesia_voice_id", "cartesiaVoiceId")),
+    ("supermemory_user_id", ("supermemory_user_id", "supermemoryUserId")),
+    ("vad_profile", ("vad_profile", "vadProfile")),
+)
+
+# Same, inside metadata["prompts"] (from prompt-engine)
+_PROMPT_FIELDS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("system_prompt", ("systemPrompt", "system_prompt")),
+    ("first_message", ("firstMessage", "first_message")),
+    ("first_message_audio", ("firstMessageAudio", "first_message_audio")),
+)
+
+
+def _loads(raw: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _first_string(data: Dict[str, Any], keys: Tuple[str, ...], problems: List[str]) -> Optional[str]:
+    for key in keys:
+        value = data.get(key)
+        if value is None or value == "":
+            continue
+        if isinstance(value, str):
+            return value
+        problems.append(f"{key} is {type(value).__name__}, not str")
+    return None
+
+
+def _adaptive_flag(data: Dict[str, Any], problems: List[str]) -> Optional[bool]:
+    for key in ("vad_adaptive", "vadAdaptive"):
+        value = data.get(key)
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.lower() in ("true", "false"):
+            return value.lower() == "true"
+        problems.append(f"{key} is {value!r}, not a boolean")
+    return None
+
+
+class CallConfig:
+    """
+    Everything the entrypoint reads from room metadata, resolved and validated
+
+    Missing or invalid fields fall back to the entrypoint's defaults
+    (invalid ones are logged). Instances are shared between calls with
+    identical metadata, so they are treated as read-only.
+    """
+
+    __slots__ = (
+        "user_id",
+        "call_uuid",
+        "mood",
+        "cartesia_voice_id",
+        "supermemory_user_id",
+        "vad_profile",
+        "vad_adaptive",
+        "system_prompt",
+        "first_message",
+        "first_message_audio",
+    )
+
+    def __init__(
+        self,
+        user_id: str = "unknown",
+        call_uuid: str = "unknown",
+        mood: str = "supportive",
+        cartesia_voice_id: str = "default",
+        supermemory_user_id: Optional[str] = None,
+        vad_profile: Optional[str] = None,
+        vad_adaptive: Optional[bool] = None,
+        system_prompt: Optional[str] = None,
+        first_message: Optional[str] = None,
+        first_message_audio: Optional[str] = None,
+    ):
+        self.user_id = user_id
+        self.call_uuid = call_uuid
+        self.mood = mood
+        self.cartesia_voice_id = cartesia_voice_id
+        self.supermemory_user_id = supermemory_user_id or user_id
+        self.vad_profile = vad_profile  # Requested preset; see config.get_vad_profile
+        self.vad_adaptive = vad_adaptive  # None: VAD_ADAPTIVE decides
+        self.system_prompt = system_prompt
+        self.first_message = first_message
+        self.first_message_audio = first_message_audio  # Local path or blob key of 16-bit PCM WAV
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any]) -> "CallConfig":
+        problems: List[str] = []
+        values: Dict[str, Any] = {}
+        for name, keys in _METADATA_FIELDS:
+            value = _first_string(metadata, keys, problems)
+            if value is not None:
+                values[name] = value
+
+        if values.get("vad_profile") not in (None, *VAD_CONFIG):
+            problems.append(f"unknown VAD profile {values.pop('vad_profile')!r}")
+        values["vad_adaptive"] = _adaptive_flag(metadata, problems)
+
+        prompts = metadata.get("prompts") or {}
+        if not isinstance(prompts, dict):
+            problems.append(f"prompts is {type(prompts).__name__}, not an object")
+            prompts = {}
+        for name, keys in _PROMPT_FIELDS:
+            values[name] = _first_string(prompts, keys, problems)
+
+        if problems:
+            logger.warning(f"⚠️ Room metadata fields ignored: {'; '.join(problems)}")
+        return cls(**values)
+
+
+class CallConfigCache:
+    """
+    LRU of CallConfig keyed by the raw metadata string
+
+    Job retries and reconnects to the same room deliver the same metadata,
+    which embeds prompts of tens of kilobytes; those are decoded once. The
+    string is its own key: its hash is cheaper than a digest (blake2b over
+    a 40 KB payload costs more than decoding it) and a hit is confirmed by
+    comparing bytes, never by hash alone.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Union[str, bytes], CallConfig]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def parse(self, metadata: Union[str, bytes, Dict[str, Any], None]) -> CallConfig:
+        """CallConfig for room metadata (a JSON string, an already decoded dict, or empty)"""
+        if not metadata:
+            return CallConfig()
+        if isinstance(metadata, dict):
+            return CallConfig.from_metadata(metadata)
+
+        config = self._entries.get(metadata)
+        if config is not None:
+            self.hits += 1
+            self._entries.move_to_end(metadata)
+            return config
+
+        self.misses += 1
+        try:
+            decoded = _loads(metadata)
+        except ValueError:  # json.JSONDecodeError and orjson.JSONDecodeError both subclass it
+            decoded = None
+        if not isinstance(decoded, dict):
+            self.errors += 1
+            logger.warning("Failed to parse room metadata as a JSON object, using defaults")
+            decoded = {}
+
+        config = CallConfig.from_metadata(decoded)
+        self._entries[metadata] = config
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return config
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "entries": len(self._entries),
+            "bytes": sum(len(raw) for raw in self._entries),
+            "decoder": "orjson" if orjson is not None else "json",
+        }
+
+
+def init_call_config_cache() -> CallConfigCache:
+    """Create the call config cache from environment variables"""
+    return CallConfigCache(max_entries=int(os.getenv("CALL_CONFIG_CACHE_ENTRIES", "64")))
@@ -0,0 +1,172 @@
+"""
+Per-call views of the worker's shared plugin clients for You+ Agent
+Each call's pipeline listens to its own LLM/STT/TTS object, which only re-emits metrics for that call's requests
+"""
+
+import logging
+from collections import deque
+from typing import Any, Callable, Deque, Optional
+
+from livekit.agents import llm, stt, tts
+
+logger = logging.getLogger(__name__)
+
+
+class TappedStream:
+    """Stream proxy that shows every item to a callback"""
+
+    def __init__(self, inner: Any, on_item: Callable[[Any], None]):
+        self._inner = inner
+        self._on_item = on_item
+
+    def __getattr__(self, name: str) -> Any:
+        # push_frame, push_text, flush, end_input, aclose...
+        return getattr(self._inner, name)
+
+    async def __aenter__(self) -> "TappedStream":
+        await self._inner.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> Any:
+        return await self._inner.__aexit__(*exc_info)
+
+    def __aiter__(self) -> "TappedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        item = await self._inner.__anext__()
+        try:
+            self._on_item(item)
+        except Exception as e:  # A tap must never break the stream
+            logger.warning(f"⚠️ Stream tap failed: {e}")
+        return item
+
+
+class MetricsRelay:
+    """
+    Re-emits a shared plugin's metrics on a per-call object, for this call's requests only
+
+    Streams opened by the call are `tap`ped to learn their request ids;
+    metrics events carrying any other request id belong to another call.
+    """
+
+    def __init__(self, source: Any, target: Any, max_request_ids: int = 64):
+        self.source = source
+        self.target = target
+        self._request_ids: Deque[str] = deque(maxlen=max_request_ids)
+        source.on("metrics_collected", self._forward)
+
+    def tap(self, stream: Any, on_item: Optional[Callable[[Any], None]] = None) -> TappedStream:
+        def seen(item: Any) -> None:
+            request_id = getattr(item, "request_id", "")
+            if request_id and request_id not in self._request_ids:
+                self._request_ids.append(request_id)
+            if on_item is not None:
+                on_item(item)
+
+        return TappedStream(stream, seen)
+
+    def _forward(self, collected: Any) -> None:
+        if getattr(collected, "request_id", None) in self._request_ids:
+            self.target.emit("metrics_collected", collected)
+
+    def close(self) -> None:
+        self.source.off("metrics_collected", self._forward)
+
+
+class _CallLLMStream(llm.LLMStream):
+    """Re-streams a shared LLM's stream, so the pipeline's metrics for it are emitted on the call's LLM"""
+
+    def __init__(self, owner: "CallLLM", inner: llm.LLMStream, chat_ctx: llm.ChatContext, fnc_ctx: Any):
+        super().__init__(owner, chat_ctx=chat_ctx, fnc_ctx=fnc_ctx)
+        self._inner = inner
+        self._error: Optional[BaseException] = None
+
+    async def _run(self) -> None:
+        if self._error is not None:
+            # A retry of this wrapper; the shared stream already retried on its own
+            raise self._error
+        try:
+            async for chunk in self._inner:
+                self._event_ch.send_nowait(chunk)
+        except Exception as e:
+            self._error = e
+            raise
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+        await super().aclose()
+
+
+class CallLLM(llm.LLM):
+    """
+    One call's LLM on top of the worker's shared client
+
+    `chat()` returns a real LLMStream (before_llm_cb and `agent.say` check
+    for one) whose usage metrics are emitted here, never on the shared LLM.
+    """
+
+    def __init__(self, inner: llm.LLM):
+        super().__init__()
+        self.inner = inner
+
+    def chat(self, *, chat_ctx: llm.ChatContext, fnc_ctx: Any = None, **kwargs: Any) -> llm.LLMStream:
+        inner = self.inner.chat(chat_ctx=chat_ctx, fnc_ctx=fnc_ctx, **kwargs)
+        return _CallLLMStream(self, inner, chat_ctx, fnc_ctx)
+
+    async def aclose(self) -> None:
+        pass  # The shared client outlives the call
+
+
+class CallSTT(stt.STT):
+    """
+    One call's STT on top of the worker's shared client
+
+    Stream metrics are forwarded for request ids seen on this call's
+    streams; `on_event`, if given, sees every stream event (see
+    speculative.SpeculativeTurns). `aclose()` detaches without closing
+    the shared STT.
+    """
+
+    def __init__(self, inner: stt.STT, on_event: Optional[Callable[[Any], None]] = None):
+        super().__init__(capabilities=inner.capabilities)
+        self.inner = inner
+        self._on_event = on_event
+        self._relay = MetricsRelay(inner, self)
+
+    def stream(self, **kwargs: Any) -> Any:
+        return self._relay.tap(self.inner.stream(**kwargs), self._on_event)
+
+    async def _recognize_impl(self, buffer: Any, **kwargs: Any) -> Any:
+        # recognize() metrics are emitted on this object by the base class
+        return await self.inner.recognize(buffer, **kwargs)
+
+    async def aclose(self) -> None:
+        self._relay.close()
+
+
+class CallTTS(tts.TTS):
+    """
+    One call's TTS on top of the worker's shared client for its voice
+
+    Calls with the same voice share the inner TTS (and its cache); only
+    metrics for audio this call synthesized are re-emitted here.
+    """
+
+    def __init__(self, inner: tts.TTS):
+        super().__init__(
+            capabilities=inner.capabilities,
+            sample_rate=inner.sample_rate,
+            num_channels=inner.num_channels,
+        )
+        self.inner = inner
+        self._relay = MetricsRelay(inner, self)
+
+    def synthesize(self, text: str, **kwargs: Any) -> Any:
+        return self._relay.tap(self.inner.synthesize(text, **kwargs))
+
+    def stream(self, **kwargs: Any) -> Any:
+        return self._relay.tap(self.inner.stream(**kwargs))
+
+    async def aclose(self) -> None:
+        self._relay.close()
@@ -0,0 +1,221 @@
+"""
+Worker capacity model for You+ Agent
+Tracks CPU, active pipelines and memory; reports a load value so the worker refuses calls before saturating
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import psutil
+except ImportError:  # In requirements.txt; bare installs fall back to the load average and /proc
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CapacityLimits:
+    """Level of each resource at which the worker counts as fully loaded (load 1.0)"""
+    max_calls: int = 25
+    max_cpu: float = 0.85  # Host CPU utilisation, 0-1
+    max_rss_mb: float = 2048.0
+
+
+class CapacityMonitor:
+    """
+    Load of this worker as the worst ratio of any resource to its limit
+
+    Lives in the main worker process, where LiveKit calls `load_fnc` and
+    `request_fnc`; calls run in job processes, so nothing here is updated
+    from the entrypoint. Active calls are the worker's `active_jobs` plus
+    offers accepted but not assigned yet. A sampler task, started on the
+    first load check, reads host CPU and the RSS of the worker and its job
+    processes. Event-loop lag is not a signal: this process carries no
+    audio, and a job process's lag only hurts its own call.
+    `load()` is the worker's `load_fnc`: LiveKit stops dispatching to a
+    worker whose load exceeds `threshold`. Load is reported periodically,
+    so `request_fnc` re-checks it for every job offer and rejects offers
+    that arrive in between.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[CapacityLimits] = None,
+        threshold: float = 0.8,
+        sample_interval: float = 0.5,
+        reservation_ttl: float = 10.0,
+    ):
+        self.limits = limits or CapacityLimits()
+        self.threshold = threshold
+        self.sample_interval = sample_interval
+        self.reservation_ttl = reservation_ttl
+
+        self.worker: Any = None
+        self.cpu = 0.0
+        self.rss_mb = 0.0
+        self._pending: Dict[str, float] = {}  # job id -> accept time, until the job shows up as active
+        self._sampler: Optional[asyncio.Task] = None
+
+        self.accepted = 0
+        self.rejected = 0
+        self.peak_load = 0.0
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def attach(self, worker: Any) -> None:
+        """Count calls from this worker's jobs"""
+        self.worker = worker
+
+    def _ensure_sampling(self) -> None:
+        """Start sampling on the running loop, the main worker process's (idempotent)"""
+        if self._sampler is not None and not self._sampler.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Not on the worker's loop (e.g. stats() from the metrics thread)
+        if psutil is not None:
+            psutil.cpu_percent(interval=None)  # First call only sets the baseline
+        self._sampler = loop.create_task(self._sample())
+
+    async def aclose(self) -> None:
+        if self._sampler is not None:
+            self._sampler.cancel()
+            await asyncio.gather(self._sampler, return_exceptions=True)
+
+    async def _sample(self) -> None:
+        while True:
+            await asyncio.sleep(self.sample_interval)
+            self.cpu = _host_cpu()
+            self.rss_mb = _rss_mb()
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    @property
+    def active_calls(self) -> int:
+        return len(_active_jobs(self.worker))
+
+    def _pending_calls(self, active_ids: Set[str]) -> int:
+        cutoff = time.monotonic() - self.reservation_ttl
+        for job_id, accepted_at in list(self._pending.items()):
+            # Counted by active_jobs from now on, or accepted but never assigned
+            if job_id in active_ids or accepted_at < cutoff:
+                del self._pending[job_id]
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+
+    def components(self, worker: Any = None) -> Dict[str, float]:
+        """Each resource as a fraction of its limit"""
+        active_ids = {_job_id(job) for job in _active_jobs(worker or self.worker)}
+        calls = len(active_ids) + self._pending_calls(active_ids)
+        return {
+            "calls": calls / self.limits.max_calls,
+            "cpu": self.cpu / self.limits.max_cpu,
+            "memory": self.rss_mb / self.limits.max_rss_mb,
+        }
+
+    def load(self, worker: Any = None) -> float:
+        """Worker load in [0, 1] (the worker's `load_fnc`)"""
+        self._ensure_sampling()
+        load = min(1.0, max(self.components(worker).values()))
+        self.peak_load = max(self.peak_load, load)
+        return load
+
+    def has_capacity(self) -> bool:
+        """Whether one more call fits under the threshold"""
+        components = self.components()
+        components["calls"] += 1 / self.limits.max_calls
+        return max(components.values()) <= self.threshold
+
+    async def request_fnc(self, request: Any) -> None:
+        """Accept a job offer only if the call fits (the worker's `request_fnc`)"""
+        self._ensure_sampling()
+        if self.has_capacity():
+            self._pending[str(getattr(request, "id", id(request)))] = time.monotonic()
+            self.accepted += 1
+            await request.accept()
+            return
+
+        self.rejected += 1
+        components = self.components()
+        busiest = max(components, key=components.get)
+        logger.warning(
+            f"⚠️ Rejecting job at capacity ({busiest} at {components[busiest]:.0%} of limit, "
+            f"{self.active_calls} active calls)"
+        )
+        await request.reject()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "load": min(1.0, max(self.components().values())),
+            "threshold": self.threshold,
+            "active_calls": self.active_calls,
+            "pending_calls": len(self._pending),
+            "cpu": self.cpu,
+            "rss_mb": self.rss_mb,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "peak_load": self.peak_load,
+        }
+
+
+def _active_jobs(worker: Any) -> List[Any]:
+    return list(getattr(worker, "active_jobs", None) or ())
+
+
+def _job_id(job: Any) -> str:
+    """Id of a worker's running job (RunningJobInfo.job.id)"""
+    info = getattr(job, "job", job)
+    return str(getattr(info, "id", id(job)))
+
+
+def _host_cpu() -> float:
+    """Host CPU utilisation since the previous call, 0-1"""
+    if psutil is not None:
+        return psutil.cpu_percent(interval=None) / 100
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except OSError:
+        return 0.0
+
+
+def _rss_mb() -> float:
+    """Resident set size of this process and its job processes (this process only without psutil)"""
+    if psutil is not None:
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:  # Exited since listed
+                pass
+        return rss / (1024 * 1024)
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        return 0.0
+
+
+def init_capacity() -> CapacityMonitor:
+    """Create the capacity monitor from environment variables"""
+    return CapacityMonitor(
+        limits=CapacityLimits(
+            max_calls=int(os.getenv("AGENT_MAX_CALLS", "25")),
+            max_cpu=float(os.getenv("AGENT_MAX_CPU", "0.85")),
+            max_rss_mb=float(os.getenv("AGENT_MAX_RSS_MB", "2048")),
+        ),
+        threshold=float(os.getenv("AGENT_LOAD_THRESHOLD", "0.8")),
+    )
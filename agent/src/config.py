@@ -6,6 +6,7 @@ Centralized settings for STT, LLM, TTS, and integrations
 import os
 from typing import Optional
 from dataclasses import dataclass
+from prompts import StaticPromptCache
 
 
 @dataclass
@@ -37,6 +38,20 @@ class SuprememoryConfig:
     """Supermemory integration configuration"""
     api_key: Optional[str]
     base_url: str = "https://api.supermemory.ai"
+    timeout: float = 5.0  # Per-request timeout in seconds
+    max_connections: int = 20  # Keep-alive pool size per worker process
+    max_concurrency: int = 10  # Max in-flight requests per worker process
+
+    @staticmethod
+    def from_env() -> "SuprememoryConfig":
+        """Load Supermemory settings from environment variables (api_key None disables memory)"""
+        return SuprememoryConfig(
+            api_key=os.getenv("SUPERMEMORY_API_KEY"),
+            base_url=os.getenv("SUPERMEMORY_BASE_URL", "https://api.supermemory.ai"),
+            timeout=float(os.getenv("SUPERMEMORY_TIMEOUT", "5")),
+            max_connections=int(os.getenv("SUPERMEMORY_MAX_CONNECTIONS", "20")),
+            max_concurrency=int(os.getenv("SUPERMEMORY_MAX_CONCURRENCY", "10")),
+        )
 
 
 @dataclass
@@ -97,15 +112,7 @@ class AgentConfig:
         )
 
         # Supermemory (optional)
-        supermemory_api_key = os.getenv("SUPERMEMORY_API_KEY")
-        supermemory_base_url = os.getenv(
-            "SUPERMEMORY_BASE_URL", "https://api.supermemory.ai"
-        )
-
-        supermemory_config = SuprememoryConfig(
-            api_key=supermemory_api_key,
-            base_url=supermemory_base_url,
-        )
+        supermemory_config = SuprememoryConfig.from_env()
 
         return AgentConfig(
             livekit=livekit_config,
@@ -159,6 +166,7 @@ AVAILABLE_DEVICE_TOOLS = {
 }
 
 # VAD (Voice Activity Detection) configuration
+# endpointing_delay_ms is the pipeline's extra wait after VAD silence before the turn ends
 VAD_CONFIG = {
     # Conservative: wait longer for user to finish speaking
     "conservative": {
@@ -166,6 +174,7 @@ VAD_CONFIG = {
         "silence_duration_ms": 500,
         "threshold": 0.6,
         "speech_pad_ms": 50,
+        "endpointing_delay_ms": 700,
     },
     # Balanced: normal operation
     "balanced": {
@@ -173,6 +182,7 @@ VAD_CONFIG = {
         "silence_duration_ms": 300,
         "threshold": 0.5,
         "speech_pad_ms": 30,
+        "endpointing_delay_ms": 500,
     },
     # Aggressive: respond faster
     "aggressive": {
@@ -180,17 +190,53 @@ VAD_CONFIG = {
         "silence_duration_ms": 200,
         "threshold": 0.4,
         "speech_pad_ms": 20,
+        "endpointing_delay_ms": 300,
     },
 }
 
+# Default VAD profile per mood: binary-question moods expect short answers,
+# encouraging calls leave room to think
+MOOD_VAD_PROFILES = {
+    "Encouraging": "conservative",
+    "ColdMirror": "balanced",
+    "Confrontational": "aggressive",
+    "Ruthless": "aggressive",
+    "supportive": "conservative",
+    "accountability": "balanced",
+    "celebration": "balanced",
+}
+
 
 def get_vad_config(mode: str = "balanced") -> dict:
     """Get VAD configuration for the specified mode"""
     return VAD_CONFIG.get(mode, VAD_CONFIG["balanced"])
 
 
+def get_vad_profile(mood: str, requested: Optional[str] = None) -> str:
+    """VAD profile for a call: room metadata, else AGENT_VAD_MODE, else the mood's default"""
+    for profile in (requested, os.getenv("AGENT_VAD_MODE")):
+        if profile in VAD_CONFIG:
+            return profile
+    return MOOD_VAD_PROFILES.get(mood, "balanced")
+
+
+def silero_vad_options(mode: str = "balanced") -> dict:
+    """VAD profile as `silero.VAD.load` keyword arguments (seconds, not ms)"""
+    config = get_vad_config(mode)
+    return {
+        "min_speech_duration": config["min_speech_duration_ms"] / 1000,
+        "min_silence_duration": config["silence_duration_ms"] / 1000,
+        "prefix_padding_duration": config["speech_pad_ms"] / 1000,
+        "activation_threshold": config["threshold"],
+    }
+
+
 def get_personality_prompt(mood: str) -> str:
-    """Get personality prompt based on mood"""
+    """Get personality prompt based on mood (rendered once per mood)"""
+    return _PERSONALITY_PROMPTS.get(mood)
+
+
+def _render_personality_prompt(mood: str) -> str:
     template = PERSONALITY_TEMPLATES.get(mood, PERSONALITY_TEMPLATES["supportive"])
     return f"""You are You+, a supportive AI accountability assistant.
 
@@ -206,3 +252,6 @@ Always:
 5. Be genuine and authentic
 6. Remember user context from Supermemory
 """
+
+
+_PERSONALITY_PROMPTS = StaticPromptCache(_render_personality_prompt)
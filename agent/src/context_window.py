@@ -0,0 +1,176 @@
+"""
+Rolling chat-context window for You+ Agent
+Keeps recent turns verbatim and folds older ones into an extractive summary so LLM prompts stay bounded on long calls
+"""
+
+import os
+import re
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from livekit.agents import llm
+
+from answers import binary_answer
+from insights import InsightMatcher
+from prompts import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_HEADER = "Summary of earlier conversation in this call (oldest first):"
+
+# Conversation roles that are folded; system messages (prompt, memory context) are kept
+_CONVERSATION_ROLES = ("user", "assistant")
+
+# Shared by every call's window; matching is read-only
+_matcher = InsightMatcher()
+
+_CATEGORY_LABELS = {
+    "promises_made": "promise",
+    "goals_mentioned": "goal",
+    "blockers_identified": "blocker",
+    "progress_noted": "progress",
+}
+
+
+def message_text(message: Any) -> str:
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return " ".join(part for part in content or [] if isinstance(part, str))
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 1].rstrip() + "…"
+
+
+class ContextWindow:
+    """
+    Bounds the chat context sent to the LLM on every turn
+
+    The newest `keep_messages` user/assistant messages stay verbatim (fewer
+    if they exceed `window_tokens`). Older ones are removed from the chat
+    context and reduced to summary points: user utterances that state a
+    promise, goal, blocker or progress, and yes/no answers together with
+    the question they answered. Points live in one system message right
+    after the leading system prompt, capped at `summary_tokens` by dropping
+    the oldest. Each message is folded once, so per-turn work does not
+    grow with call length.
+    """
+
+    def __init__(
+        self,
+        keep_messages: int = 12,
+        window_tokens: int = 1500,
+        summary_tokens: int = 300,
+        matcher: Optional[InsightMatcher] = None,
+    ):
+        self.keep_messages = keep_messages
+        self.window_tokens = window_tokens
+        self.summary_tokens = summary_tokens
+        self.matcher = matcher or _matcher
+
+        self._points: Deque[str] = deque()
+        self._points_tokens = 0
+        self._dropped_points = 0
+        self._last_question: Optional[str] = None
+        self._summary: Optional[llm.ChatMessage] = None
+
+        self.folded_messages = 0
+        self.last_prompt_tokens = 0
+
+    def compact(self, chat_ctx: llm.ChatContext) -> int:
+        """
+        Fold messages that fell out of the window into the summary (in place)
+
+        Returns:
+            Number of messages folded by this call
+        """
+        messages = chat_ctx.messages
+        conversation = [
+            index for index, message in enumerate(messages)
+            if message.role in _CONVERSATION_ROLES
+        ]
+
+        # Shrink the window until it fits its token budget, keeping at least the last exchange
+        keep = min(self.keep_messages, len(conversation))
+        window_tokens = sum(estimate_tokens(message_text(messages[i])) for i in conversation[len(conversation) - keep:])
+        while keep > 2 and window_tokens > self.window_tokens:
+            window_tokens -= estimate_tokens(message_text(messages[conversation[len(conversation) - keep]]))
+            keep -= 1
+
+        fold = conversation[: len(conversation) - keep]
+        if fold:
+            for index in fold:
+                self._fold(messages[index])
+            folded = set(fold)
+            remaining = [message for index, message in enumerate(messages) if index not in folded]
+            messages[:] = self._with_summary(remaining)
+            self.folded_messages += len(fold)
+
+        self.last_prompt_tokens = sum(estimate_tokens(message_text(message)) for message in messages)
+        return len(fold)
+
+    def _fold(self, message: llm.ChatMessage) -> None:
+        text = message_text(message).strip()
+        if not text:
+            return
+        if message.role == "assistant":
+            # Remembered only as context for a following yes/no answer
+            questions = [part for part in re.split(r"(?<=[.!?])\s+", text) if part.endswith("?")]
+            self._last_question = questions[-1] if questions else None
+            return
+
+        answer = binary_answer(text)
+        if answer and self._last_question:
+            self._add_point(f"Answered {answer} to: {_clip(self._last_question, 100)}")
+        else:
+            categories, _ = self.matcher.match_line(text)
+            labels = sorted(_CATEGORY_LABELS[category] for category in categories if category in _CATEGORY_LABELS)
+            if labels:
+                self._add_point(f"User ({'/'.join(labels)}): {_clip(text, 160)}")
+        self._last_question = None
+
+    def _add_point(self, point: str) -> None:
+        if point in self._points:
+            return
+        self._points.append(point)
+        self._points_tokens += estimate_tokens(point) + 1
+        while self._points_tokens > self.summary_tokens and len(self._points) > 1:
+            self._points_tokens -= estimate_tokens(self._points.popleft()) + 1
+            self._dropped_points += 1
+
+    def _with_summary(self, messages: List[llm.ChatMessage]) -> List[llm.ChatMessage]:
+        """Messages with the summary message refreshed and placed after the leading system messages"""
+        messages = [message for message in messages if message is not self._summary]
+        if not self._points:
+            return messages
+
+        lines = [SUMMARY_HEADER]
+        if self._dropped_points:
+            lines.append(f"- ({self._dropped_points} older points omitted)")
+        lines.extend(f"- {point}" for point in self._points)
+        self._summary = llm.ChatMessage(role="system", content="\n".join(lines))
+
+        leading = 0
+        while leading < len(messages) and messages[leading].role == "system":
+            leading += 1
+        return messages[:leading] + [self._summary] + messages[leading:]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "folded_messages": self.folded_messages,
+            "summary_points": len(self._points),
+            "summary_tokens": self._points_tokens,
+            "last_prompt_tokens": self.last_prompt_tokens,
+        }
+
+
+def init_context_window() -> ContextWindow:
+    """Per-call context window from environment variables"""
+    return ContextWindow(
+        keep_messages=int(os.getenv("CONTEXT_KEEP_MESSAGES", "12")),
+        window_tokens=int(os.getenv("CONTEXT_WINDOW_TOKENS", "1500")),
+        summary_tokens=int(os.getenv("CONTEXT_SUMMARY_TOKENS", "300")),
+    )
@@ -0,0 +1,167 @@
+"""
+Adaptive endpointing for You+ Agent
+Tunes how long the pipeline waits after the user goes silent from the pauses observed earlier in the call
+"""
+
+import os
+import time
+import logging
+from importlib import metadata
+from typing import Any, Dict, Optional
+
+from resilience import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+_warned_setter = False
+
+
+def set_min_endpointing_delay(agent: Any, delay: float) -> bool:
+    """
+    Change a running VoicePipelineAgent's endpointing delay
+
+    livekit-agents 0.x has no public setter; its pipeline reads the private
+    `_opts.min_endpointing_delay` at every end of turn. Anything else (1.x,
+    a renamed option) is left alone with a warning, logged once per process.
+
+    Returns:
+        True if the delay was written
+    """
+    global _warned_setter
+    try:
+        version = metadata.version("livekit-agents")
+    except metadata.PackageNotFoundError:
+        version = None
+    options = getattr(agent, "_opts", None)
+    supported = version is None or version.startswith("0.")
+    if supported and options is not None and hasattr(options, "min_endpointing_delay"):
+        options.min_endpointing_delay = delay
+        return True
+    if not _warned_setter:
+        _warned_setter = True
+        logger.warning(
+            f"⚠️ Cannot set the endpointing delay on {type(agent).__name__} "
+            f"(livekit-agents {version or 'unknown'}); adaptive endpointing is off"
+        )
+    return False
+
+
+class AdaptiveEndpointing:
+    """
+    Per-call endpointing delay learned from the user's pauses
+
+    The VAD reports the user stopped after its silence duration; the
+    pipeline then waits `delay` more before ending the turn. Every silence
+    is measured from that end of utterance to when the user next speaks.
+    Resuming within the endpointing window (up to `max_delay`, the longest
+    delay that could have kept the turn open) is a pause: a mid-thought
+    pause if it was shorter than `delay`, else the turn was ended too
+    early. Anything longer is a clean turn end (recorded as 0), however
+    long the agent took to reply. Once `min_samples` are known the delay
+    moves halfway toward p90 of recent pauses plus `margin`, within
+    [min_delay, max_delay]: users who answer crisply get faster replies,
+    users who think aloud stop being cut off. With `adaptive` off the
+    profile delay is kept.
+    """
+
+    def __init__(
+        self,
+        delay: float,
+        min_delay: float = 0.2,
+        max_delay: float = 1.5,
+        margin: float = 0.1,
+        window: int = 20,
+        min_samples: int = 3,
+        adaptive: bool = True,
+    ):
+        self.delay = delay
+        self.initial_delay = delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.margin = margin
+        self.min_samples = min_samples
+        self.adaptive = adaptive
+
+        self.pauses = LatencyHistogram(window=window)  # ms, 0 for clean turn ends
+        self._stopped_at: Optional[float] = None
+        self._agent: Any = None
+
+        self.mid_turn_pauses = 0
+        self.early_endpoints = 0
+        self.turns = 0
+
+    def attach(self, agent: Any) -> None:
+        """Follow a VoicePipelineAgent's speaking events and drive its endpointing delay"""
+        self._agent = agent
+        agent.on("user_started_speaking", lambda *_: self.user_started_speaking())
+        agent.on("user_stopped_speaking", lambda *_: self.user_stopped_speaking())
+        self._apply()
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    def user_stopped_speaking(self, now: Optional[float] = None) -> None:
+        self._stopped_at = time.monotonic() if now is None else now
+
+    def user_started_speaking(self, now: Optional[float] = None) -> None:
+        if self._stopped_at is None:
+            return
+        now = time.monotonic() if now is None else now
+        pause = now - self._stopped_at
+        self._stopped_at = None
+        if pause > self.max_delay:
+            # No delay in range would have kept this turn open: it really ended,
+            # and how long the reply took says nothing about the user's pauses
+            self.turns += 1
+            self._record(0.0)
+        elif pause <= self.delay:
+            self.mid_turn_pauses += 1
+            self._record(pause)
+        else:
+            # The turn was ended while the user was still mid-thought
+            self.early_endpoints += 1
+            self._record(pause)
+
+    # ------------------------------------------------------------------
+    # Delay
+    # ------------------------------------------------------------------
+
+    def _record(self, pause: float) -> None:
+        self.pauses.record(pause * 1000)
+        if not self.adaptive or self.pauses.samples < self.min_samples:
+            return
+        target = self.pauses.percentile(0.9) / 1000 + self.margin
+        target = min(self.max_delay, max(self.min_delay, target))
+        delay = self.delay + (target - self.delay) / 2
+        if abs(delay - self.delay) >= 0.01:
+            logger.debug(f"⏱️ Endpointing delay {self.delay * 1000:.0f}ms -> {delay * 1000:.0f}ms")
+            self.delay = delay
+            self._apply()
+
+    def _apply(self) -> None:
+        if self._agent is not None and not set_min_endpointing_delay(self._agent, self.delay):
+            self.adaptive = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "delay_ms": round(self.delay * 1000),
+            "initial_delay_ms": round(self.initial_delay * 1000),
+            "pause_p90_ms": self.pauses.percentile(0.9),
+            "mid_turn_pauses": self.mid_turn_pauses,
+            "early_endpoints": self.early_endpoints,
+            "turns": self.turns,
+            "adaptive": self.adaptive,
+        }
+
+
+def init_endpointing(delay: float, adaptive: Optional[bool] = None) -> AdaptiveEndpointing:
+    """Per-call endpointing from a profile delay and environment variables"""
+    if adaptive is None:
+        adaptive = os.getenv("VAD_ADAPTIVE", "true").lower() == "true"
+    return AdaptiveEndpointing(
+        delay,
+        min_delay=float(os.getenv("ENDPOINTING_MIN_DELAY_MS", "200")) / 1000,
+        max_delay=float(os.getenv("ENDPOINTING_MAX_DELAY_MS", "1500")) / 1000,
+        adaptive=adaptive,
+    )
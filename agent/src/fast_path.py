@@ -0,0 +1,139 @@
+"""
+Fast-path acknowledgments for You+ Agent
+Recognizes binary answers and other frequent intents locally so a cached acknowledgment plays while the LLM writes the follow-up
+"""
+
+import os
+import re
+import logging
+from typing import Any, Dict, List, Optional
+
+from livekit.agents import llm
+
+from answers import bare_binary_answer
+from assistant import AssistantPersonality
+from context_window import message_text
+from ssml import plain_text
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[\w']+")
+
+# Whole-utterance patterns over lowercased words: only near-bare answers, so
+# "Yes but I skipped the gym" or "done for today, bye" never take the fast path
+_INTENT_PATTERNS = (
+    ("partial", re.compile(
+        r"(?:(?:yes|yeah|well|i did) )?"
+        r"(?:kind of|sort of|partly|partially|mostly|almost|half|some of it|not all of it|not all|not fully|not completely)"
+        r"(?: (?:i did|i did it|i did half|i did some|did it))?"
+    )),
+    ("unsure", re.compile(r"(?:(?:um|uh|well|honestly) )?(?:i don't know|i dunno|dunno|not sure|i'm not sure|maybe|i guess)")),
+    ("no", re.compile(r"(?:i didn't|didn't|i did not|not yet|i haven't|i have not)(?: do it| done it)?")),
+    ("yes", re.compile(r"i did|i did it|did it|done|i'm done|of course|absolutely|definitely")),
+)
+
+
+def classify_intent(text: str, max_words: int = 8) -> Optional[str]:
+    """"yes", "no", "partial" or "unsure" for a near-bare answer, None for anything else"""
+    if not text or len(text.split()) > max_words:
+        return None
+    answer = bare_binary_answer(text)
+    if answer:
+        return answer.lower()
+    words = _words(text)
+    for intent, pattern in _INTENT_PATTERNS:
+        if pattern.fullmatch(words):
+            return intent
+    return None
+
+
+def _words(text: str) -> str:
+    return " ".join(_WORD.findall(plain_text(text).lower().replace("\u2019", "'")))
+
+
+_PROMISE_QUESTIONS = tuple(_words(question) for question in AssistantPersonality.PROMISE_QUESTIONS)
+
+
+def asks_promise_question(agent_text: str) -> bool:
+    """True if the agent's turn ends with a scripted did-you-keep-your-promise question"""
+    words = _words(agent_text)
+    return any(words == question or words.endswith(" " + question) for question in _PROMISE_QUESTIONS)
+
+
+def last_agent_turn(chat_ctx: llm.ChatContext) -> str:
+    """Text of the latest assistant message in `chat_ctx` ("" if there is none)"""
+    for message in reversed(chat_ctx.messages):
+        if message.role == "assistant":
+            return message_text(message)
+    return ""
+
+
+class FastPath:
+    """
+    Immediate acknowledgment for answers that need no LLM to react to
+
+    Only answers to the scripted promise question qualify: "Yes." means
+    something else after "Did you skip the gym again?", so any other
+    question goes to the LLM. `acknowledgment()` has no side effects, so
+    the same turn can be asked about from before_llm_cb and from
+    speculative requests and get the same phrase. Variants rotate as acknowledgments are spoken so a call does not
+    repeat itself. The phrases are short fixed strings said with
+    `agent.say(str)`, which the TTS cache serves without synthesis.
+    """
+
+    def __init__(self, personality: AssistantPersonality, max_words: int = 8):
+        self.personality = personality
+        self.max_words = max_words
+        self._spoken = 0
+
+        self.counts: Dict[str, int] = {}
+
+    def acknowledgment(self, text: str, asked: str) -> Optional[str]:
+        """Phrase to say first in reply to `text` (an answer to `asked`), None to let the LLM answer alone"""
+        if not asks_promise_question(asked):
+            return None
+        intent = classify_intent(text, self.max_words)
+        variants = self.personality.get_acknowledgments(intent) if intent else []
+        return variants[self._spoken % len(variants)] if variants else None
+
+    def phrases(self) -> List[str]:
+        """Every acknowledgment this call can say (for cache warming)"""
+        return [
+            phrase
+            for intent in ("yes", "no", "partial", "unsure")
+            for phrase in self.personality.get_acknowledgments(intent)
+        ]
+
+    @staticmethod
+    def with_acknowledgment(chat_ctx: llm.ChatContext, ack: Optional[str]) -> llm.ChatContext:
+        """The LLM request for the follow-up: the acknowledgment is already said"""
+        if ack:
+            chat_ctx.append(role="assistant", text=ack)
+        return chat_ctx
+
+    async def speak(self, agent: Any, user_message: llm.ChatMessage, ack: str, reply: Any) -> None:
+        """
+        Commit the user's turn, then play the acknowledgment and the LLM follow-up in order
+
+        Stands in for the pipeline's own reply after before_llm_cb returned False.
+        """
+        intent = classify_intent(message_text(user_message), self.max_words) or "other"
+        self.counts[intent] = self.counts.get(intent, 0) + 1
+        self._spoken += 1
+        agent.chat_ctx.messages.append(user_message)
+        agent.emit("user_speech_committed", user_message)
+        try:
+            await agent.say(ack, allow_interruptions=True, add_to_chat_ctx=True)
+            await agent.say(reply, allow_interruptions=True, add_to_chat_ctx=True)
+        except Exception as e:
+            logger.error(f"❌ Fast-path reply failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"acknowledged": self._spoken, "intents": dict(self.counts)}
+
+
+def init_fast_path(personality: AssistantPersonality) -> Optional[FastPath]:
+    """Fast path from environment variables (None when FAST_PATH is off)"""
+    if os.getenv("FAST_PATH", "true").lower() != "true":
+        return None
+    return FastPath(personality, max_words=int(os.getenv("FAST_PATH_MAX_WORDS", "8")))
@@ -0,0 +1,236 @@
+"""
+Transcript insight extraction for You+ Agent
+Single-pass keyword matching for promises, goals, blockers, progress and sentiment
+"""
+
+import re
+import logging
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# TODO: Use LLM to intelligently extract insights
+# For now, look for keywords (matched as lowercase substrings of each line)
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    "promises_made": ["i promise", "i will", "i commit", "i'll", "i'm going to"],
+    "goals_mentioned": ["goal", "want to", "plan to", "aim for", "target"],
+    "blockers_identified": [
+        "struggle",
+        "challenge",
+        "problem",
+        "issue",
+        "difficult",
+        "can't",
+    ],
+    "progress_noted": [
+        "progress",
+        "improved",
+        "better",
+        "achieved",
+        "completed",
+        "finished",
+    ],
+}
+
+# TODO: Use LLM or sentiment analysis library
+SENTIMENT_WORDS: Dict[str, List[str]] = {
+    "positive": ["good", "great", "excellent", "happy", "positive"],
+    "negative": ["bad", "sad", "worried", "anxious", "frustrated"],
+}
+
+_EMPTY: FrozenSet[str] = frozenset()
+
+
+def _trie_pattern(keywords: List[str]) -> str:
+    """
+    Regex alternation factored into a prefix trie
+
+    `goal|good|great` becomes `g(?:o(?:al|od)|reat)`, so at each position the
+    engine follows one branch instead of retrying every keyword.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if "" in node:
+            # A shorter keyword ends here; the optional tail keeps the match greedy
+            return "(?:" + "|".join(branches) + ")?"
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+
+    return build(trie)
+
+
+class InsightMatcher:
+    """
+    One compiled regex over every category and sentiment keyword
+
+    The pattern is a trie-factored alternation matched greedily, and keywords
+    that are prefixes of a longer match (e.g. "i will" inside a longer phrase)
+    are credited too. Each line is lowercased and scanned once. Keywords that
+    only occur overlapping the tail of another match ("badifficult") are not
+    counted a second time.
+    """
+
+    def __init__(
+        self,
+        category_keywords: Dict[str, List[str]] = CATEGORY_KEYWORDS,
+        sentiment_words: Dict[str, List[str]] = SENTIMENT_WORDS,
+    ):
+        self.categories = list(category_keywords)
+
+        # keyword -> categories it belongs to / sentiment polarity it counts towards
+        keyword_categories: Dict[str, Set[str]] = {}
+        for category, keywords in category_keywords.items():
+            for keyword in keywords:
+                keyword_categories.setdefault(keyword.lower(), set()).add(category)
+
+        keyword_sentiment: Dict[str, str] = {}
+        for polarity, words in sentiment_words.items():
+            for word in words:
+                keyword_sentiment[word.lower()] = polarity
+                keyword_categories.setdefault(word.lower(), set())
+
+        keywords = sorted(keyword_categories, key=len, reverse=True)
+        self._pattern = re.compile(_trie_pattern(keywords))
+
+        # A hit on keyword K also covers every keyword that is a prefix of K
+        self._hits: Dict[str, Tuple[Set[str], Set[str]]] = {}
+        for keyword in keywords:
+            categories: Set[str] = set()
+            sentiment_hits: Set[str] = set()
+            for other in keywords:
+                if keyword.startswith(other):
+                    categories |= keyword_categories[other]
+                    if other in keyword_sentiment:
+                        sentiment_hits.add(other)
+            self._hits[keyword] = (categories, sentiment_hits)
+
+        self._sentiment = keyword_sentiment
+
+    def match_line(self, line: str) -> Tuple[Set[str], Set[str]]:
+        """Categories and sentiment words found in one transcript line"""
+        found = self._pattern.findall(line.lower())
+        if not found:
+            return _EMPTY, _EMPTY
+
+        categories: Set[str] = set()
+        sentiment_hits: Set[str] = set()
+        for keyword in set(found):
+            line_categories, line_sentiment = self._hits[keyword]
+            categories |= line_categories
+            sentiment_hits |= line_sentiment
+        return categories, sentiment_hits
+
+    def scan(self, transcript: str) -> Tuple[Dict[str, List[str]], Dict[str, int]]:
+        """
+        Scan a full transcript once
+
+        Returns:
+            (lines per category, count of distinct sentiment words per polarity)
+        """
+        results: Dict[str, List[str]] = {category: [] for category in self.categories}
+        sentiment_seen: Set[str] = set()
+
+        for line in transcript.split("\n"):
+            categories, sentiment_hits = self.match_line(line)
+            if categories:
+                stripped = line.strip()
+                for category in categories:
+                    results[category].append(stripped)
+            sentiment_seen |= sentiment_hits
+
+        return results, self.count_sentiment(sentiment_seen)
+
+    def count_sentiment(self, sentiment_seen: Set[str]) -> Dict[str, int]:
+        """Distinct sentiment words per polarity"""
+        counts = {"positive": 0, "negative": 0}
+        for word in sentiment_seen:
+            polarity = self._sentiment[word]
+            counts[polarity] = counts.get(polarity, 0) + 1
+        return counts
+
+
+def sentiment_label(counts: Dict[str, int]) -> str:
+    """Overall sentiment from distinct positive/negative word counts"""
+    if counts.get("positive", 0) > counts.get("negative", 0):
+        return "positive"
+    elif counts.get("negative", 0) > counts.get("positive", 0):
+        return "negative"
+    else:
+        return "neutral"
+
+
+_default_matcher = InsightMatcher()
+
+
+def extract_insights(transcript: str) -> Dict[str, object]:
+    """Extract promises, goals, blockers, progress and sentiment in one pass"""
+    results, sentiment_counts = _default_matcher.scan(transcript)
+    insights: Dict[str, object] = dict(results)
+    insights["sentiment"] = sentiment_label(sentiment_counts)
+    insights["sentiment_counts"] = sentiment_counts
+    return insights
+
+
+class StreamingInsights:
+    """
+    Insight state updated one utterance at a time
+
+    Feeding every transcript line through `add_line` yields exactly what
+    `extract_insights` returns for the joined transcript. A snapshot is only
+    final once the call is over (job shutdown); `lines` tells how much of
+    the transcript it covers.
+    """
+
+    def __init__(self, matcher: Optional[InsightMatcher] = None):
+        self.matcher = matcher or _default_matcher
+        self.results: Dict[str, List[str]] = {category: [] for category in self.matcher.categories}
+        self._sentiment_seen: Set[str] = set()
+        self.lines = 0  # Transcript lines analyzed
+
+    def add_line(self, line: str) -> Set[str]:
+        """
+        Analyze one rendered transcript line (e.g. "user: I will run tomorrow")
+
+        Returns:
+            Categories the line matched, for live signals
+        """
+        matched: Set[str] = set()
+        # Utterances containing newlines become several transcript lines
+        for part in line.split("\n"):
+            self.lines += 1
+            categories, sentiment_hits = self.matcher.match_line(part)
+            if categories:
+                stripped = part.strip()
+                for category in categories:
+                    self.results[category].append(stripped)
+                matched |= categories
+            self._sentiment_seen |= sentiment_hits
+        return matched
+
+    @property
+    def sentiment_counts(self) -> Dict[str, int]:
+        return self.matcher.count_sentiment(self._sentiment_seen)
+
+    @property
+    def sentiment(self) -> str:
+        return sentiment_label(self.sentiment_counts)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Current insights in the same shape as `extract_insights`"""
+        insights: Dict[str, object] = {
+            category: list(lines) for category, lines in self.results.items()
+        }
+        sentiment_counts = self.sentiment_counts
+        insights["sentiment"] = sentiment_label(sentiment_counts)
+        insights["sentiment_counts"] = sentiment_counts
+        return insights
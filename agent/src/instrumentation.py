@@ -0,0 +1,382 @@
+"""
+Per-call latency instrumentation for You+ Agent
+Records startup stages, per-turn STT→LLM→TTS latency and post-call spans; exports JSONL and Prometheus text
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from resilience import LatencyHistogram
+from timing import CallTimeline
+
+logger = logging.getLogger(__name__)
+
+# Stages exported per call (CallTimeline stage names)
+CALL_STAGES = (
+    "metadata_parse",
+    "memory_load",
+    "model_init",
+    "agent_start",
+    "first_message",
+)
+
+METRIC_PREFIX = "youplus"
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class CallRecorder:
+    """
+    Collects one call's spans on top of its CallTimeline
+
+    Feed it the pipeline's `metrics_collected` events; end-of-utterance, LLM
+    and TTS metrics sharing a sequence id are joined into one turn whose
+    latency is EOU delay + LLM time-to-first-token + TTS time-to-first-byte.
+    """
+
+    def __init__(self, instrumentation: "Instrumentation", timeline: CallTimeline):
+        self.instrumentation = instrumentation
+        self.timeline = timeline
+        self.turns: Dict[str, Dict[str, float]] = {}
+        self.first_audio_ms: Optional[float] = None
+        self.record: Optional[Dict[str, Any]] = None
+
+    def on_metrics(self, collected: Any) -> None:
+        """Handler for the agent's `metrics_collected` event"""
+        kind = type(collected).__name__
+        sequence_id = getattr(collected, "sequence_id", None) or getattr(collected, "speech_id", None)
+
+        if "TTS" in kind:
+            ttfb = getattr(collected, "ttfb", None)
+            duration = getattr(collected, "duration", None)
+            if self.first_audio_ms is None and ttfb is not None and ttfb >= 0:
+                # Metrics arrive when synthesis ends; rewind to its first byte
+                synthesis_start = self.timeline.now_ms() - (duration or 0.0) * 1000
+                self.first_audio_ms = max(0.0, synthesis_start + ttfb * 1000)
+            self._turn_field(sequence_id, "tts_ttfb_ms", ttfb)
+        elif "LLM" in kind:
+            self._turn_field(sequence_id, "llm_ttft_ms", getattr(collected, "ttft", None))
+        elif "EOU" in kind:
+            self._turn_field(
+                sequence_id, "eou_delay_ms", getattr(collected, "end_of_utterance_delay", None)
+            )
+
+    def _turn_field(self, sequence_id: Optional[str], field: str, seconds: Optional[float]) -> None:
+        if sequence_id is None or seconds is None or seconds < 0:
+            return
+        turn = self.turns.setdefault(str(sequence_id), {})
+        turn[field] = seconds * 1000
+        if "turn_latency_ms" not in turn and all(
+            key in turn for key in ("eou_delay_ms", "llm_ttft_ms", "tts_ttfb_ms")
+        ):
+            turn["turn_latency_ms"] = turn["eou_delay_ms"] + turn["llm_ttft_ms"] + turn["tts_ttfb_ms"]
+
+    def finish(self, **attributes: Any) -> Dict[str, Any]:
+        """
+        Build the call record, update aggregates and export it
+
+        Call once, at job shutdown: the pipeline keeps producing turns after
+        the entrypoint returns. Later calls return the exported record.
+        """
+        if self.record is not None:
+            logger.warning(f"⚠️ Call record for {self.timeline.call_id} already exported")
+            return self.record
+        stages = {
+            name: {"start_ms": round(start, 1), "duration_ms": round(end - start, 1)}
+            for name, (start, end) in self.timeline.stages.items()
+        }
+        ttfw_ms = self.first_audio_ms
+        if ttfw_ms is None and "first_message" in self.timeline.stages:
+            ttfw_ms = self.timeline.stages["first_message"][1]
+
+        record = {
+            "kind": "call",
+            "call_id": self.timeline.call_id,
+            "ended_at": time.time(),
+            "stages": stages,
+            "turns": [dict(turn, sequence_id=key) for key, turn in self.turns.items()],
+            "time_to_first_word_ms": None if ttfw_ms is None else round(ttfw_ms, 1),
+            **attributes,
+        }
+        self.instrumentation.export(record)
+        self.record = record
+        return record
+
+
+class Instrumentation:
+    """
+    Process-wide latency aggregates and exporters
+
+    Span latencies go into one LatencyHistogram per span name, fed from
+    the records passed to `export()`. Components register `stats()`
+    callables whose numeric values are exported as gauges. Records are
+    appended to a JSONL file on a dedicated thread.
+
+    Calls run in LiveKit job processes, which exit when their call ends, so
+    the endpoint is served from the main worker process: `serve(port)`
+    follows the JSONL file that every job process appends to and builds the
+    aggregates from it. Job processes also export their components' stats
+    (`export_components()`); the endpoint shows the latest snapshot of the
+    most recent processes, labelled by pid, next to the stats of components
+    registered with `worker=True`, which live in the main process.
+    """
+
+    # Job processes whose last component snapshot is kept by the endpoint
+    MAX_JOB_SNAPSHOTS = 32
+
+    def __init__(self, jsonl_path: Optional[str] = None):
+        self.jsonl_path = jsonl_path
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.collectors: Dict[str, Callable[[], Optional[Dict[str, Any]]]] = {}
+        self.worker_collectors: set = set()
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        # pid -> latest component stats reported by that job process (endpoint side)
+        self._job_components: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics-jsonl")
+
+    def recorder(self, timeline: CallTimeline) -> CallRecorder:
+        return CallRecorder(self, timeline)
+
+    def observe(self, span: str, latency_ms: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(span)
+            if histogram is None:
+                histogram = self.histograms[span] = LatencyHistogram()
+            histogram.record(latency_ms)
+
+    def register(self, name: str, stats: Callable[[], Optional[Dict[str, Any]]], worker: bool = False) -> None:
+        """Export a component's `stats()` numbers as gauges (`worker`: it lives in the main process)"""
+        self.collectors[name] = stats
+        if worker:
+            self.worker_collectors.add(name)
+
+    def export(self, record: Dict[str, Any]) -> None:
+        """Fold a structured record into the aggregates and append it to the JSONL file (non-blocking)"""
+        self._observe_record(record)
+        if not self.jsonl_path:
+            return
+        line = json.dumps(record, default=str)
+        self._writer.submit(self._append, line)
+
+    def export_components(self) -> None:
+        """Export this job process's component stats for the worker's endpoint"""
+        components = {
+            name: values for name, values in self._collect().items() if name not in self.worker_collectors
+        }
+        self.export({"kind": "components", "pid": os.getpid(), "components": components})
+
+    def ingest(self, record: Dict[str, Any]) -> None:
+        """Fold a record exported by a job process into the endpoint's aggregates"""
+        if record.get("kind") == "components":
+            with self._lock:
+                self._job_components[int(record["pid"])] = record.get("components") or {}
+                self._job_components.move_to_end(int(record["pid"]))
+                while len(self._job_components) > self.MAX_JOB_SNAPSHOTS:
+                    self._job_components.popitem(last=False)
+            return
+        self._observe_record(record)
+
+    def _observe_record(self, record: Dict[str, Any]) -> None:
+        kind = record.get("kind")
+        if kind == "call":
+            with self._lock:
+                self.calls += 1
+            for name in CALL_STAGES:
+                stage = record.get("stages", {}).get(name)
+                if stage is not None:
+                    self.observe(name, stage["duration_ms"])
+            if record.get("time_to_first_word_ms") is not None:
+                self.observe("time_to_first_word", record["time_to_first_word_ms"])
+            for turn in record.get("turns", []):
+                if "turn_latency_ms" in turn:
+                    self.observe("turn_latency", turn["turn_latency_ms"])
+        elif kind == "post_call" and record.get("duration_ms") is not None:
+            self.observe("post_call", record["duration_ms"])
+
+    def _append(self, line: str) -> None:
+        try:
+            with open(self.jsonl_path, "a", encoding="utf-8") as out:
+                out.write(line + "\n")
+        except OSError as e:
+            logger.error(f"❌ Could not write metrics record: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Span percentiles and component stats"""
+        with self._lock:
+            spans = {
+                name: {
+                    "count": histogram.count,
+                    "p50_ms": histogram.percentile(0.5),
+                    "p95_ms": histogram.percentile(0.95),
+                    "p99_ms": histogram.percentile(0.99),
+                }
+                for name, histogram in self.histograms.items()
+            }
+            calls = self.calls
+            jobs = {str(pid): components for pid, components in self._job_components.items()}
+        if self._server is None:
+            return {"calls": calls, "spans": spans, "components": self._collect()}
+        return {
+            "calls": calls,
+            "spans": spans,
+            "components": self._collect(self.worker_collectors),
+            "job_components": jobs,
+        }
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition of span histograms and component gauges"""
+        lines: List[str] = [
+            f"# TYPE {METRIC_PREFIX}_calls_total counter",
+            f"{METRIC_PREFIX}_calls_total {self.calls}",
+            f"# TYPE {METRIC_PREFIX}_span_latency_ms histogram",
+        ]
+        with self._lock:
+            for span, histogram in sorted(self.histograms.items()):
+                for le, count in histogram.buckets():
+                    lines.append(f'{METRIC_PREFIX}_span_latency_ms_bucket{{span="{span}",le="{le}"}} {count}')
+                lines.append(f'{METRIC_PREFIX}_span_latency_ms_sum{{span="{span}"}} {histogram.sum_ms:.3f}')
+                lines.append(f'{METRIC_PREFIX}_span_latency_ms_count{{span="{span}"}} {histogram.count}')
+
+        gauges: Dict[str, List[str]] = {}
+        for labels, components in self._gauge_sources():
+            for component, values in components.items():
+                for key, value in _flatten(values).items():
+                    name = _INVALID_NAME_CHARS.sub("_", f"{METRIC_PREFIX}_{component}_{key}")
+                    gauges.setdefault(name, []).append(f"{name}{labels} {value}")
+        for name, samples in sorted(gauges.items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def _gauge_sources(self) -> List[tuple]:
+        """(label text, component stats) for this process and, on the endpoint, each job process"""
+        if self._server is None:
+            return [("", self._collect())]
+        with self._lock:
+            jobs = list(self._job_components.items())
+        sources = [("", self._collect(self.worker_collectors))]
+        sources.extend((f'{{pid="{pid}"}}', components) for pid, components in jobs)
+        return sources
+
+    def _collect(self, names: Optional[set] = None) -> Dict[str, Dict[str, Any]]:
+        collected = {}
+        for name, stats in self.collectors.items():
+            if names is not None and name not in names:
+                continue
+            try:
+                values = stats()
+            except Exception as e:
+                logger.warning(f"⚠️ Metrics collector {name} failed: {e}")
+                continue
+            if values:
+                collected[name] = values
+        return collected
+
+    def serve(self, port: int, host: str = "0.0.0.0") -> bool:
+        """
+        Serve /metrics (Prometheus text) and /metrics.json on daemon threads
+
+        Call from the main worker process. Records job processes append to
+        the JSONL file from now on are ingested by a follower thread.
+        Component stats are read from the server thread; they are plain
+        counters, so a scrape may see a value one update behind.
+
+        Returns:
+            False if the port is taken (e.g. by another worker)
+        """
+        if self._server is not None:
+            return True
+        instrumentation = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body = instrumentation.prometheus_text().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body = json.dumps(instrumentation.snapshot(), default=str).encode("utf-8")
+                    content_type = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        try:
+            self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            logger.warning(f"⚠️ Metrics endpoint not started on port {port}: {e}")
+            return False
+        thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        thread.start()
+        if self.jsonl_path:
+            threading.Thread(target=self._follow, name="metrics-follow", daemon=True).start()
+        else:
+            logger.warning("⚠️ AGENT_METRICS_JSONL is empty; the endpoint will not see job processes' calls")
+        logger.info(f"📊 Metrics endpoint on :{port}/metrics")
+        return True
+
+    def _follow(self, poll_s: float = 1.0) -> None:
+        """Ingest records appended to the JSONL file after the endpoint started"""
+        offset: Optional[int] = None
+        pending = b""
+        while True:
+            try:
+                size = os.path.getsize(self.jsonl_path)
+            except OSError:
+                size = 0
+            if offset is None:
+                offset = size
+            elif size < offset:
+                # Truncated or rotated: start over from the top of the new file
+                offset, pending = 0, b""
+            if size > offset:
+                try:
+                    with open(self.jsonl_path, "rb") as records:
+                        records.seek(offset)
+                        data = records.read(size - offset)
+                except OSError as e:
+                    logger.warning(f"⚠️ Could not read metrics records: {e}")
+                    data = b""
+                offset += len(data)
+                *lines, pending = (pending + data).split(b"\n")
+                for line in lines:
+                    try:
+                        self.ingest(json.loads(line))
+                    except (ValueError, KeyError, TypeError) as e:
+                        logger.debug(f"Skipping metrics record: {e}")
+            time.sleep(poll_s)
+
+
+def _flatten(values: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Numeric leaves of nested stats dicts, keys joined with underscores"""
+    flat: Dict[str, float] = {}
+    for key, value in values.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, bool):
+            flat[name] = int(value)
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+        elif isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}_"))
+    return flat
+
+
+def init_instrumentation() -> Instrumentation:
+    """Create Instrumentation from environment variables"""
+    return Instrumentation(jsonl_path=os.getenv("AGENT_METRICS_JSONL", "/tmp/youplus-call-metrics.jsonl") or None)
@@ -24,7 +24,8 @@ If backend prompts are not available, it falls back to assistant.py generated pr
 """
 
 import os
-import json
+import time
+import asyncio
 import logging
 from datetime import datetime
 from typing import Optional
@@ -34,17 +35,42 @@ from livekit import agents
 from livekit.agents import (
     AutoSubscribe,
     JobContext,
+    JobProcess,
     WorkerOptions,
     llm,
     metrics,
 )
 from livekit.agents.pipeline import VoicePipelineAgent
-from livekit.plugins import openai, cartesia, silero
 
 # Import You+ modules
 from memory import MemoryManager, init_memory_manager
 from assistant import AssistantPersonality, ConversationManager
 from post_call import PostCallProcessor
+from post_call_queue import PostCallQueue
+from insights import extract_insights
+from timing import CallTimeline
+from resources import ResourcePool
+from instrumentation import init_instrumentation
+from prompts import (
+    PROMPT_TOKEN_BUDGET,
+    PromptSection,
+    assemble_prompt,
+    estimate_tokens,
+    section_budget,
+    supermemory_section,
+)
+from memory_ranking import rank_context
+from ssml import split_ssml, stream_ssml
+from tts_cache import CachedTTS, init_tts_cache
+from audio_store import init_audio_stores
+from capacity import init_capacity
+from context_window import init_context_window, message_text
+from config import get_vad_config, get_vad_profile
+from endpointing import init_endpointing
+from speculative import init_speculation
+from call_plugins import CallLLM, CallSTT, CallTTS
+from fast_path import init_fast_path, last_agent_turn
+from call_config import init_call_config_cache
 
 # Load environment variables
 load_dotenv()
@@ -61,52 +87,304 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 CARTESIA_API_KEY = os.getenv("CARTESIA_API_KEY")
 SUPERMEMORY_API_KEY = os.getenv("SUPERMEMORY_API_KEY")
 
+# Hard deadline (seconds from call start) for Supermemory context before the call starts
+# without it. Context that arrives later is merged into the chat context when it lands.
+MEMORY_LOAD_DEADLINE = float(os.getenv("SUPERMEMORY_LOAD_DEADLINE", "1.5"))
+
+# Seconds from the start of its fetch that the call waits for pre-rendered first-message audio
+FIRST_MESSAGE_AUDIO_TIMEOUT = float(os.getenv("FIRST_MESSAGE_AUDIO_TIMEOUT", "1.0"))
+
+# Post-call work runs on a background queue, spooled here so it survives worker restarts
+POST_CALL_SPOOL_DIR = os.getenv("POST_CALL_SPOOL_DIR", "/tmp/youplus-post-call")
+
+# The queue lives in the job process, which LiveKit tears down once shutdown callbacks
+# return; the call's shutdown waits this long (seconds) for its post-call work to finish
+POST_CALL_DRAIN_TIMEOUT = float(os.getenv("POST_CALL_DRAIN_TIMEOUT", "20"))
+
 # Initialize memory manager (optional if SUPERMEMORY_API_KEY not set)
 memory_manager: Optional[MemoryManager] = init_memory_manager()
-post_call_processor: Optional[PostCallProcessor] = None
+post_call_processor = PostCallProcessor(memory_manager)
+
+# Synthesized openings and recurring phrases, shared on disk by worker processes;
+# only the fixed phrases are cached, personalised text is always streamed
+tts_cache = init_tts_cache()
+tts_cache.register(AssistantPersonality.recurring_phrases())
+
+# Warm plugin clients and VAD weights shared by every call on this worker
+resource_pool = ResourcePool(cartesia_api_key=CARTESIA_API_KEY, tts_cache=tts_cache)
+
+# Resolves pre-rendered first-message audio references from room metadata
+audio_stores = init_audio_stores()
+
+# Load reported to LiveKit; the worker refuses jobs before it saturates
+capacity = init_capacity()
+
+# Parsed room metadata, reused when a room's job is retried or reconnects
+call_configs = init_call_config_cache()
+
+
+async def run_post_call_job(job: dict) -> bool:
+    """
+    Post-call work for one finished call (runs on the background queue)
+
+    Returns:
+        True once insights are saved and metadata stored, False to retry
+    """
+    call_uuid = job["call_uuid"]
+    transcript = job["transcript"]
+    started = time.perf_counter()
+
+    # Insights were computed incrementally during the call and snapshotted when
+    # it ended; jobs replayed from an older spool may not carry them, and a
+    # snapshot that misses transcript lines is recomputed
+    insights = job.get("insights")
+    transcript_lines = transcript.count("\n") + 1 if transcript else 0
+    if insights and job.get("insights_lines") != transcript_lines:
+        logger.warning(
+            f"⚠️ Insights for call {call_uuid} cover {job.get('insights_lines')}/{transcript_lines} "
+            f"transcript lines, recomputing"
+        )
+        insights = None
+    insights = insights or extract_insights(transcript)
+
+    # Store call metadata
+    call_metadata = {
+        "user_id": job["user_id"],
+        "call_uuid": call_uuid,
+        "mood": job["mood"],
+        "duration_seconds": job["duration_seconds"],
+        "completion_status": "completed",
+        "transcript_length": len(transcript),
+        "insights": insights,
+        "ended_at": job["ended_at"],
+    }
+
+    # Steps that succeeded on an earlier attempt are not repeated: a second
+    # memory write would store the call twice (the queue spools this list)
+    completed_steps = job.setdefault("completed_steps", [])
+    steps = {}
+    if "memory" not in completed_steps:
+        steps["memory"] = post_call_processor.save_call_summary(
+            user_id=job["supermemory_user_id"],  # Use Supermemory user ID for consistency
+            call_uuid=call_uuid,
+            transcript=transcript,
+            mood=job["mood"],
+            insights=insights,
+            timestamp=job["ended_at"],
+        )
+    if "metadata" not in completed_steps:
+        steps["metadata"] = post_call_processor.store_call_metadata(
+            user_id=job["supermemory_user_id"],  # Use Supermemory user ID
+            call_uuid=call_uuid,
+            metadata=call_metadata,
+        )
+
+    # Both writes are issued together so the batcher can coalesce them
+    results = await asyncio.gather(*steps.values())
+    completed_steps.extend(step for step, ok in zip(steps, results) if ok)
+    succeeded = all(results)
+
+    logger.info(
+        f"✅ Post-call processing complete for call {call_uuid}"
+        f"\n   Duration: {job['duration_seconds']}s"
+        f"\n   Promises found: {len(insights.get('promises_made', []))}"
+        f"\n   Goals mentioned: {len(insights.get('goals_mentioned', []))}"
+        f"\n   Sentiment: {insights.get('sentiment', 'unknown')}"
+    )
+    duration_ms = (time.perf_counter() - started) * 1000
+    instrumentation.export({
+        "kind": "post_call",
+        "call_id": call_uuid,
+        "duration_ms": round(duration_ms, 1),
+        "ok": succeeded,
+        "resumed": len(steps) < 2,
+    })
+    return succeeded
+
+
+post_call_queue = PostCallQueue(
+    handler=run_post_call_job,
+    spool_dir=POST_CALL_SPOOL_DIR or None,
+    max_size=int(os.getenv("POST_CALL_QUEUE_SIZE", "1000")),
+    workers=int(os.getenv("POST_CALL_WORKERS", "2")),
+    max_attempts=int(os.getenv("POST_CALL_MAX_ATTEMPTS", "5")),
+)
 
 
-async def prewarm(proc: JobContext):
-    """Prewarm plugins before agent starts"""
+# Per-call spans and latency aggregates: job processes append records to the JSONL file,
+# the main worker process serves the aggregates (see create_agent_worker)
+instrumentation = init_instrumentation()
+instrumentation.register("resource_pool", resource_pool.stats)
+instrumentation.register("post_call_queue", post_call_queue.stats)
+instrumentation.register("tts_cache", tts_cache.stats)
+instrumentation.register("first_message_audio", audio_stores.stats)
+instrumentation.register("capacity", capacity.stats, worker=True)
+instrumentation.register("call_config", call_configs.stats)
+if memory_manager:
+    instrumentation.register("supermemory", memory_manager.stats)
+METRICS_PORT = os.getenv("AGENT_METRICS_PORT")
+
+
+def prewarm(proc: JobProcess):
+    """Prewarm a job process before its job arrives (LiveKit calls this synchronously)"""
+    # Static prompt sections are rendered once per process
+    AssistantPersonality.precompile_prompts()
+
+    # Silero weights are the slow, CPU-bound part; every VAD profile is loaded here
+    logger.info("⏳ Loading VAD models...")
+    try:
+        resource_pool.load_vad_models()
+        logger.info(f"✅ VAD models loaded: {resource_pool.stats()}")
+    except Exception as e:
+        logger.error(f"❌ VAD prewarm failed: {e}")
+
+
+# Async per-process warmup, started by the process's first call (prewarm has no event loop)
+_process_warm: Optional[asyncio.Task] = None
+
+
+def warm_process() -> asyncio.Task:
+    """Start the job process's async warmup once, returns its task"""
+    global _process_warm
+    if _process_warm is None:
+        _process_warm = asyncio.create_task(_warm_process())
+    return _process_warm
+
+
+async def _warm_process() -> None:
+    # Replays post-call jobs left in the spool by a previous job process
+    await post_call_queue.start()
+
     logger.info("⏳ Prewarming plugins...")
     try:
-        await openai.LLM.create()
-        await cartesia.STT.create()
-        await cartesia.TTS.create()
-        logger.info("✅ Plugins prewarmed")
+        # Loads are shared with the call's own model init, which awaits the same futures
+        await resource_pool.warm()
+        logger.info(f"✅ Plugins prewarmed: {resource_pool.stats()}")
     except Exception as e:
         logger.error(f"❌ Plugin prewarm failed: {e}")
 
 
+def build_supermemory_section(
+    supermemory_context: dict,
+    mood: Optional[str] = None,
+    token_budget: Optional[int] = None,
+) -> str:
+    """Build the Supermemory section appended to the system prompt"""
+    return assemble_prompt("", [memory_prompt_section(supermemory_context, mood)], token_budget)
+
+
+def memory_prompt_section(supermemory_context: dict, mood: Optional[str] = None) -> PromptSection:
+    """Highest-value memories for this call, packed into MEMORY_TOKEN_BUDGET"""
+    return supermemory_section(rank_context(supermemory_context, mood), limits=None)
+
+
+async def load_supermemory_context(
+    supermemory_user_id: str,
+    mood: str,
+    timeline: CallTimeline,
+) -> dict:
+    """Fetch Supermemory context for the call (never raises)"""
+    with timeline.stage("memory_load"):
+        logger.info(f"📚 Loading Supermemory context for user: {supermemory_user_id}")
+        try:
+            supermemory_context = await memory_manager.get_context_for_call(
+                user_id=supermemory_user_id,
+                mood=mood,
+                max_memories=10,  # Get more memories for better context
+            )
+            logger.info(
+                f"✅ Supermemory context loaded: "
+                f"{len(supermemory_context.get('promises', []))} promises, "
+                f"{len(supermemory_context.get('goals', []))} goals, "
+                f"{len(supermemory_context.get('progress', []))} progress updates"
+            )
+            return supermemory_context
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to load Supermemory context: {e}")
+            return {}
+
+
+async def init_models(cartesia_voice_id: str, vad_profile: str, timeline: CallTimeline):
+    """Acquire LLM, STT, TTS and VAD from the worker pool, returns (llm, stt, tts, vad)"""
+
+    async def timed(stage: str, acquire):
+        with timeline.stage(stage):
+            return await acquire
+
+    with timeline.stage("model_init"):
+        return await asyncio.gather(
+            timed("llm_init", resource_pool.get_llm()),  # GPT-4o-mini
+            timed("stt_init", resource_pool.get_stt()),  # Cartesia Ink
+            timed("tts_init", resource_pool.get_tts(cartesia_voice_id)),  # Cartesia Sonic-3
+            timed("vad_load", resource_pool.get_vad(vad_profile)),  # Silero VAD
+        )
+
+
+async def preload_first_message_audio(
+    audio_task: asyncio.Task,
+    tts: CachedTTS,
+    text: str,
+    timeline: CallTimeline,
+    deadline_ms: float,
+) -> bool:
+    """
+    Hand pre-rendered first-message audio to the TTS cache
+
+    Returns:
+        True if `agent.say(text)` will play it, False to synthesize live
+    """
+    with timeline.stage("first_message_audio"):
+        done, _ = await asyncio.wait({audio_task}, timeout=max(0.0, (deadline_ms - timeline.now_ms()) / 1000))
+    if not done:
+        audio_task.cancel()
+        logger.warning(f"⏳ First-message audio missed the {FIRST_MESSAGE_AUDIO_TIMEOUT:.1f}s deadline, using live TTS")
+        return False
+
+    audio = audio_task.result()
+    if audio is None:
+        logger.warning("⚠️ First-message audio unavailable, using live TTS")
+        return False
+    if (audio.sample_rate, audio.num_channels) != (tts.sample_rate, tts.num_channels):
+        logger.warning(
+            f"⚠️ First-message audio is {audio.sample_rate}Hz/{audio.num_channels}ch, "
+            f"TTS output is {tts.sample_rate}Hz/{tts.num_channels}ch; using live TTS"
+        )
+        return False
+
+    tts.cache.preload(tts.voice, tts.model, text, audio)
+    logger.info("🎵 Playing pre-rendered first-message audio")
+    return True
+
+
 async def entrypoint(ctx: JobContext):
     """Main agent entrypoint - called when agent joins a room"""
     logger.info(f"📞 Agent joining room: {ctx.room.name}")
+    warm_process()
 
     # ============================================================================
     # 1. EXTRACT METADATA
     # ============================================================================
 
-    # Parse room metadata (can be string or dict)
-    room_metadata_raw = ctx.room.metadata or {}
-    if isinstance(room_metadata_raw, str):
-        try:
-            room_metadata = json.loads(room_metadata_raw)
-        except json.JSONDecodeError:
-            logger.warning("Failed to parse room metadata as JSON, using empty dict")
-            room_metadata = {}
-    else:
-        room_metadata = room_metadata_raw
+    timeline = CallTimeline(ctx.room.name)
 
-    user_id = room_metadata.get("user_id") or room_metadata.get("userId", "unknown")
-    call_uuid = room_metadata.get("call_uuid") or room_metadata.get("callUUID", "unknown")
-    mood = room_metadata.get("mood", "supportive")
-    cartesia_voice_id = room_metadata.get("cartesia_voice_id") or room_metadata.get("cartesiaVoiceId", "default")
-    supermemory_user_id = room_metadata.get("supermemory_user_id") or room_metadata.get("supermemoryUserId", user_id)
-    
-    # Extract backend-generated prompts (from prompt-engine)
-    prompts_data = room_metadata.get("prompts") or {}
-    backend_system_prompt = prompts_data.get("systemPrompt") or prompts_data.get("system_prompt")
-    backend_first_message = prompts_data.get("firstMessage") or prompts_data.get("first_message")
+    with timeline.stage("metadata_parse"):
+        # Room metadata (JSON string or dict), parsed and validated once per distinct payload
+        call_config = call_configs.parse(ctx.room.metadata)
+
+        user_id = call_config.user_id
+        call_uuid = call_config.call_uuid
+        mood = call_config.mood
+        cartesia_voice_id = call_config.cartesia_voice_id
+        supermemory_user_id = call_config.supermemory_user_id
+        # Optional VAD preset (conservative/balanced/aggressive) and adaptive endpointing switch
+        vad_profile = get_vad_profile(mood, call_config.vad_profile)
+
+        # Backend-generated prompts (from prompt-engine)
+        backend_system_prompt = call_config.system_prompt
+        backend_first_message = call_config.first_message
+        backend_first_message_audio = call_config.first_message_audio
+
+    timeline.call_id = call_uuid
 
     logger.info(
         f"📊 Call metadata:"
@@ -115,37 +393,59 @@ async def entrypoint(ctx: JobContext):
         f"\n   UUID: {call_uuid}"
         f"\n   Mood: {mood}"
         f"\n   Voice: {cartesia_voice_id}"
+        f"\n   VAD: {vad_profile}"
         f"\n   Backend prompts: {'✅ Available' if backend_system_prompt else '❌ Missing - using fallback'}"
         f"\n   Supermemory: {'✅ Configured' if memory_manager else '❌ Not configured'}"
     )
 
     # ============================================================================
-    # 2. LOAD SUPERMEMORY CONTEXT (CRITICAL FOR PERSONALIZATION)
+    # 2. START SUPERMEMORY CONTEXT LOAD + AI MODEL INIT (CONCURRENTLY)
     # ============================================================================
 
-    supermemory_context = {}
+    # Pre-rendered first-message audio is fetched alongside everything else
+    audio_task: Optional[asyncio.Task] = None
+    if backend_first_message and backend_first_message_audio:
+        audio_task = asyncio.create_task(audio_stores.load(backend_first_message_audio))
+        audio_deadline_ms = timeline.now_ms() + FIRST_MESSAGE_AUDIO_TIMEOUT * 1000
+
+    # Memory is fetched speculatively while models initialize. The call waits for
+    # it only until MEMORY_LOAD_DEADLINE; late context is merged once the agent runs.
+    memory_task: Optional[asyncio.Task] = None
     if memory_manager:
-        logger.info(f"📚 Loading Supermemory context for user: {supermemory_user_id}")
-        try:
-            supermemory_context = await memory_manager.get_context_for_call(
-                user_id=supermemory_user_id,
-                mood=mood,
-                max_memories=10,  # Get more memories for better context
-            )
-            logger.info(
-                f"✅ Supermemory context loaded: "
-                f"{len(supermemory_context.get('promises', []))} promises, "
-                f"{len(supermemory_context.get('goals', []))} goals, "
-                f"{len(supermemory_context.get('progress', []))} progress updates"
-            )
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to load Supermemory context: {e}")
-            supermemory_context = {}
+        memory_task = asyncio.create_task(
+            load_supermemory_context(supermemory_user_id, mood, timeline)
+        )
     else:
         logger.warning("⚠️ Supermemory not configured - memory features disabled")
 
+    logger.info("🤖 Initializing AI models...")
+    gpt_model, stt, voice_tts, vad = await init_models(cartesia_voice_id, vad_profile, timeline)
+    logger.info(f"✅ AI models initialized (pool: {resource_pool.stats()})")
+
+    # The pooled clients serve every call on the worker; the pipeline gets per-call
+    # views so it only receives metrics (and usage) for this call's requests
+    gpt_model, tts = CallLLM(gpt_model), CallTTS(voice_tts)
+
     # ============================================================================
-    # 3. INITIALIZE CONVERSATION MANAGER (for fallback/context)
+    # 3. WAIT FOR SUPERMEMORY CONTEXT (UP TO THE DEADLINE)
+    # ============================================================================
+
+    supermemory_context = {}
+    if memory_task:
+        remaining = MEMORY_LOAD_DEADLINE - timeline.now_ms() / 1000
+        with timeline.stage("memory_wait"):
+            done, _ = await asyncio.wait({memory_task}, timeout=max(0.0, remaining))
+        if done:
+            supermemory_context = memory_task.result()
+            memory_task = None
+        else:
+            logger.warning(
+                f"⏳ Supermemory context missed the {MEMORY_LOAD_DEADLINE:.1f}s deadline, "
+                "starting call without it"
+            )
+
+    # ============================================================================
+    # 4. INITIALIZE CONVERSATION MANAGER (for fallback/context)
     # ============================================================================
 
     conversation = ConversationManager(
@@ -158,33 +458,6 @@ async def entrypoint(ctx: JobContext):
     conversation.user_context = supermemory_context
     logger.info("✅ Conversation manager initialized with Supermemory context")
 
-    # ============================================================================
-    # 4. INITIALIZE AI MODELS (STT, LLM, TTS)
-    # ============================================================================
-
-    logger.info("🤖 Initializing AI models...")
-
-    # LLM (GPT-4o-mini)
-    gpt_model = openai.LLM.with_model(model="gpt-4o-mini")
-
-    # STT (Cartesia Ink)
-    stt = await cartesia.STT.create(
-        api_key=CARTESIA_API_KEY,
-        model="ink",  # Cartesia Ink for accurate speech recognition
-    )
-
-    # TTS (Cartesia Sonic-3)
-    tts = await cartesia.TTS.create(
-        api_key=CARTESIA_API_KEY,
-        model="sonic-3",  # Cartesia Sonic-3 for natural voice
-        voice=cartesia_voice_id or "default",
-    )
-
-    # VAD (Voice Activity Detection)
-    vad = silero.VAD.load()
-
-    logger.info("✅ AI models initialized")
-
     # ============================================================================
     # 5. GET SYSTEM PROMPT (Backend-generated + Supermemory enhancement)
     # ============================================================================
@@ -198,34 +471,17 @@ async def entrypoint(ctx: JobContext):
         
         # ENHANCE with Supermemory context if available
         if supermemory_context and (supermemory_context.get('promises') or supermemory_context.get('goals')):
-            supermemory_section = "\n\n## 🧠 SUPERMEMORY CONTEXT (Recent Memories)\n\n"
-            
-            if supermemory_context.get('promises'):
-                supermemory_section += "**Recent Promises Made:**\n"
-                for promise in supermemory_context['promises'][:5]:
-                    supermemory_section += f"- {promise}\n"
-                supermemory_section += "\n"
-            
-            if supermemory_context.get('goals'):
-                supermemory_section += "**Current Goals:**\n"
-                for goal in supermemory_context['goals'][:5]:
-                    supermemory_section += f"- {goal}\n"
-                supermemory_section += "\n"
-            
-            if supermemory_context.get('progress'):
-                supermemory_section += "**Recent Progress:**\n"
-                for progress in supermemory_context['progress'][:3]:
-                    supermemory_section += f"- {progress}\n"
-                supermemory_section += "\n"
-            
-            supermemory_section += "*Use this context to reference past conversations and track progress.*\n"
-            system_prompt += supermemory_section
+            system_prompt = assemble_prompt(
+                system_prompt, [memory_prompt_section(supermemory_context, mood)]
+            )
             logger.info("   ✅ Enhanced with Supermemory context")
     else:
         system_prompt = conversation.get_system_prompt()
         logger.info(f"📝 Using fallback system prompt ({len(system_prompt)} chars)")
         logger.warning("   ⚠️ Backend prompts not found - using basic assistant prompt")
 
+    logger.info(f"   Prompt size: ~{estimate_tokens(system_prompt)}/{PROMPT_TOKEN_BUDGET} tokens")
+
     # ============================================================================
     # 6. CREATE VOICE PIPELINE AGENT
     # ============================================================================
@@ -240,11 +496,77 @@ async def entrypoint(ctx: JobContext):
         )
     ]
 
-    # Store first message for later use (will be spoken after agent starts)
-    first_message_to_speak = backend_first_message
+    # Store first message for later use (will be spoken after agent starts).
+    # Without a backend opening the mood's canned one is used; those repeat
+    # across calls, so they are usually played from the TTS cache.
+    first_message_to_speak = backend_first_message or conversation.personality.get_opening_message()
 
     if first_message_to_speak:
-        logger.info(f"📢 First message ready: {first_message_to_speak[:50]}...")
+        logger.info(
+            f"📢 First message ready ({len(split_ssml(first_message_to_speak))} segments): "
+            f"{first_message_to_speak[:50]}..."
+        )
+
+    # Older turns are folded into a summary so every LLM request stays bounded
+    context_window = init_context_window()
+
+    # Yes/no and other short answers get a cached acknowledgment while the LLM writes the follow-up
+    fast_path = init_fast_path(conversation.personality)
+
+    def reply_context(user_text: str) -> llm.ChatContext:
+        """The LLM request a reply to `user_text` would be generated from"""
+        context_window.compact(agent.chat_ctx)
+        chat_ctx = agent.chat_ctx.copy().append(role="user", text=user_text)
+        if fast_path is not None:
+            ack = fast_path.acknowledgment(user_text, last_agent_turn(agent.chat_ctx))
+            fast_path.with_acknowledgment(chat_ctx, ack)
+        return chat_ctx
+
+    # Replies can start from a stable interim transcript while endpointing is still pending
+    speculation = init_speculation(gpt_model, reply_context)
+    stt = CallSTT(stt, speculation.on_speech_event if speculation is not None else None)
+
+    async def release_call_plugins() -> None:
+        if speculation is not None:
+            await speculation.aclose()
+        # Detach from the pooled clients, which stay open for the next calls
+        for plugin in (gpt_model, stt, tts):
+            await plugin.aclose()
+
+    ctx.add_shutdown_callback(release_call_plugins)
+
+    def before_llm_cb(assistant: VoicePipelineAgent, chat_ctx: llm.ChatContext):
+        """Compact the call's chat context before each LLM turn, reusing a speculative reply"""
+        # chat_ctx is a copy of assistant.chat_ctx plus this turn's new messages
+        pending = chat_ctx.messages[len(assistant.chat_ctx.messages):]
+        if context_window.compact(assistant.chat_ctx):
+            chat_ctx.messages[:] = list(assistant.chat_ctx.messages) + pending
+            logger.debug(f"🧠 Chat context compacted: {context_window.stats()}")
+
+        user_message = chat_ctx.messages[-1]
+        ack = None
+        if fast_path is not None:
+            # Acknowledged only as an answer to the scripted promise question
+            ack = fast_path.acknowledgment(message_text(user_message), last_agent_turn(chat_ctx))
+        if ack:
+            fast_path.with_acknowledgment(chat_ctx, ack)
+        # The already running stream if the final transcript agrees with it
+        reply = speculation.take(chat_ctx) if speculation is not None else None
+        if not ack:
+            return reply  # None: default LLM call on the compacted context
+
+        # The pipeline speaks one reply per turn, so the acknowledgment and the
+        # follow-up are said in order here and the pipeline's reply is cancelled
+        asyncio.ensure_future(fast_path.speak(
+            assistant, user_message, ack, reply or gpt_model.chat(chat_ctx=chat_ctx)
+        ))
+        return False
+
+    # Endpointing starts at the profile's delay and follows the user's pauses
+    endpointing = init_endpointing(
+        get_vad_config(vad_profile)["endpointing_delay_ms"] / 1000,
+        adaptive=call_config.vad_adaptive,
+    )
 
     agent = VoicePipelineAgent(
         vad=vad,
@@ -254,7 +576,35 @@ async def entrypoint(ctx: JobContext):
         chat_ctx=llm.ChatContext(
             messages=initial_messages
         ),
+        before_llm_cb=before_llm_cb,
+        min_endpointing_delay=endpointing.delay,
     )
+    endpointing.attach(agent)
+    if speculation is not None:
+        speculation.attach(agent)
+
+    # Supermemory context that missed the deadline is merged when it lands
+    if memory_task:
+        def merge_late_context(task: asyncio.Task) -> None:
+            if task.cancelled():
+                return
+            late_context = task.result()
+            if not late_context or not (
+                late_context.get('promises') or late_context.get('goals') or late_context.get('progress')
+            ):
+                return
+            conversation.user_context = late_context
+            late_section = build_supermemory_section(
+                late_context,
+                mood=mood,
+                token_budget=section_budget(system_prompt),
+            )
+            if not late_section:
+                return
+            agent.chat_ctx.append(llm.ChatMessage(role="system", content=late_section))
+            logger.info(f"🧠 Late Supermemory context merged into chat (+{timeline.now_ms():.0f}ms)")
+
+        memory_task.add_done_callback(merge_late_context)
 
     # ============================================================================
     # 7. REGISTER DEVICE TOOLS (Removed - Mock tools deleted)
@@ -267,18 +617,27 @@ async def entrypoint(ctx: JobContext):
     # 8. SETUP TRANSCRIPTION TRACKING
     # ============================================================================
 
-    # Track conversation for post-call processing
-    transcript_lines = []
-
-    async def on_agent_message(message: str):
+    # Track conversation for post-call processing (ConversationManager holds
+    # the only copy of the transcript; the chat context is compacted)
+    @agent.on("agent_speech_committed")
+    def on_agent_message(message: llm.ChatMessage):
         """Called when agent sends message"""
-        conversation.add_to_transcript("agent", message)
-        transcript_lines.append(f"Agent: {message}")
+        conversation.add_to_transcript("agent", message_text(message))
 
-    async def on_user_message(message: str):
+    @agent.on("user_speech_committed")
+    def on_user_message(message: llm.ChatMessage):
         """Called when user sends message"""
-        conversation.add_to_transcript("user", message)
-        transcript_lines.append(f"User: {message}")
+        conversation.add_to_transcript("user", message_text(message))
+
+    # Per-turn EOU -> LLM first token -> TTS first byte latency
+    recorder = instrumentation.recorder(timeline)
+    usage = metrics.UsageCollector()
+
+    @agent.on("metrics_collected")
+    def on_metrics_collected(collected: metrics.AgentMetrics):
+        """Called for every STT/LLM/TTS/EOU metrics event"""
+        recorder.on_metrics(collected)
+        usage.collect(collected)
 
     # ============================================================================
     # 9. START AGENT
@@ -286,19 +645,110 @@ async def entrypoint(ctx: JobContext):
 
     logger.info("🚀 Starting voice pipeline agent...")
     call_start_time = datetime.utcnow()
+    warm_task: Optional[asyncio.Future] = None
+
+    # ============================================================================
+    # 10. POST-CALL PROCESSING (Store to Supermemory)
+    # ============================================================================
+
+    async def end_call() -> None:
+        """Runs at job shutdown, when the call is over (the pipeline outlives this function)"""
+        call_end_time = datetime.utcnow()
+        call_duration = (call_end_time - call_start_time).total_seconds()
+
+        if memory_task and not memory_task.done():
+            memory_task.cancel()
+        if audio_task and not audio_task.done():
+            audio_task.cancel()
+        if warm_task and not warm_task.done():
+            warm_task.cancel()
+
+        # Transcript and the insights snapshot, final now that the call is over
+        transcript = conversation.get_transcript()
+        insights = conversation.get_insights()
+
+        # Post-call work runs on the queue off the pipeline; the job process exits
+        # after this callback, so it is drained (bounded) before returning below
+        accepted = await post_call_queue.submit({
+            "user_id": user_id,
+            "supermemory_user_id": supermemory_user_id,
+            "call_uuid": call_uuid,
+            "mood": mood,
+            "transcript": transcript,
+            "insights": insights,
+            "insights_lines": conversation.insights.lines,
+            "duration_seconds": int(call_duration),
+            "ended_at": call_end_time.isoformat(),
+        })
+
+        if accepted:
+            logger.info(f"📨 Call ended ({call_duration:.1f}s), post-call work queued: {post_call_queue.stats()}")
+        if memory_manager:
+            memory_stats = memory_manager.stats()
+            logger.info(
+                f"📊 Supermemory reads: p95={memory_stats['read_latency']['p95_ms']}ms, "
+                f"deadline={memory_stats['read_deadline_s']:.2f}s, "
+                f"breaker={memory_stats['breaker']['state']}, "
+                f"hedges={memory_stats['hedges_sent']} (won {memory_stats['hedge_wins']})"
+            )
+        timeline.log_summary()
+        recorder.finish(
+            user_id=user_id,
+            mood=mood,
+            duration_seconds=int(call_duration),
+            memory_late=memory_task is not None,
+            context_window=context_window.stats(),
+            speculation=speculation.stats() if speculation else None,
+            fast_path=fast_path.stats() if fast_path else None,
+            vad_profile=vad_profile,
+            endpointing=endpointing.stats(),
+            usage=vars(usage.get_summary()),
+        )
+
+        # Anything still pending (failing writes in backoff) stays in the spool and is
+        # replayed by the next job process on this machine
+        if not await post_call_queue.drain(timeout=POST_CALL_DRAIN_TIMEOUT):
+            logger.warning(
+                f"⏳ Post-call work not finished after {POST_CALL_DRAIN_TIMEOUT:.0f}s, "
+                f"left in the spool: {post_call_queue.stats()}"
+            )
+        # This process exits next; the worker's endpoint keeps its final component stats
+        instrumentation.export_components()
+
+    ctx.add_shutdown_callback(end_call)
 
     try:
-        await agent.start(ctx.room, ctx.participant)
+        with timeline.stage("agent_start"):
+            await agent.start(ctx.room, ctx.participant)
         logger.info("✅ Agent started successfully")
+        timeline.log_summary(milestone="agent_start")
+
+        # Acknowledgments are a handful of fixed phrases per mood and voice; only
+        # the first calls with a new voice render them, later ones find them cached
+        if fast_path is not None and isinstance(voice_tts, CachedTTS):
+            warm_task = asyncio.ensure_future(voice_tts.warm(fast_path.phrases()))
         
-        # If backend provided first message, speak it immediately
-        # This uses the backend-generated opening from prompt-engine
+        # Speak the first message immediately
+        # This uses the backend-generated opening from prompt-engine when provided
         if first_message_to_speak:
-            logger.info("📢 Speaking backend-generated first message...")
+            logger.info(
+                f"📢 Speaking {'backend-generated' if backend_first_message else 'fallback'} first message..."
+            )
             try:
                 # Use the agent's say method to speak the first message
-                # This ensures the backend-generated opening is used exactly as intended
-                await agent.say(first_message_to_speak, allow_interruptions=True)
+                # This ensures the backend-generated opening is used exactly as intended.
+                # The fixed fallback openings are said whole so the TTS cache can serve
+                # them; anything else (the backend's personalised openings) is streamed
+                # sentence by sentence so audio starts after the first.
+                preloaded = audio_task is not None and await preload_first_message_audio(
+                    audio_task, voice_tts, first_message_to_speak, timeline, audio_deadline_ms
+                )
+                if preloaded or tts_cache.cacheable(first_message_to_speak):
+                    speech = first_message_to_speak
+                else:
+                    speech = stream_ssml(first_message_to_speak)
+                with timeline.stage("first_message"):
+                    await agent.say(speech, allow_interruptions=True)
                 logger.info("✅ First message spoken")
             except AttributeError:
                 # Fallback: add to context and trigger generation
@@ -313,64 +763,23 @@ async def entrypoint(ctx: JobContext):
         logger.error(f"❌ Agent start failed: {e}")
         raise
 
-    finally:
-        # ========================================================================
-        # 10. POST-CALL PROCESSING (Store to Supermemory)
-        # ========================================================================
-
-        call_end_time = datetime.utcnow()
-        call_duration = (call_end_time - call_start_time).total_seconds()
-
-        logger.info("📊 Call ended, starting post-call processing...")
-
-        # Get transcript
-        transcript = conversation.get_transcript()
-
-        # Process transcript and extract insights
-        if post_call_processor is None:
-            post_call_processor = PostCallProcessor(memory_manager)
-
-        # Use Supermemory user ID for storing memories
-        insights = await post_call_processor.process_call_transcript(
-            user_id=supermemory_user_id,  # Use Supermemory user ID for consistency
-            call_uuid=call_uuid,
-            transcript=transcript,
-            mood=mood,
-        )
-
-        # Store call metadata
-        call_metadata = {
-            "user_id": user_id,
-            "call_uuid": call_uuid,
-            "mood": mood,
-            "duration_seconds": int(call_duration),
-            "completion_status": "completed",
-            "transcript_length": len(transcript),
-            "insights": insights,
-            "ended_at": call_end_time.isoformat(),
-        }
-
-        await post_call_processor.store_call_metadata(
-            user_id=supermemory_user_id,  # Use Supermemory user ID
-            call_uuid=call_uuid,
-            metadata=call_metadata,
-        )
-
-        logger.info("✅ Post-call processing complete")
-        logger.info(
-            f"   Duration: {call_duration:.1f}s"
-            f"\n   Promises found: {len(insights.get('promises_made', []))}"
-            f"\n   Goals mentioned: {len(insights.get('goals_mentioned', []))}"
-            f"\n   Sentiment: {insights.get('sentiment', 'unknown')}"
-        )
-
 
 def create_agent_worker():
     """Create and configure the LiveKit agent worker"""
     worker = agents.Worker(
         prewarm_fnc=prewarm,
         entrypoint=entrypoint,
+        # Load-aware job acceptance (see capacity.py)
+        load_fnc=capacity.load,
+        load_threshold=capacity.threshold,
+        request_fnc=capacity.request_fnc,
     )
+    # load_fnc/request_fnc run in this (main) process; calls are counted from its jobs
+    capacity.attach(worker)
+
+    # The endpoint outlives job processes and aggregates the records they export
+    if METRICS_PORT:
+        instrumentation.serve(int(METRICS_PORT))
 
     return worker
 
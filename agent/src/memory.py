@@ -4,23 +4,109 @@ Handles retrieval and storage of user memories
 """
 
 import os
+import time
+import asyncio
 import logging
-import requests
+import aiohttp
 from typing import Optional, List, Dict, Any
 
+from config import SuprememoryConfig
+from memory_cache import MemoryContextCache
+from memory_batcher import WriteBatcher
+from memory_index import MemoryTagIndex
+from memory_mirror import MemoryMirror, insight_memories
+from resilience import AdaptiveDeadline, CircuitBreaker, LatencyHistogram, hedged_call
+
 logger = logging.getLogger(__name__)
 
+# Call records carry only this tag (mood lives in their metadata) so the mood-tagged
+# context reads never match them; ones written with a mood tag are dropped on read
+CALL_METADATA_TAG = "call_metadata"
+
 
 class MemoryManager:
     """Manages user memories via Supermemory API"""
 
-    def __init__(self, api_key: str, base_url: str = "https://api.supermemory.ai"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.supermemory.ai",
+        timeout: float = 5.0,
+        max_connections: int = 20,
+        max_concurrency: int = 10,
+        cache: Optional[MemoryContextCache] = None,
+        batch_size: int = 1,
+        batch_window: float = 0.25,
+        mirror: Optional[MemoryMirror] = None,
+        mirror_sync_interval: float = 60.0,
+        hedging: bool = True,
+        min_read_deadline: float = 0.3,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
         self.api_key = api_key
         self.base_url = base_url
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        # Reads adapt their deadline to observed latency (never above `timeout`)
+        self.read_latency = LatencyHistogram()
+        self.read_deadline = AdaptiveDeadline(self.read_latency, ceiling=timeout, floor=min_read_deadline)
+        self.hedging = hedging
+        self.breaker = breaker or CircuitBreaker()
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.cache = cache
+        self.mirror = mirror
+        self.mirror_sync_interval = mirror_sync_interval
+        self._syncing: Dict[str, asyncio.Future] = {}
+
+        # Writes from many calls are coalesced into bulk requests when batching is on
+        self.batcher: Optional[WriteBatcher] = None
+        if batch_size > 1:
+            self.batcher = WriteBatcher(
+                flush_fn=self._post_batch,
+                max_batch_size=batch_size,
+                max_delay=batch_window,
+            )
+
+        # Created lazily on first request so they bind to the worker's running loop.
+        # One keep-alive pool per process is shared by every call on this worker.
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=self.timeout,
+                connector=connector,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def aclose(self) -> None:
+        """Flush pending writes and close the shared HTTP session (call on worker shutdown)"""
+        if self.batcher:
+            await self.batcher.flush()
+        if self._syncing:
+            await asyncio.gather(*self._syncing.values(), return_exceptions=True)
+        if self.mirror:
+            await self.mirror.aclose()
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._semaphore = None
 
     async def get_context_for_call(
         self,
@@ -34,71 +120,211 @@ class MemoryManager:
         Uses semantic + keyword search for sub-300ms recall as per Supermemory docs:
         https://supermemory.ai
 
+        Reads go cache -> local mirror -> remote API. A mirrored user is served
+        their most recent memories from disk (ranking weighs the mood) while a
+        background sync refreshes the mirror.
+
         Args:
             user_id: Unique user identifier
             mood: Call mood/type (supportive, accountability, celebration)
             max_memories: Max memories to retrieve
 
         Returns:
-            Dictionary with retrieved memories and context
+            Dictionary with retrieved memories and context; "tag_index" is a
+            MemoryTagIndex for further tag queries (blockers, wins, ...)
         """
-        try:
-            # Query Supermemory API for user's memories
-            # Using semantic search for better recall quality
-            params = {
-                "user_id": user_id,
-                "limit": max_memories,
-            }
-            
-            # Add tag filtering if mood is specified
-            if mood:
-                params["tags"] = [mood, "call", "recent"]
-            
-            response = requests.get(
-                f"{self.base_url}/v1/memories",
-                headers=self.headers,
-                params=params,
-                timeout=5,
-            )
+        cache_key = (user_id, mood, max_memories)
+        if self.cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"✅ Supermemory: Using cached context for user {user_id}")
+                return cached
+            generation = self.cache.generation(user_id)
 
-            if response.status_code == 200:
-                result = response.json()
-                # Handle both array and object response formats
-                if isinstance(result, list):
-                    memories = result
-                else:
-                    memories = result.get("memories", []) or result.get("data", [])
-                
+        # Local mirror first; the remote API is then only consulted in the background
+        if self.mirror:
+            mirrored = await self.mirror.get(user_id, max_memories)
+            if mirrored is not None:
                 logger.info(
-                    f"✅ Supermemory: Retrieved {len(memories)} memories for user {user_id}"
-                )
-                
-                return {
-                    "promises": self._extract_promises(memories),
-                    "goals": self._extract_goals(memories),
-                    "progress": self._extract_progress(memories),
-                    "raw_memories": memories,
-                }
-            else:
-                error_text = response.text if hasattr(response, 'text') else 'Unknown error'
-                logger.warning(
-                    f"⚠️ Supermemory API returned {response.status_code}: {error_text}"
+                    f"✅ Supermemory: Using {len(mirrored)} mirrored memories for user {user_id}"
                 )
-                return {
-                    "promises": [],
-                    "goals": [],
-                    "progress": [],
-                    "raw_memories": [],
-                }
-
-        except requests.RequestException as e:
+                self._schedule_sync(user_id, mood, max_memories)
+                context = self._build_context(mirrored)
+                if self.cache:
+                    self.cache.put(cache_key, context, generation=generation)
+                return context
+
+        memories = await self._fetch_memories(user_id, mood, max_memories)
+        if memories is None:
+            # Remote unavailable: fall back to whatever this worker wrote locally
+            if self.mirror:
+                local = await self.mirror.get(user_id, max_memories, synced_only=False)
+                if local:
+                    logger.warning(
+                        f"⚠️ Supermemory unavailable, using {len(local)} local memories for user {user_id}"
+                    )
+                    return self._build_context(local)
+            return self._build_context([])
+
+        if self.mirror:
+            await self.mirror.replace(user_id, memories)
+        context = self._build_context(memories)
+        if self.cache:
+            self.cache.put(cache_key, context, generation=generation)
+        return context
+
+    async def _fetch_memories(
+        self,
+        user_id: str,
+        mood: str,
+        max_memories: int,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Query Supermemory for a user's memories
+
+        Skipped while the circuit breaker is open. Otherwise the request gets
+        an adaptive deadline and, once it outlives the observed p95, a hedged
+        duplicate; whichever answers first wins.
+
+        Returns:
+            The memories, or None if the API failed
+        """
+        if not self.breaker.allow():
+            logger.warning(f"⚠️ Supermemory circuit open, skipping remote read for user {user_id}")
+            return None
+
+        # Query Supermemory API for user's memories
+        # Using semantic search for better recall quality
+        params = [
+            ("user_id", user_id),
+            ("limit", str(max_memories)),
+        ]
+        
+        # Add tag filtering if mood is specified
+        if mood:
+            params.extend(("tags", tag) for tag in (mood, "call", "recent"))
+
+        attempts = 0
+
+        async def attempt():
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                self.hedges_sent += 1
+            started = time.monotonic()
+            session = self._get_session()
+            async with self._semaphore:
+                async with session.get(
+                    f"{self.base_url}/v1/memories",
+                    params=params,
+                ) as response:
+                    status = response.status
+                    if status == 200:
+                        # A malformed body raises ValueError (json.JSONDecodeError)
+                        body = await response.json(content_type=None)
+                    else:
+                        body = await response.text()
+            self.read_latency.record((time.monotonic() - started) * 1000)
+            return status, body
+
+        deadline = self.read_deadline.deadline()
+        hedge_delay = self.read_deadline.hedge_delay() if self.hedging else None
+        try:
+            (status, result), winner = await hedged_call(attempt, deadline, hedge_delay)
+        except asyncio.TimeoutError:
+            # Count the timeout at the deadline so the next deadline widens
+            self.read_latency.record(deadline * 1000)
+            self.breaker.record_failure()
+            logger.error(f"❌ Supermemory API timed out after {deadline:.2f}s")
+            return None
+        except aiohttp.ClientError as e:
+            self.breaker.record_failure()
             logger.error(f"❌ Supermemory API error: {e}")
-            return {
-                "promises": [],
-                "goals": [],
-                "progress": [],
-                "raw_memories": [],
-            }
+            return None
+        except ValueError as e:
+            self.breaker.record_failure()
+            logger.error(f"❌ Supermemory API returned a malformed body: {e}")
+            return None
+
+        if winner:
+            self.hedge_wins += 1
+
+        if status != 200:
+            # Server-side trouble trips the breaker; client errors do not
+            if status >= 500 or status == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            logger.warning(
+                f"⚠️ Supermemory API returned {status}: {result}"
+            )
+            return None
+
+        # Handle both array and object response formats
+        if isinstance(result, list):
+            memories = result
+        elif isinstance(result, dict):
+            memories = result.get("memories", []) or result.get("data", [])
+        else:
+            memories = None
+        if not isinstance(memories, list):
+            self.breaker.record_failure()
+            logger.error(f"❌ Supermemory API returned an unexpected body: {type(result).__name__}")
+            return None
+
+        self.breaker.record_success()
+        memories = [memory for memory in memories if not _is_call_record(memory)]
+        logger.info(
+            f"✅ Supermemory: Retrieved {len(memories)} memories for user {user_id}"
+        )
+        return memories
+
+    def stats(self) -> Dict[str, Any]:
+        """Read latency, breaker, hedging, cache, mirror and batcher metrics"""
+        return {
+            "read_latency": self.read_latency.stats(),
+            "read_deadline_s": self.read_deadline.deadline(),
+            "breaker": self.breaker.stats(),
+            "hedges_sent": self.hedges_sent,
+            "hedge_wins": self.hedge_wins,
+            "cache": self.cache.stats() if self.cache else None,
+            "mirror": self.mirror.stats() if self.mirror else None,
+            "batcher": self.batcher.stats() if self.batcher else None,
+        }
+
+    @staticmethod
+    def _build_context(memories: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Call context from a list of memories"""
+        # One pass over the response; further tag queries are lookups
+        index = MemoryTagIndex(memories)
+        return {
+            "promises": index.contents("promise"),
+            "goals": index.contents("goal"),
+            "progress": index.contents("progress"),
+            "raw_memories": memories,
+            "tag_index": index,
+        }
+
+    def _schedule_sync(self, user_id: str, mood: str, max_memories: int) -> None:
+        """Refresh a user's mirror from the remote API without blocking the call"""
+        if user_id in self._syncing:
+            return
+        task = asyncio.ensure_future(self._sync_user(user_id, mood, max_memories))
+        self._syncing[user_id] = task
+        task.add_done_callback(lambda _: self._syncing.pop(user_id, None))
+
+    async def _sync_user(self, user_id: str, mood: str, max_memories: int) -> None:
+        synced_at = await self.mirror.synced_at(user_id)
+        if synced_at is not None and time.time() - synced_at < self.mirror_sync_interval:
+            return
+        memories = await self._fetch_memories(user_id, mood, max_memories)
+        if memories is None:
+            return
+        await self.mirror.replace(user_id, memories)
+        # Next call builds its context from the refreshed mirror
+        if self.cache:
+            self.cache.invalidate_user(user_id)
+        logger.debug(f"♻️ Memory mirror synced for user {user_id} ({len(memories)} memories)")
 
     async def save_call_memory(
         self,
@@ -156,63 +382,182 @@ class MemoryManager:
                 },
             }
 
-            response = requests.post(
-                f"{self.base_url}/v1/memories",
-                headers=self.headers,
-                json=payload,
-                timeout=5,
-            )
+            # Write-through so the next call sees it even if the remote write is slow or fails
+            if self.mirror:
+                await self.mirror.add(
+                    user_id,
+                    {key: payload[key] for key in ("content", "tags", "metadata")},
+                )
+                # The call memory is not a promise/goal/progress memory; its insights
+                # are, for prompts built while Supermemory is unreachable
+                await self.mirror.add_offline(
+                    user_id,
+                    insight_memories(insights, memory_data.get("mood", "supportive"), payload["metadata"]),
+                )
 
-            if response.status_code in [200, 201]:
+            if await self._write_memory(payload):
                 logger.info(f"✅ Supermemory: Saved call memory for user {user_id} (call: {call_uuid})")
+                # Next call for this user must see the memory we just wrote
+                if self.cache:
+                    self.cache.invalidate_user(user_id)
                 return True
-            else:
-                error_text = response.text if hasattr(response, 'text') else 'Unknown error'
-                logger.warning(f"⚠️ Supermemory API returned {response.status_code}: {error_text}")
-                return False
+            return False
 
-        except requests.RequestException as e:
+        except Exception as e:
             logger.error(f"❌ Supermemory API error saving memory: {e}")
             return False
 
-    @staticmethod
-    def _extract_promises(memories: List[Dict]) -> List[str]:
-        """Extract promises from memories"""
-        promises = []
-        for memory in memories:
-            if "promise" in memory.get("tags", []):
-                promises.append(memory.get("content", ""))
-        return promises
+    async def save_call_metadata(
+        self,
+        user_id: str,
+        call_uuid: str,
+        metadata: Dict[str, Any],
+    ) -> bool:
+        """
+        Store a call metadata record (duration, mood, completion status)
 
-    @staticmethod
-    def _extract_goals(memories: List[Dict]) -> List[str]:
-        """Extract goals from memories"""
-        goals = []
-        for memory in memories:
-            if "goal" in memory.get("tags", []):
-                goals.append(memory.get("content", ""))
-        return goals
+        Sent through the same write path as call memories, so with batching
+        on it shares bulk requests with memory saves from other calls. It is
+        tagged only CALL_METADATA_TAG, so it never takes one of the context
+        read's slots from promises, goals and progress.
 
-    @staticmethod
-    def _extract_progress(memories: List[Dict]) -> List[str]:
-        """Extract progress updates from memories"""
-        progress = []
-        for memory in memories:
-            if "progress" in memory.get("tags", []):
-                progress.append(memory.get("content", ""))
-        return progress
+        Returns:
+            True if successful, False otherwise
+        """
+        payload = {
+            "user_id": user_id,
+            "content": (
+                f"Call record ({metadata.get('mood')}): "
+                f"{metadata.get('completion_status', 'completed')}, "
+                f"{metadata.get('duration_seconds')}s"
+            ),
+            "tags": [CALL_METADATA_TAG],
+            "metadata": {"call_uuid": call_uuid, **metadata},
+        }
+        try:
+            return await self._write_memory(payload)
+        except Exception as e:
+            logger.error(f"❌ Supermemory API error saving call metadata: {e}")
+            return False
+
+    async def _write_memory(self, payload: Dict[str, Any]) -> bool:
+        """Write one memory, via the batcher when enabled"""
+        if self.batcher:
+            return await self.batcher.submit(payload)
+
+        try:
+            session = self._get_session()
+            async with self._semaphore:
+                async with session.post(
+                    f"{self.base_url}/v1/memories",
+                    json=payload,
+                ) as response:
+                    status = response.status
+                    error_text = "" if status in [200, 201] else await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Supermemory API error saving memory: {e}")
+            return False
+
+        if status not in [200, 201]:
+            logger.warning(f"⚠️ Supermemory API returned {status}: {error_text}")
+            return False
+        return True
+
+    async def _post_batch(self, payloads: List[Dict[str, Any]]) -> List[bool]:
+        """
+        Send many memories in one bulk request
+
+        Returns:
+            Success flag per payload, in order
+        """
+        try:
+            session = self._get_session()
+            async with self._semaphore:
+                async with session.post(
+                    f"{self.base_url}/v1/memories/batch",
+                    json={"memories": payloads},
+                ) as response:
+                    status = response.status
+                    if status in [200, 201, 207]:
+                        result = await response.json(content_type=None)
+                    else:
+                        error_text = await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"❌ Supermemory batch write of {len(payloads)} memories failed: {e}")
+            return [False] * len(payloads)
+
+        if status not in [200, 201, 207]:
+            logger.warning(f"⚠️ Supermemory batch API returned {status}: {error_text}")
+            return [False] * len(payloads)
+
+        # Per-item results when the API reports them, otherwise the whole batch succeeded
+        items = result.get("results") if isinstance(result, dict) else result
+        if not isinstance(items, list):
+            return [True] * len(payloads)
+
+        outcomes = []
+        for item in items:
+            if isinstance(item, dict):
+                item_status = item.get("status")
+                ok = item.get("success", item_status in (None, 200, 201) and not item.get("error"))
+            else:
+                ok = bool(item)
+            outcomes.append(bool(ok))
+        logger.info(
+            f"✅ Supermemory: Batch wrote {sum(outcomes)}/{len(payloads)} memories"
+        )
+        return outcomes
 
 
 # Initialize manager
+def _is_call_record(memory: Any) -> bool:
+    tags = memory.get("tags") if isinstance(memory, dict) else None
+    if isinstance(tags, str):
+        tags = [tags]
+    return CALL_METADATA_TAG in (tags or ())
+
+
 def init_memory_manager() -> Optional[MemoryManager]:
     """Create MemoryManager from environment variables"""
-    api_key = os.getenv("SUPERMEMORY_API_KEY")
-    base_url = os.getenv(
-        "SUPERMEMORY_BASE_URL", "https://api.supermemory.ai"
-    )
-
-    if not api_key:
+    config = SuprememoryConfig.from_env()
+    if not config.api_key:
         logger.warning("SUPERMEMORY_API_KEY not set, memory features disabled")
         return None
 
-    return MemoryManager(api_key=api_key, base_url=base_url)
+    # Context cache (SUPERMEMORY_CACHE_TTL=0 disables it)
+    cache_ttl = float(os.getenv("SUPERMEMORY_CACHE_TTL", "300"))
+    cache = None
+    if cache_ttl > 0:
+        cache = MemoryContextCache(
+            ttl_seconds=cache_ttl,
+            max_entries=int(os.getenv("SUPERMEMORY_CACHE_MAX_ENTRIES", "1000")),
+            max_bytes=int(os.getenv("SUPERMEMORY_CACHE_MAX_BYTES", str(8 * 1024 * 1024))),
+        )
+
+    # Local SQLite mirror (SUPERMEMORY_MIRROR_PATH empty disables it)
+    mirror_path = os.getenv("SUPERMEMORY_MIRROR_PATH", "/tmp/youplus-memory-mirror.db")
+    mirror = None
+    if mirror_path:
+        mirror = MemoryMirror(
+            path=mirror_path,
+            max_per_user=int(os.getenv("SUPERMEMORY_MIRROR_MAX_PER_USER", "200")),
+        )
+
+    return MemoryManager(
+        api_key=config.api_key,
+        base_url=config.base_url,
+        timeout=config.timeout,
+        max_connections=config.max_connections,
+        max_concurrency=config.max_concurrency,
+        cache=cache,
+        batch_size=int(os.getenv("SUPERMEMORY_BATCH_SIZE", "1")),
+        batch_window=float(os.getenv("SUPERMEMORY_BATCH_WINDOW_MS", "250")) / 1000,
+        mirror=mirror,
+        mirror_sync_interval=float(os.getenv("SUPERMEMORY_MIRROR_SYNC_INTERVAL", "60")),
+        hedging=os.getenv("SUPERMEMORY_HEDGING", "true").lower() == "true",
+        min_read_deadline=float(os.getenv("SUPERMEMORY_MIN_READ_DEADLINE", "0.3")),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("SUPERMEMORY_BREAKER_FAILURES", "5")),
+            reset_timeout=float(os.getenv("SUPERMEMORY_BREAKER_RESET", "30")),
+        ),
+    )
@@ -0,0 +1,110 @@
+"""
+Write batching for Supermemory
+Coalesces memory writes from many calls into bulk requests flushed by size or time window
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sends one batch, returns a success flag per item (same order)
+FlushFn = Callable[[List[Dict[str, Any]]], Awaitable[List[bool]]]
+
+
+class WriteBatcher:
+    """
+    Buffers items and flushes them together
+
+    A batch is sent as soon as it reaches `max_batch_size` items, or
+    `max_delay` seconds after its first item arrived. Each `submit` call
+    resolves with that item's own result from the bulk response.
+    """
+
+    def __init__(
+        self,
+        flush_fn: FlushFn,
+        max_batch_size: int = 50,
+        max_delay: float = 0.25,
+    ):
+        self.flush_fn = flush_fn
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        self._buffer: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+
+        self.batches = 0
+        self.items = 0
+        self.failed_items = 0
+        self.last_batch_size = 0
+        self.max_seen_batch_size = 0
+
+    async def submit(self, item: Dict[str, Any]) -> bool:
+        """Queue an item for the next batch and wait for its result"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buffer.append((item, future))
+
+        if len(self._buffer) >= self.max_batch_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush_now)
+
+        return await future
+
+    async def flush(self) -> None:
+        """Send whatever is buffered and wait for all in-flight batches"""
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counters for logging/metrics"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "failed_items": self.failed_items,
+            "buffered": len(self._buffer),
+            "last_batch_size": self.last_batch_size,
+            "max_batch_size_seen": self.max_seen_batch_size,
+            "avg_batch_size": (self.items / self.batches) if self.batches else 0.0,
+        }
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+        try:
+            results = await self.flush_fn(items)
+            if len(results) != len(items):
+                logger.warning(
+                    f"⚠️ Batch returned {len(results)} results for {len(items)} items"
+                )
+                results = list(results) + [False] * (len(items) - len(results))
+        except Exception as e:
+            logger.error(f"❌ Batch write of {len(items)} items failed: {e}")
+            results = [False] * len(items)
+
+        self.batches += 1
+        self.items += len(items)
+        self.last_batch_size = len(items)
+        self.max_seen_batch_size = max(self.max_seen_batch_size, len(items))
+
+        for (_, future), ok in zip(batch, results):
+            if not ok:
+                self.failed_items += 1
+            if not future.done():
+                future.set_result(bool(ok))
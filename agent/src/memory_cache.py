@@ -0,0 +1,135 @@
+"""
+In-process cache for Supermemory call context
+LRU + TTL eviction bounded by entry count and an approximate memory budget
+"""
+
+import json
+import time
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Set
+
+logger = logging.getLogger(__name__)
+
+# (supermemory_user_id, mood, max_memories)
+CacheKey = Tuple[str, str, int]
+
+
+class MemoryContextCache:
+    """LRU/TTL cache of `get_context_for_call` results, invalidated per user on writes"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        max_entries: int = 1000,
+        max_bytes: int = 8 * 1024 * 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # key -> (expires_at, size_bytes, context)
+        self._entries: "OrderedDict[CacheKey, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[CacheKey]] = {}
+        # Bumped on every invalidation so a fetch that started before a write
+        # cannot repopulate the cache with pre-write context
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self, user_id: str) -> int:
+        """Current write generation for a user (pass back to `put`)"""
+        return self._generations.get(user_id, 0)
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Return a cached context, or None if missing/expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, _, context = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return dict(context)
+
+    def put(
+        self,
+        key: CacheKey,
+        context: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a context; skipped if the user was written to since `generation`"""
+        user_id = key[0]
+        if generation is not None and generation != self.generation(user_id):
+            return
+
+        size = self._estimate_size(context)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, size, dict(context))
+        self._keys_by_user.setdefault(user_id, set()).add(key)
+        self._bytes += size
+
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_user(self, user_id: str) -> int:
+        """Drop every cached context for a user, returns number of entries removed"""
+        self._generations[user_id] = self.generation(user_id) + 1
+        keys = self._keys_by_user.pop(user_id, set())
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+        if keys:
+            self.invalidations += 1
+            logger.debug(f"Invalidated {len(keys)} cached contexts for user {user_id}")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters for logging/metrics"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry[1]
+        user_keys = self._keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[key[0]]
+
+    @staticmethod
+    def _estimate_size(context: Dict[str, Any]) -> int:
+        """Approximate footprint from the raw memories (derived lists share their strings)"""
+        try:
+            return len(json.dumps(context.get("raw_memories", []), default=str)) + 256
+        except (TypeError, ValueError):
+            return 4096
@@ -0,0 +1,89 @@
+"""
+Tag index for Supermemory responses
+Buckets memories by tag in one pass so any tag query is a lookup instead of a full scan
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryTagIndex:
+    """
+    tag -> positions of the memories carrying it, built once per response
+
+    Results keep the response order. Tags match exactly, as a membership
+    test on the memory's tag list would; a single string `tags` value is
+    one tag.
+    """
+
+    __slots__ = ("memories", "_buckets")
+
+    def __init__(self, memories: List[Dict[str, Any]]):
+        self.memories = memories
+        self._buckets: Dict[str, List[int]] = {}
+        for position, memory in enumerate(memories):
+            tags = memory.get("tags") or ()
+            if isinstance(tags, str):
+                tags = [tags]
+            for tag in {tag for tag in tags if isinstance(tag, str)}:
+                self._buckets.setdefault(tag, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.memories)
+
+    def __contains__(self, tag: str) -> bool:
+        return tag in self._buckets
+
+    def tags(self) -> Dict[str, int]:
+        """Every tag with its memory count"""
+        return {tag: len(positions) for tag, positions in self._buckets.items()}
+
+    def positions(self, tag: str) -> List[int]:
+        """Response positions of the memories tagged with `tag`"""
+        return list(self._buckets.get(tag, ()))
+
+    def get(self, tag: str) -> List[Dict[str, Any]]:
+        """Memories tagged with `tag`"""
+        return [self.memories[position] for position in self._buckets.get(tag, ())]
+
+    def contents(self, tag: str) -> List[str]:
+        """Content of the memories tagged with `tag`"""
+        return [memory.get("content", "") for memory in self.get(tag)]
+
+    def query(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = (),
+    ) -> List[Dict[str, Any]]:
+        """
+        Memories matching a tag expression
+
+        Args:
+            all_of: Tags every result must carry
+            any_of: Results must carry at least one of these (ignored if empty)
+            none_of: Tags excluded from the results
+
+        Returns:
+            Matching memories in response order
+        """
+        selected: Optional[Set[int]] = None
+        for tag in all_of:
+            positions = set(self._buckets.get(tag, ()))
+            selected = positions if selected is None else selected & positions
+
+        any_tags = list(any_of)
+        if any_tags:
+            union: Set[int] = set()
+            for tag in any_tags:
+                union.update(self._buckets.get(tag, ()))
+            selected = union if selected is None else selected & union
+
+        if selected is None:
+            selected = set(range(len(self.memories)))
+        for tag in none_of:
+            selected.difference_update(self._buckets.get(tag, ()))
+
+        return [self.memories[position] for position in sorted(selected)]
@@ -0,0 +1,270 @@
+"""
+Local persistent mirror of Supermemory memories
+SQLite store of each user's recent memories, read before the remote API and kept in sync in the background
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from memory_ranking import memory_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Bumped when rows written by an older version can no longer be read correctly;
+# the mirror is a cache, so an outdated file is emptied and refilled by syncs
+_SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    user_id TEXT NOT NULL,
+    memory_key TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    offline_only INTEGER NOT NULL DEFAULT 0,
+    remote INTEGER NOT NULL DEFAULT 0,
+    written_at REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, memory_key)
+);
+CREATE INDEX IF NOT EXISTS memories_recent ON memories (user_id, created_at DESC);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+def memory_key(memory: Dict[str, Any]) -> str:
+    """
+    Hash of a memory's content
+
+    Never the remote id: a local write-through has none, and keying both
+    copies by content is what lets the synced copy replace the local one.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((memory.get("content") or "").encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Insight categories (see insights.py) and the tag memory_ranking selects each by
+_INSIGHT_TAGS = (("promises_made", "promise"), ("goals_mentioned", "goal"), ("progress_noted", "progress"))
+
+
+def insight_memories(
+    insights: Dict[str, Any],
+    mood: str,
+    metadata: Dict[str, Any],
+    per_category: int = 3,
+) -> List[Dict[str, Any]]:
+    """One memory per promise/goal/progress the caller stated in a call, tagged for memory_ranking"""
+    memories = []
+    for category, tag in _INSIGHT_TAGS:
+        for line in (insights.get(category) or [])[:per_category]:
+            # Insight lines are transcript lines ("user: I will run tomorrow")
+            speaker, separator, text = line.partition(": ")
+            if not separator:
+                speaker, text = "user", line
+            if speaker == "user" and text.strip():
+                memories.append({"content": text.strip(), "tags": [tag, mood], "metadata": dict(metadata)})
+    return memories
+
+
+class MemoryMirror:
+    """
+    On-disk copy of each user's most recent memories
+
+    All SQLite work runs on one dedicated thread so the event loop never
+    blocks on disk. WAL mode lets several worker processes share one file.
+    Rows are keyed by content: a local write-through and the copy a later
+    sync brings back are the same row. A sync replaces the user's view
+    with the remote snapshot: rows from an earlier snapshot that it no
+    longer has (deleted or edited remotely) are removed, and so are
+    write-throughs that a whole sync interval later still have not shown
+    up. Offline-only rows (`add_offline`) never come back from the remote
+    API and are only served by the fallback read used when it is down.
+    """
+
+    def __init__(self, path: str, max_per_user: int = 200):
+        self.path = path
+        self.max_per_user = max_per_user
+        self._conn: Optional[sqlite3.Connection] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-mirror")
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.syncs = 0
+        self.errors = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(
+        self,
+        user_id: str,
+        limit: int,
+        synced_only: bool = True,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Most recent memories for a user, newest first
+
+        Args:
+            user_id: Supermemory user id
+            limit: Max memories to return
+            synced_only: Only answer for users synced from the remote API at
+                least once (local write-throughs alone are a partial view)
+
+        Returns:
+            None if the user is not mirrored (or the mirror failed)
+        """
+        memories = await self._run(self._get, user_id, limit, synced_only)
+        if memories is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return memories
+
+    async def add(self, user_id: str, memory: Dict[str, Any]) -> None:
+        """Write-through of a memory just saved (or queued) remotely"""
+        if await self._run(self._upsert, user_id, [memory], False) is not None:
+            self.writes += 1
+
+    async def add_offline(self, user_id: str, memories: List[Dict[str, Any]]) -> None:
+        """Memories for the offline fallback only (e.g. a call's promises, before the remote API has them)"""
+        if memories and await self._run(self._upsert, user_id, memories, False, True) is not None:
+            self.writes += len(memories)
+
+    async def replace(self, user_id: str, memories: List[Dict[str, Any]]) -> None:
+        """Replace the user's synced rows with a fresh remote snapshot and mark the user as synced"""
+        if await self._run(self._upsert, user_id, memories, True) is not None:
+            self.syncs += 1
+
+    async def synced_at(self, user_id: str) -> Optional[float]:
+        """Wall-clock time of the last remote sync for a user"""
+        return await self._run(self._synced_at, user_id)
+
+    async def aclose(self) -> None:
+        await self._run(self._close)
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Mirror counters for logging/metrics"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "syncs": self.syncs,
+            "errors": self.errors,
+        }
+
+    # ------------------------------------------------------------------
+    # SQLite (mirror thread only)
+    # ------------------------------------------------------------------
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.error(f"❌ Memory mirror error: {e}")
+            return None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                # Older rows are keyed by remote id and would never merge with local writes
+                conn.executescript("DROP TABLE IF EXISTS memories; DROP TABLE IF EXISTS users;")
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _get(self, user_id: str, limit: int, synced_only: bool) -> Optional[List[Dict[str, Any]]]:
+        conn = self._connection()
+        synced = conn.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,)).fetchone()
+        if synced_only and not synced:
+            return None
+        # Offline-only rows are not part of what the remote API returns
+        rows = conn.execute(
+            "SELECT data FROM memories WHERE user_id = ? AND offline_only <= ? "
+            "ORDER BY created_at DESC LIMIT ?",
+            (user_id, 0 if synced_only else 1, limit),
+        ).fetchall()
+        if not rows and not synced:
+            return None
+        return [json.loads(data) for (data,) in rows]
+
+    def _upsert(
+        self,
+        user_id: str,
+        memories: List[Dict[str, Any]],
+        synced: bool,
+        offline_only: bool = False,
+    ) -> bool:
+        conn = self._connection()
+        now = time.time()
+        rows = []
+        for index, memory in enumerate(memories):
+            created = memory_timestamp(memory)
+            # Undated memories: now, keeping the response's newest-first order
+            created_at = created.timestamp() if created else now - index * 1e-6
+            rows.append((
+                user_id, memory_key(memory), created_at, json.dumps(memory, default=str),
+                int(offline_only), int(synced), now,
+            ))
+        with conn:
+            if synced:
+                # Rows the snapshot no longer has: from an earlier snapshot, or
+                # written through before the previous sync and never confirmed
+                previous_sync = self._synced_at(user_id) or 0.0
+                snapshot_keys = {row[1] for row in rows}
+                stale = [
+                    (user_id, key)
+                    for (key,) in conn.execute(
+                        "SELECT memory_key FROM memories WHERE user_id = ? AND offline_only = 0 "
+                        "AND (remote = 1 OR written_at < ?)",
+                        (user_id, previous_sync),
+                    )
+                    if key not in snapshot_keys
+                ]
+                conn.executemany("DELETE FROM memories WHERE user_id = ? AND memory_key = ?", stale)
+            conn.executemany(
+                "INSERT OR REPLACE INTO memories "
+                "(user_id, memory_key, created_at, data, offline_only, remote, written_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if synced:
+                conn.execute(
+                    "INSERT OR REPLACE INTO users (user_id, synced_at) VALUES (?, ?)",
+                    (user_id, now),
+                )
+            conn.execute(
+                "DELETE FROM memories WHERE user_id = ? AND memory_key NOT IN ("
+                "SELECT memory_key FROM memories WHERE user_id = ? "
+                "ORDER BY created_at DESC LIMIT ?)",
+                (user_id, user_id, self.max_per_user),
+            )
+        return True
+
+    def _synced_at(self, user_id: str) -> Optional[float]:
+        row = self._connection().execute(
+            "SELECT synced_at FROM users WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
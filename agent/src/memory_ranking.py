@@ -0,0 +1,182 @@
+"""
+Memory ranking for You+ Agent prompts
+Scores raw Supermemory memories by recency, mood tag match and duplication, then packs a token budget
+"""
+
+import os
+import re
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from prompts import estimate_tokens
+from memory_index import MemoryTagIndex
+
+logger = logging.getLogger(__name__)
+
+# Token budget for injected memories (shared by all memory categories)
+MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "250"))
+
+# Prompt categories and the memory tag that selects each, in priority order
+CATEGORY_TAGS: List[Tuple[str, str]] = [
+    ("promises", "promise"),
+    ("goals", "goal"),
+    ("progress", "progress"),
+]
+
+RECENCY_HALF_LIFE_DAYS = 7.0
+RECENCY_WEIGHT = 1.0
+MOOD_MATCH_WEIGHT = 0.5
+# Token-set overlap above which a memory counts as a near-duplicate of one already picked
+DUPLICATE_SIMILARITY = 0.8
+
+_TIMESTAMP_FIELDS = ("created_at", "createdAt", "updated_at", "updatedAt", "timestamp")
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def memory_timestamp(memory: Dict[str, Any]) -> Optional[datetime]:
+    """Best-effort creation time of a memory (top-level fields, then metadata)"""
+    sources = (memory, memory.get("metadata") or {})
+    for source in sources:
+        for field in _TIMESTAMP_FIELDS:
+            value = source.get(field)
+            if not value:
+                continue
+            try:
+                if isinstance(value, (int, float)):
+                    # Seconds or milliseconds since epoch
+                    seconds = value / 1000 if value > 1e11 else value
+                    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+                parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+                return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+            except (ValueError, OverflowError, OSError):
+                continue
+    return None
+
+
+def _words(text: str) -> Set[str]:
+    return set(_WORD.findall(text.lower()))
+
+
+def _similarity(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class RankedMemory:
+    """A memory's prompt category, text, score and token cost"""
+
+    __slots__ = ("category", "content", "score", "tokens", "words")
+
+    def __init__(self, category: str, content: str, score: float):
+        self.category = category
+        self.content = content
+        self.score = score
+        self.tokens = estimate_tokens(f"- {content}\n")
+        self.words = _words(content)
+
+
+def rank_memories(
+    memories: List[Dict[str, Any]],
+    mood: Optional[str] = None,
+    now: Optional[datetime] = None,
+    index: Optional[MemoryTagIndex] = None,
+) -> List[RankedMemory]:
+    """
+    Score promise/goal/progress memories, best first
+
+    Score = recency (exponential decay, 1.0 for brand new) + a bonus when the
+    memory is tagged with the call's mood. Memories without a timestamp are
+    assumed to be as recent as their position in the API response suggests.
+    Candidates come from the response's tag index (built here if not given).
+    """
+    now = now or datetime.now(timezone.utc)
+    index = index or MemoryTagIndex(memories)
+    mood_positions = set(index.positions(mood)) if mood else set()
+    seen: Set[int] = set()
+    ranked: List[RankedMemory] = []
+
+    for category, tag in CATEGORY_TAGS:
+        for position in index.positions(tag):
+            # A memory with several category tags goes to the first category
+            if position in seen:
+                continue
+            seen.add(position)
+            memory = index.memories[position]
+            content = (memory.get("content") or "").strip()
+            if not content:
+                continue
+
+            created = memory_timestamp(memory)
+            if created is not None:
+                age_days = max(0.0, (now - created).total_seconds() / 86400)
+                recency = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+            else:
+                recency = 1.0 / (1 + position)
+
+            score = RECENCY_WEIGHT * recency
+            if position in mood_positions:
+                score += MOOD_MATCH_WEIGHT
+            ranked.append(RankedMemory(category, content, score))
+
+    ranked.sort(key=lambda item: item.score, reverse=True)
+    return ranked
+
+
+def pack_memories(
+    ranked: List[RankedMemory],
+    token_budget: int = MEMORY_TOKEN_BUDGET,
+) -> Dict[str, List[str]]:
+    """
+    Greedily take the highest-scoring memories that fit the budget
+
+    Exact and near-duplicate memories (token-set Jaccard similarity above
+    DUPLICATE_SIMILARITY) of an already picked memory are skipped.
+    """
+    packed: Dict[str, List[str]] = {category: [] for category, _ in CATEGORY_TAGS}
+    picked: List[RankedMemory] = []
+    remaining = token_budget
+
+    for item in ranked:
+        if item.tokens > remaining:
+            continue
+        if any(_similarity(item.words, other.words) >= DUPLICATE_SIMILARITY for other in picked):
+            continue
+        picked.append(item)
+        packed[item.category].append(item.content)
+        remaining -= item.tokens
+        if remaining <= 0:
+            break
+
+    return packed
+
+
+def rank_context(
+    context: Dict[str, Any],
+    mood: Optional[str] = None,
+    token_budget: int = MEMORY_TOKEN_BUDGET,
+) -> Dict[str, List[str]]:
+    """
+    Promises/goals/progress for the prompt, ranked and packed from raw memories
+
+    Contexts without raw memories are packed from their existing lists,
+    earlier entries first.
+    """
+    raw_memories = context.get("raw_memories")
+    if raw_memories:
+        ranked = rank_memories(raw_memories, mood, index=context.get("tag_index"))
+    else:
+        ranked = [
+            RankedMemory(category, content, 1.0 / (1 + index))
+            for category, _ in CATEGORY_TAGS
+            for index, content in enumerate(context.get(category) or ())
+            if content
+        ]
+        ranked.sort(key=lambda item: item.score, reverse=True)
+    packed = pack_memories(ranked, token_budget)
+    logger.debug(
+        f"Packed {sum(len(items) for items in packed.values())}/{len(ranked)} "
+        f"memories into {token_budget} tokens"
+    )
+    return packed
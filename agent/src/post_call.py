@@ -6,7 +6,8 @@ Extracts insights and updates Supermemory after call ends
 import logging
 from typing import Optional, Dict, Any
 from datetime import datetime
-from .memory import MemoryManager
+from memory import MemoryManager
+from insights import extract_insights
 
 logger = logging.getLogger(__name__)
 
@@ -39,28 +40,17 @@ class PostCallProcessor:
         logger.info(f"Processing transcript for call {call_uuid}")
 
         try:
-            # Extract key information from transcript
-            insights = {
-                "promises_made": self._extract_promises(transcript),
-                "goals_mentioned": self._extract_goals(transcript),
-                "blockers_identified": self._extract_blockers(transcript),
-                "progress_noted": self._extract_progress(transcript),
-                "sentiment": self._analyze_sentiment(transcript),
-            }
+            # Extract key information from transcript (single pass over all lines)
+            insights = extract_insights(transcript)
 
             # Save to Supermemory if available
-            if self.memory_manager:
-                memory_payload = {
-                    "content": f"Call Summary ({mood}): {self._summarize_transcript(transcript)}",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "mood": mood,
-                    "insights": insights,
-                }
-                await self.memory_manager.save_call_memory(
-                    user_id=user_id,
-                    call_uuid=call_uuid,
-                    memory_data=memory_payload,
-                )
+            await self.save_call_summary(
+                user_id=user_id,
+                call_uuid=call_uuid,
+                transcript=transcript,
+                mood=mood,
+                insights=insights,
+            )
 
             return insights
 
@@ -75,6 +65,39 @@ class PostCallProcessor:
                 "error": str(e),
             }
 
+    async def save_call_summary(
+        self,
+        user_id: str,
+        call_uuid: str,
+        transcript: str,
+        mood: str,
+        insights: Dict[str, Any],
+        timestamp: Optional[str] = None,
+    ) -> bool:
+        """
+        Save the call summary and insights to Supermemory
+
+        Args:
+            timestamp: When the call ended (ISO 8601); retries pass the same one
+
+        Returns:
+            True if saved (or Supermemory is not configured), False to retry
+        """
+        if not self.memory_manager:
+            return True
+
+        memory_payload = {
+            "content": f"Call Summary ({mood}): {self._summarize_transcript(transcript)}",
+            "timestamp": timestamp or datetime.utcnow().isoformat(),
+            "mood": mood,
+            "insights": insights,
+        }
+        return await self.memory_manager.save_call_memory(
+            user_id=user_id,
+            call_uuid=call_uuid,
+            memory_data=memory_payload,
+        )
+
     async def store_call_metadata(
         self,
         user_id: str,
@@ -94,12 +117,13 @@ class PostCallProcessor:
         """
         logger.info(f"Storing metadata for call {call_uuid}")
 
-        # This would be sent to Cloudflare Workers webhook
-        # Example payload:
+        # Recorded in Supermemory next to the call memory (bulk-written with
+        # other calls' writes when batching is enabled)
         payload = {
             "user_id": user_id,
             "call_uuid": call_uuid,
-            "timestamp": datetime.utcnow().isoformat(),
+            # When the call ended, so retries write the same record
+            "timestamp": metadata.get("ended_at") or datetime.utcnow().isoformat(),
             "duration_seconds": metadata.get("duration_seconds"),
             "mood": metadata.get("mood"),
             "completion_status": metadata.get("completion_status", "completed"),
@@ -107,108 +131,14 @@ class PostCallProcessor:
         }
 
         logger.debug(f"Call metadata: {payload}")
-        return True
 
-    @staticmethod
-    def _extract_promises(transcript: str) -> list:
-        """Extract promises/commitments from transcript"""
-        # TODO: Use LLM to intelligently extract promises
-        # For now, look for keywords
-        keywords = ["i promise", "i will", "i commit", "i'll", "i'm going to"]
-        promises = []
-
-        for line in transcript.split("\n"):
-            for keyword in keywords:
-                if keyword.lower() in line.lower():
-                    promises.append(line.strip())
-                    break
-
-        return promises
-
-    @staticmethod
-    def _extract_goals(transcript: str) -> list:
-        """Extract goals from transcript"""
-        keywords = ["goal", "want to", "plan to", "aim for", "target"]
-        goals = []
-
-        for line in transcript.split("\n"):
-            for keyword in keywords:
-                if keyword.lower() in line.lower():
-                    goals.append(line.strip())
-                    break
-
-        return goals
-
-    @staticmethod
-    def _extract_blockers(transcript: str) -> list:
-        """Extract identified blockers/challenges"""
-        keywords = [
-            "struggle",
-            "challenge",
-            "problem",
-            "issue",
-            "difficult",
-            "can't",
-            "can't",
-        ]
-        blockers = []
-
-        for line in transcript.split("\n"):
-            for keyword in keywords:
-                if keyword.lower() in line.lower():
-                    blockers.append(line.strip())
-                    break
-
-        return blockers
-
-    @staticmethod
-    def _extract_progress(transcript: str) -> list:
-        """Extract progress updates"""
-        keywords = [
-            "progress",
-            "improved",
-            "better",
-            "achieved",
-            "completed",
-            "finished",
-        ]
-        progress = []
-
-        for line in transcript.split("\n"):
-            for keyword in keywords:
-                if keyword.lower() in line.lower():
-                    progress.append(line.strip())
-                    break
-
-        return progress
-
-    @staticmethod
-    def _analyze_sentiment(transcript: str) -> str:
-        """Analyze overall sentiment of call"""
-        # TODO: Use LLM or sentiment analysis library
-        # For now, simple heuristic
-        positive_words = [
-            "good",
-            "great",
-            "excellent",
-            "happy",
-            "positive",
-        ]
-        negative_words = ["bad", "sad", "worried", "anxious", "frustrated"]
-
-        positive_count = sum(
-            1 for word in positive_words if word in transcript.lower()
-        )
-        negative_count = sum(
-            1 for word in negative_words if word in transcript.lower()
-        )
-
-        if positive_count > negative_count:
-            return "positive"
-        elif negative_count > positive_count:
-            return "negative"
-        else:
-            return "neutral"
+        if self.memory_manager:
+            return await self.memory_manager.save_call_metadata(
+                user_id=user_id,
+                call_uuid=call_uuid,
+                metadata=payload,
+            )
+        return True
 
     @staticmethod
     def _summarize_transcript(transcript: str, max_length: int = 200) -> str:
@@ -0,0 +1,339 @@
+"""
+Background post-call work queue for You+ Agent
+Bounded async queue with retries, backoff and a durable JSONL spool per worker process
+"""
+
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Handler returns True when the job is fully persisted, False (or raises) to retry.
+# It may record progress in the payload (e.g. steps already done); retries and
+# replays get the payload as it was left.
+JobHandler = Callable[[Dict[str, Any]], Awaitable[bool]]
+
+
+class PostCallQueue:
+    """
+    Runs post-call jobs off the call lifecycle
+
+    Every accepted job is appended to this process's spool file before the
+    call returns, an `update` record after each failed attempt (carrying
+    the handler's progress), and a `done` record once it succeeds or is
+    dropped. On start, spools left behind by dead worker processes are
+    claimed and their unfinished jobs replayed.
+    """
+
+    def __init__(
+        self,
+        handler: JobHandler,
+        spool_dir: Optional[str] = None,
+        max_size: int = 1000,
+        workers: int = 2,
+        max_attempts: int = 5,
+        base_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+    ):
+        self.handler = handler
+        self.spool_dir = spool_dir
+        self.max_size = max_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._retry_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._spool_path: Optional[str] = None
+        self._done_since_compact = 0
+        # Single thread keeps spool writes ordered and off the event loop
+        self._spool_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="post-call-spool")
+
+        self.submitted = 0
+        self.completed = 0
+        self.retried = 0
+        self.dropped = 0
+        self.replayed = 0
+        self._drain_latencies_ms: Deque[float] = deque(maxlen=512)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Start workers and replay unfinished spooled jobs (idempotent)"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self._queue is not None:
+                return
+
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            if self.spool_dir:
+                os.makedirs(self.spool_dir, exist_ok=True)
+                self._spool_path = os.path.join(self.spool_dir, f"post_call-{os.getpid()}.jsonl")
+                recovered = await self._spool(self._claim_orphaned_spools)
+                for job in recovered:
+                    self._pending[job["id"]] = job
+                await self._spool(self._compact, [_encode_add(job) for job in recovered])
+                for job in recovered:
+                    self._enqueue(job)
+                if recovered:
+                    self.replayed += len(recovered)
+                    logger.info(f"♻️ Replaying {len(recovered)} spooled post-call jobs")
+
+            self._tasks = [
+                asyncio.create_task(self._worker(index)) for index in range(self.workers)
+            ]
+
+    async def submit(self, payload: Dict[str, Any]) -> bool:
+        """
+        Spool and enqueue a job without waiting for it to run
+
+        Returns:
+            True if accepted, False if the queue was full and the job dropped
+        """
+        await self.start()
+
+        if self._queue.full():
+            self.dropped += 1
+            logger.error(
+                f"❌ Post-call queue full ({self.max_size}), dropping job "
+                f"for call {payload.get('call_uuid', 'unknown')}"
+            )
+            return False
+
+        job = {
+            "id": uuid.uuid4().hex,
+            "payload": payload,
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        }
+        self._pending[job["id"]] = job
+        if self._spool_path:
+            await self._spool(self._append, _encode_add(job))
+
+        self.submitted += 1
+        self._enqueue(job)
+        return True
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every pending job has finished, returns False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def aclose(self) -> None:
+        """Stop workers; unfinished jobs stay in the spool for the next process"""
+        for handle in self._retry_handles.values():
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        # Let queued spool writes land before the process goes away
+        await self._spool(lambda: None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, drain latency and outcome counters"""
+        latencies = sorted(self._drain_latencies_ms)
+
+        def pct(value: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(value * (len(latencies) - 1)))]
+
+        return {
+            "depth": self._queue.qsize() if self._queue else 0,
+            "pending": len(self._pending),
+            "waiting_retry": len(self._retry_handles),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "replayed": self.replayed,
+            "drain_latency_ms_p50": pct(0.5),
+            "drain_latency_ms_p95": pct(0.95),
+        }
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, job: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._finish(job, status="dropped")
+            logger.error(f"❌ Post-call queue full, dropped job {job['id']}")
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job["attempts"] += 1
+        try:
+            succeeded = await self.handler(job["payload"])
+        except Exception as e:
+            logger.error(f"❌ Post-call job {job['id']} failed: {e}")
+            succeeded = False
+
+        if succeeded:
+            self._finish(job, status="ok")
+            return
+
+        if job["attempts"] >= self.max_attempts:
+            self._finish(job, status="dropped")
+            logger.error(
+                f"❌ Post-call job {job['id']} dropped after {job['attempts']} attempts"
+            )
+            return
+
+        if self._spool_path:
+            # A replay after a crash resumes from the progress made so far
+            await self._spool(self._append, _encode({"op": "update", "job": job}))
+
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (job["attempts"] - 1))
+        delay *= random.uniform(0.5, 1.0)
+        self.retried += 1
+        logger.warning(
+            f"⚠️ Post-call job {job['id']} attempt {job['attempts']} failed, "
+            f"retrying in {delay:.1f}s"
+        )
+        loop = asyncio.get_running_loop()
+        self._retry_handles[job["id"]] = loop.call_later(delay, self._retry, job)
+
+    def _retry(self, job: Dict[str, Any]) -> None:
+        self._retry_handles.pop(job["id"], None)
+        if self._queue is not None:
+            self._enqueue(job)
+
+    def _finish(self, job: Dict[str, Any], status: str) -> None:
+        self._pending.pop(job["id"], None)
+        if status == "ok":
+            self.completed += 1
+            self._drain_latencies_ms.append((time.time() - job["enqueued_at"]) * 1000)
+        else:
+            self.dropped += 1
+
+        if self._spool_path:
+            loop = asyncio.get_running_loop()
+            record = _encode({"op": "done", "id": job["id"], "status": status})
+            loop.run_in_executor(self._spool_executor, self._append, record)
+            self._done_since_compact += 1
+            if not self._pending or self._done_since_compact >= 100:
+                snapshot = [_encode_add(pending) for pending in self._pending.values()]
+                loop.run_in_executor(self._spool_executor, self._compact, snapshot)
+                self._done_since_compact = 0
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    async def _spool(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._spool_executor, fn, *args)
+
+    def _append(self, line: str) -> None:
+        with open(self._spool_path, "a", encoding="utf-8") as spool:
+            spool.write(line)
+            spool.flush()
+            os.fsync(spool.fileno())
+
+    def _compact(self, pending: List[str]) -> None:
+        """Rewrite this process's spool with only the still-pending jobs"""
+        tmp_path = f"{self._spool_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as spool:
+            for line in pending:
+                spool.write(line)
+            spool.flush()
+            os.fsync(spool.fileno())
+        os.replace(tmp_path, self._spool_path)
+
+    def _claim_orphaned_spools(self) -> List[Dict[str, Any]]:
+        """Take over spools whose owning process is gone, return their unfinished jobs"""
+        recovered: Dict[str, Dict[str, Any]] = {}
+        own_name = os.path.basename(self._spool_path)
+
+        for name in sorted(os.listdir(self.spool_dir)):
+            if not name.startswith("post_call-") or not name.endswith(".jsonl"):
+                continue
+            path = os.path.join(self.spool_dir, name)
+            if name != own_name:
+                owner = name[len("post_call-"):-len(".jsonl")]
+                if not owner.isdigit() or _process_alive(int(owner)):
+                    continue
+                claimed = os.path.join(self.spool_dir, f"claimed-{os.getpid()}-{name}")
+                try:
+                    os.rename(path, claimed)
+                except FileNotFoundError:
+                    # Another worker claimed it first
+                    continue
+                path = claimed
+
+            recovered.update(_read_pending(path))
+            if path != self._spool_path:
+                os.remove(path)
+
+        return list(recovered.values())
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    # Serialized on the event loop: handlers mutate job payloads while the
+    # spool thread writes, so the thread only ever sees finished lines
+    return json.dumps(record, default=str) + "\n"
+
+
+def _encode_add(job: Dict[str, Any]) -> str:
+    return _encode({"op": "add", "job": job})
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read_pending(path: str) -> Dict[str, Dict[str, Any]]:
+    """Replay a spool file: jobs added and never marked done"""
+    pending: Dict[str, Dict[str, Any]] = {}
+    with open(path, encoding="utf-8") as spool:
+        for line in spool:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final write from a crash
+                continue
+            if record.get("op") == "add":
+                pending[record["job"]["id"]] = record["job"]
+            elif record.get("op") == "update" and record["job"]["id"] in pending:
+                pending[record["job"]["id"]] = record["job"]
+            elif record.get("op") == "done":
+                pending.pop(record.get("id"), None)
+    return pending
@@ -0,0 +1,189 @@
+"""
+System prompt assembly for You+ Agent
+Static sections are rendered once per process; dynamic memory sections are spliced in
+with a single join and trimmed to a token budget
+"""
+
+import os
+import math
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for the whole system prompt; memory sections are trimmed to fit
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "16000"))
+# Kept for dynamic sections even when the static prefix alone exceeds the budget
+PROMPT_SECTION_RESERVE_TOKENS = int(os.getenv("PROMPT_SECTION_RESERVE_TOKENS", "300"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English prompts)"""
+    return math.ceil(len(text) / 4)
+
+
+class StaticPromptCache:
+    """
+    Renders static prompt text once per key (e.g. mood) and reuses it
+
+    Identical static prefixes across calls also let the LLM provider's
+    prompt caching apply.
+    """
+
+    def __init__(self, render: Callable[[str], str]):
+        self._render = render
+        self._compiled: Dict[str, str] = {}
+
+    def get(self, key: str) -> str:
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._render(key)
+            self._compiled[key] = compiled
+        return compiled
+
+    def precompile(self, keys: Iterable[str]) -> None:
+        """Render every known key up front (called from prewarm)"""
+        for key in keys:
+            self.get(key)
+
+
+class PromptSection:
+    """
+    Dynamic prompt section made of headed groups of bullet items
+
+    Rendered as: header, then per group its heading, "- item" lines and
+    trailer, then the footer.
+    """
+
+    __slots__ = ("header", "groups", "footer")
+
+    def __init__(
+        self,
+        header: str,
+        groups: List[Tuple[str, List[str], str]],
+        footer: str = "",
+    ):
+        self.header = header
+        self.groups = [(heading, list(items), trailer) for heading, items, trailer in groups if items]
+        self.footer = footer
+
+    def parts(self) -> List[str]:
+        parts = [self.header]
+        for heading, items, trailer in self.groups:
+            parts.append(heading)
+            parts.extend(f"- {item}\n" for item in items)
+            if trailer:
+                parts.append(trailer)
+        if self.footer:
+            parts.append(self.footer)
+        return parts
+
+    def render(self) -> str:
+        return "".join(self.parts())
+
+    def item_count(self) -> int:
+        return sum(len(items) for _, items, _ in self.groups)
+
+    def fit(self, token_budget: int) -> bool:
+        """
+        Drop items (last group first, oldest-listed last) until within budget
+
+        Returns:
+            False if even an empty section does not fit or no items remain
+        """
+        while estimate_tokens(self.render()) > token_budget:
+            for index in range(len(self.groups) - 1, -1, -1):
+                heading, items, trailer = self.groups[index]
+                if items:
+                    items.pop()
+                    if not items:
+                        del self.groups[index]
+                    break
+            else:
+                return False
+        return self.item_count() > 0
+
+
+def section_budget(static_prefix: str, token_budget: Optional[int] = None) -> int:
+    """
+    Tokens left for dynamic sections after `static_prefix`
+
+    Never less than PROMPT_SECTION_RESERVE_TOKENS: the backend prompt is not
+    trimmed (cutting instructions is worse than a longer prompt), so an
+    oversized one is logged and the prompt runs over the budget by at most
+    the reserve instead of silently losing the memory context.
+    """
+    budget = PROMPT_TOKEN_BUDGET if token_budget is None else token_budget
+    prefix_tokens = estimate_tokens(static_prefix)
+    remaining = budget - prefix_tokens
+    if remaining < PROMPT_SECTION_RESERVE_TOKENS:
+        logger.warning(
+            f"⚠️ Static prompt is ~{prefix_tokens} tokens, over the {budget}-token budget less the "
+            f"{PROMPT_SECTION_RESERVE_TOKENS}-token section reserve; keeping the reserve for memory context"
+        )
+        remaining = PROMPT_SECTION_RESERVE_TOKENS
+    return remaining
+
+
+def assemble_prompt(
+    static_prefix: str,
+    sections: List[PromptSection],
+    token_budget: Optional[int] = None,
+) -> str:
+    """
+    Static prefix followed by dynamic sections, joined once
+
+    Sections are fitted in order into the budget the prefix leaves (at
+    least the section reserve, see `section_budget`); a section that cannot
+    fit any item is left out, with a warning.
+    """
+    remaining = section_budget(static_prefix, token_budget)
+
+    parts = [static_prefix]
+    for section in sections:
+        if not section.groups:
+            continue
+        if remaining <= 0 or not section.fit(remaining):
+            logger.warning(
+                f"⚠️ Prompt budget reached ({max(remaining, 0)} tokens left), "
+                f"dropped section: {section.header.strip()}"
+            )
+            continue
+        section_parts = section.parts()
+        parts.extend(section_parts)
+        remaining -= estimate_tokens("".join(section_parts))
+
+    return "".join(parts)
+
+
+def supermemory_section(
+    context: Dict[str, List[str]],
+    limits: Optional[Tuple[int, int, int]] = (5, 5, 3),
+) -> PromptSection:
+    """Supermemory context appended to backend-generated prompts (limits=None: no caps)"""
+    promise_limit, goal_limit, progress_limit = limits or (None, None, None)
+    return PromptSection(
+        header="\n\n## 🧠 SUPERMEMORY CONTEXT (Recent Memories)\n\n",
+        groups=[
+            ("**Recent Promises Made:**\n", context.get("promises", [])[:promise_limit], "\n"),
+            ("**Current Goals:**\n", context.get("goals", [])[:goal_limit], "\n"),
+            ("**Recent Progress:**\n", context.get("progress", [])[:progress_limit], "\n"),
+        ],
+        footer="*Use this context to reference past conversations and track progress.*\n",
+    )
+
+
+def fallback_context_section(
+    context: Dict[str, List[str]],
+    limits: Optional[Tuple[int, int, int]] = (3, 3, 3),
+) -> PromptSection:
+    """User context appended to the fallback Future You prompt (limits=None: no caps)"""
+    promise_limit, goal_limit, progress_limit = limits or (None, None, None)
+    return PromptSection(
+        header="\n\nUser Context (from previous calls):\n",
+        groups=[
+            ("Recent Promises:\n", context.get("promises", [])[:promise_limit], ""),
+            ("Current Goals:\n", context.get("goals", [])[:goal_limit], ""),
+            ("Recent Progress:\n", context.get("progress", [])[:progress_limit], ""),
+        ],
+    )
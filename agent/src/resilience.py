@@ -0,0 +1,225 @@
+"""
+Latency-aware remote calls for You+ Agent
+Latency histogram, adaptive deadlines, hedged requests and a circuit breaker
+"""
+
+import time
+import asyncio
+import bisect
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in milliseconds (Prometheus-style, cumulative)
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000)
+
+
+class LatencyHistogram:
+    """
+    Fixed buckets for export plus a window of recent samples for percentiles
+
+    Percentiles come from the last `window` samples so deadlines follow the
+    current behaviour of the remote service rather than its whole history.
+    """
+
+    def __init__(self, buckets_ms: Tuple[float, ...] = DEFAULT_BUCKETS_MS, window: int = 512):
+        self.bounds = tuple(sorted(buckets_ms))
+        self.counts = [0] * (len(self.bounds) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum_ms = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def record(self, latency_ms: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, latency_ms)] += 1
+        self.count += 1
+        self.sum_ms += latency_ms
+        self._recent.append(latency_ms)
+
+    @property
+    def samples(self) -> int:
+        """Samples in the percentile window"""
+        return len(self._recent)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q in [0, 1] over recent samples, None without data"""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1)))]
+
+    def buckets(self) -> List[Tuple[str, int]]:
+        """Cumulative (le, count) pairs, ending with +Inf"""
+        cumulative, total = [], 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            cumulative.append(("+Inf" if bound == float("inf") else f"{bound:g}", total))
+        return cumulative
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "buckets": self.buckets(),
+        }
+
+
+class AdaptiveDeadline:
+    """
+    Request deadline and hedge delay derived from observed latency
+
+    Until `min_samples` latencies are known the fixed ceiling is used and no
+    hedging happens. Afterwards the deadline is p99 * multiplier clamped to
+    [floor, ceiling], and a hedge is sent once a request outlives the p95.
+    """
+
+    def __init__(
+        self,
+        histogram: LatencyHistogram,
+        ceiling: float,
+        floor: float = 0.3,
+        multiplier: float = 1.5,
+        min_samples: int = 20,
+    ):
+        self.histogram = histogram
+        self.ceiling = ceiling
+        self.floor = floor
+        self.multiplier = multiplier
+        self.min_samples = min_samples
+
+    def deadline(self) -> float:
+        """Seconds to wait for a request (including any hedge)"""
+        if self.histogram.samples < self.min_samples:
+            return self.ceiling
+        p99 = self.histogram.percentile(0.99) / 1000
+        return min(self.ceiling, max(self.floor, p99 * self.multiplier))
+
+    def hedge_delay(self) -> Optional[float]:
+        """Seconds after which to send a duplicate request, None to not hedge"""
+        if self.histogram.samples < self.min_samples:
+            return None
+        return self.histogram.percentile(0.95) / 1000
+
+
+class CircuitBreaker:
+    """
+    Skips calls to a failing dependency
+
+    Opens after `failure_threshold` consecutive failures. After
+    `reset_timeout` seconds one trial call is let through (half-open); its
+    outcome closes the breaker or re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("✅ Circuit breaker closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"⚠️ Circuit breaker opened after {self.consecutive_failures} failures "
+                    f"(retry in {self.reset_timeout:.0f}s)"
+                )
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+async def hedged_call(
+    call: Callable[[], Awaitable[Any]],
+    deadline: float,
+    hedge_delay: Optional[float] = None,
+) -> Tuple[Any, int]:
+    """
+    Run `call`, sending one duplicate if the first is slower than `hedge_delay`
+
+    The first attempt to return without raising wins and the other is
+    cancelled.
+
+    Returns:
+        (result, index of the winning attempt: 0 original, 1 hedge)
+
+    Raises:
+        asyncio.TimeoutError: nothing succeeded within `deadline` seconds
+        Exception: the last attempt's error if every attempt failed
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    attempts: List[asyncio.Future] = [asyncio.ensure_future(call())]
+    pending = set(attempts)
+    last_error: Optional[BaseException] = None
+
+    try:
+        while pending:
+            now = loop.time()
+            remaining = deadline - (now - started)
+            if remaining <= 0:
+                break
+
+            can_hedge = hedge_delay is not None and len(attempts) == 1 and hedge_delay < deadline
+            wait_for = min(remaining, max(0.0, hedge_delay - (now - started))) if can_hedge else remaining
+            done, pending = await asyncio.wait(pending, timeout=wait_for, return_when=asyncio.FIRST_COMPLETED)
+
+            for attempt in done:
+                if attempt.exception() is None:
+                    return attempt.result(), attempts.index(attempt)
+                last_error = attempt.exception()
+
+            if can_hedge and pending and loop.time() - started >= hedge_delay:
+                # Original is still outstanding past the hedge point: send the duplicate
+                hedge = asyncio.ensure_future(call())
+                attempts.append(hedge)
+                pending.add(hedge)
+
+        if last_error is not None and not pending:
+            raise last_error
+        raise asyncio.TimeoutError(f"no response within {deadline:.2f}s")
+    finally:
+        for attempt in attempts:
+            if not attempt.done():
+                attempt.cancel()
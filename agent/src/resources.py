@@ -0,0 +1,173 @@
+"""
+Per-worker resource pool for the You+ Agent
+Loads the Silero VAD model once per profile and keeps warm Cartesia/OpenAI clients across jobs
+"""
+
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from livekit.plugins import openai, cartesia, silero
+
+from config import VAD_CONFIG, silero_vad_options
+from tts_cache import CachedTTS, TTSCache
+
+logger = logging.getLogger(__name__)
+
+
+class ResourcePool:
+    """
+    Hands out shared plugin instances to calls on this worker
+
+    Plugin objects are factories (each call opens its own STT/TTS/VAD stream),
+    so one instance can serve many concurrent calls. TTS is keyed on voice id
+    because the voice is fixed per instance; those are kept in a bounded LRU.
+    VAD thresholds are fixed per instance too, so there is one per profile.
+    With a TTSCache, TTS instances are wrapped so whole-string synthesis is
+    served from cached audio.
+    """
+
+    def __init__(
+        self,
+        cartesia_api_key: Optional[str],
+        stt_model: str = "ink",
+        tts_model: str = "sonic-3",
+        llm_model: str = "gpt-4o-mini",
+        max_tts_voices: int = 32,
+        tts_cache: Optional[TTSCache] = None,
+    ):
+        self.cartesia_api_key = cartesia_api_key
+        self.stt_model = stt_model
+        self.tts_model = tts_model
+        self.llm_model = llm_model
+        self.max_tts_voices = max_tts_voices
+        self.tts_cache = tts_cache
+
+        self._resources: "OrderedDict[str, Any]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    async def warm(self, voice_id: str = "default") -> None:
+        """Load everything a typical call needs (started by the job process's first call)"""
+        await asyncio.gather(
+            self.get_llm(),
+            self.get_stt(),
+            self.get_tts(voice_id),
+            *(self.get_vad(profile) for profile in VAD_CONFIG),
+        )
+
+    async def get_llm(self):
+        """Shared OpenAI LLM client"""
+        async def load():
+            return openai.LLM.with_model(model=self.llm_model)
+
+        return await self._acquire("llm", "llm", load)
+
+    async def get_stt(self):
+        """Shared Cartesia STT client"""
+        async def load():
+            return await cartesia.STT.create(
+                api_key=self.cartesia_api_key,
+                model=self.stt_model,
+            )
+
+        return await self._acquire("stt", "stt", load)
+
+    async def get_tts(self, voice_id: Optional[str] = None):
+        """Cartesia TTS client for a voice (one warm instance per voice id)"""
+        voice = voice_id or "default"
+
+        async def load():
+            client = await cartesia.TTS.create(
+                api_key=self.cartesia_api_key,
+                model=self.tts_model,
+                voice=voice,
+            )
+            if self.tts_cache is None:
+                return client
+            return CachedTTS(client, self.tts_cache, voice=voice, model=self.tts_model)
+
+        return await self._acquire(f"tts:{voice}", "tts", load)
+
+    async def get_vad(self, profile: str = "balanced"):
+        """Silero VAD for a VAD_CONFIG profile, loaded once per process"""
+        if profile not in VAD_CONFIG:
+            profile = "balanced"
+
+        async def load():
+            # Model load is CPU bound, keep it off the event loop
+            return await asyncio.to_thread(silero.VAD.load, **silero_vad_options(profile))
+
+        return await self._acquire(f"vad:{profile}", "vad", load)
+
+    def load_vad_models(self) -> None:
+        """Load every profile's Silero VAD on the calling thread (for the sync prewarm_fnc)"""
+        for profile in VAD_CONFIG:
+            key = f"vad:{profile}"
+            if key in self._resources:
+                continue
+            self._metrics.setdefault(
+                "vad", {"hits": 0, "misses": 0, "load_ms_total": 0.0, "last_load_ms": 0.0}
+            )["misses"] += 1
+            start = time.perf_counter()
+            vad = silero.VAD.load(**silero_vad_options(profile))
+            self._store(key, "vad", vad, (time.perf_counter() - start) * 1000)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Hit/miss counts and load times per resource kind"""
+        return {kind: dict(values) for kind, values in self._metrics.items()}
+
+    async def _acquire(
+        self,
+        key: str,
+        kind: str,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        metrics = self._metrics.setdefault(
+            kind, {"hits": 0, "misses": 0, "load_ms_total": 0.0, "last_load_ms": 0.0}
+        )
+
+        if key in self._resources:
+            self._resources.move_to_end(key)
+            metrics["hits"] += 1
+            return self._resources[key]
+
+        metrics["misses"] += 1
+        future = self._loading.get(key)
+        if future is None:
+            # Concurrent misses for the same key share one load
+            future = asyncio.ensure_future(self._load(key, kind, loader))
+            self._loading[key] = future
+            future.add_done_callback(lambda _: self._loading.pop(key, None))
+
+        return await asyncio.shield(future)
+
+    async def _load(
+        self,
+        key: str,
+        kind: str,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        start = time.perf_counter()
+        resource = await loader()
+        self._store(key, kind, resource, (time.perf_counter() - start) * 1000)
+        return resource
+
+    def _store(self, key: str, kind: str, resource: Any, load_ms: float) -> None:
+        metrics = self._metrics[kind]
+        metrics["load_ms_total"] += load_ms
+        metrics["last_load_ms"] = load_ms
+        logger.info(f"♻️ Resource pool loaded {key} in {load_ms:.0f}ms")
+
+        self._resources[key] = resource
+        self._evict_tts()
+
+    def _evict_tts(self) -> None:
+        """Drop least recently used TTS voices beyond the limit"""
+        tts_keys = [key for key in self._resources if key.startswith("tts:")]
+        for key in tts_keys[: max(0, len(tts_keys) - self.max_tts_voices)]:
+            # Calls already holding the instance keep using it
+            del self._resources[key]
+            logger.debug(f"Resource pool evicted {key}")
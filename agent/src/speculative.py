@@ -0,0 +1,226 @@
+"""
+Speculative LLM turns for You+ Agent
+Starts the reply from a stable interim transcript and hands it to the pipeline when the final transcript agrees
+"""
+
+import os
+import re
+import time
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from livekit.agents import llm, stt
+
+from answers import bare_binary_answer
+from context_window import message_text
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[\w']+")
+
+
+def normalize_transcript(text: str) -> str:
+    """Lowercase words only, so punctuation and casing changes between interim and final don't count"""
+    return " ".join(_WORD.findall(text.lower()))
+
+
+def transcripts_agree(speculated: str, final: str) -> bool:
+    """Whether a reply generated for `speculated` is still right for `final`"""
+    if normalize_transcript(speculated) == normalize_transcript(final):
+        return True
+    # "Yes." vs "yes I did" get the same answer from a binary question; "Yes but
+    # I skipped the gym" does not, so anything past a bare answer disagrees
+    answer = bare_binary_answer(speculated)
+    return answer is not None and answer == bare_binary_answer(final)
+
+
+def _last_user_index(messages: List[llm.ChatMessage]) -> int:
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].role == "user":
+            return index
+    return -1
+
+
+def _request_signature(messages: List[llm.ChatMessage]) -> List[Tuple[str, Optional[str]]]:
+    """Roles and texts of a request, with the newest user message's text left to transcripts_agree"""
+    user_index = _last_user_index(messages)
+    return [
+        (message.role, None if index == user_index else message_text(message))
+        for index, message in enumerate(messages)
+    ]
+
+
+class _Speculation:
+    __slots__ = ("text", "signature", "stream")
+
+    def __init__(self, text: str, signature: List[Tuple[str, Optional[str]]], stream: llm.LLMStream):
+        self.text = text
+        self.signature = signature
+        self.stream = stream
+
+
+class SpeculativeTurns:
+    """
+    Early LLM requests from interim transcripts, one call's worth
+
+    Nothing starts while the VAD reports speech: the caller may still be
+    adding "but..." to a yes. Once they stop, a bare yes/no interim starts
+    an LLM request at once; other interim text of at most `max_words` words
+    starts one after it has been unchanged for `stable_ms`. `context(text)` builds the request the turn
+    would send for that text; the stream is left unconsumed, so its chunks
+    buffer while endpointing and the final transcript are still pending.
+
+    `take()` runs in before_llm_cb: if the
+    final user message agrees with the speculated text and the rest of the
+    request is unchanged, the running stream is returned to the pipeline;
+    otherwise it is closed and the normal request goes out. At most `max_per_turn`
+    requests are started per user turn to bound wasted tokens.
+    """
+
+    def __init__(
+        self,
+        llm_client: llm.LLM,
+        context: Callable[[str], llm.ChatContext],
+        stable_ms: float = 200.0,
+        max_words: int = 12,
+        max_per_turn: int = 2,
+    ):
+        self.llm = llm_client
+        self.context = context  # User text -> the LLM request its reply would be generated from
+        self.stable_ms = stable_ms
+        self.max_words = max_words
+        self.max_per_turn = max_per_turn
+
+        self._current: Optional[_Speculation] = None
+        self._interim = ""
+        self._interim_at = 0.0
+        self._user_speaking = False
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._turn_started = 0
+
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+
+    def attach(self, agent: Any) -> None:
+        """Follow the agent's VAD events"""
+        agent.on("user_started_speaking", lambda *_: self.user_started_speaking())
+        agent.on("user_stopped_speaking", lambda *_: self.user_stopped_speaking())
+
+    def user_started_speaking(self) -> None:
+        self._user_speaking = True
+        self._cancel_timer()
+
+    def user_stopped_speaking(self) -> None:
+        self._user_speaking = False
+        self._schedule()
+
+    def on_speech_event(self, event: Any) -> None:
+        """STT event tap (see call_plugins.CallSTT)"""
+        if event.type == stt.SpeechEventType.START_OF_SPEECH:
+            self._interim = ""
+        elif event.type == stt.SpeechEventType.INTERIM_TRANSCRIPT and event.alternatives:
+            self._on_interim(event.alternatives[0].text)
+
+    def _on_interim(self, text: str) -> None:
+        normalized = normalize_transcript(text)
+        if normalized == normalize_transcript(self._interim):
+            return
+        self._interim = text
+        self._interim_at = time.monotonic()
+        self._cancel_timer()
+        if self._current is not None and not transcripts_agree(self._current.text, text):
+            # The user kept talking past what was speculated
+            self._discard(self._current)
+        if not self._user_speaking:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Start once the current interim text has been stable for `stable_ms` (a bare yes/no at once)"""
+        self._cancel_timer()
+        if not self._interim:
+            return
+        if bare_binary_answer(self._interim):
+            self._start()
+            return
+        remaining = self.stable_ms / 1000 - (time.monotonic() - self._interim_at)
+        if remaining <= 0:
+            self._start()
+        else:
+            self._timer = asyncio.get_running_loop().call_later(remaining, self._start)
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _start(self) -> None:
+        self._timer = None
+        text = self._interim
+        normalized = normalize_transcript(text)
+        if not normalized or len(normalized.split()) > self.max_words or self._current is not None:
+            return
+        if self._turn_started >= self.max_per_turn:
+            return
+
+        chat_ctx = self.context(text)
+        signature = _request_signature(chat_ctx.messages)
+        self._current = _Speculation(text, signature, self.llm.chat(chat_ctx=chat_ctx))
+        self._turn_started += 1
+        self.started += 1
+        logger.debug(f"🧠 Speculative LLM turn started on interim transcript: {text!r}")
+
+    def take(self, chat_ctx: llm.ChatContext) -> Optional[llm.LLMStream]:
+        """
+        The speculative stream if it answers `chat_ctx` (the final request), else None
+
+        Always ends the turn: a speculation that is not returned is closed.
+        """
+        self._cancel_timer()
+        self._turn_started = 0
+        self._interim = ""
+        speculation, self._current = self._current, None
+        if speculation is None:
+            return None
+
+        messages = chat_ctx.messages
+        user_index = _last_user_index(messages)
+        if (
+            user_index >= 0
+            and transcripts_agree(speculation.text, message_text(messages[user_index]))
+            and _request_signature(messages) == speculation.signature
+        ):
+            self.used += 1
+            logger.debug(f"🧠 Speculative LLM turn used for {message_text(messages[user_index])!r}")
+            return speculation.stream
+
+        self._discard(speculation)
+        return None
+
+    def _discard(self, speculation: _Speculation) -> None:
+        if speculation is self._current:
+            self._current = None
+        self.discarded += 1
+        asyncio.ensure_future(speculation.stream.aclose())
+
+    async def aclose(self) -> None:
+        self._cancel_timer()
+        if self._current is not None:
+            await self._current.stream.aclose()
+            self._current = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"started": self.started, "used": self.used, "discarded": self.discarded}
+
+
+def init_speculation(llm_client: llm.LLM, context: Callable[[str], llm.ChatContext]) -> Optional[SpeculativeTurns]:
+    """Speculative turns from environment variables (None when SPECULATIVE_LLM is off)"""
+    if os.getenv("SPECULATIVE_LLM", "true").lower() != "true":
+        return None
+    return SpeculativeTurns(
+        llm_client,
+        context,
+        stable_ms=float(os.getenv("SPECULATIVE_STABLE_MS", "200")),
+        max_words=int(os.getenv("SPECULATIVE_MAX_WORDS", "12")),
+    )
@@ -0,0 +1,138 @@
+"""
+SSML-aware sentence chunking for You+ Agent
+Splits Cartesia SSML into sentence segments that can be synthesized independently and streamed to TTS
+"""
+
+import re
+import logging
+from typing import AsyncIterator, Dict, List
+
+logger = logging.getLogger(__name__)
+
+_TAG = re.compile(r"<[^<>]*>")
+_TAG_NAME = re.compile(r"</?\s*([A-Za-z_][\w-]*)")
+# Sentence punctuation (with trailing quotes/brackets) followed by whitespace or end of text
+_SENTENCE_END = re.compile(r"[.!?]+[\"')\]]*(?=\s|$)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Self-closing Cartesia tags whose effect lasts until the next tag of the same name
+PROSODY_TAGS = ("emotion", "speed", "volume")
+
+# Segments shorter than this (visible characters) are merged into the next one
+MIN_SEGMENT_CHARS = 10
+
+_ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "st.", "vs.", "e.g.", "i.e.", "etc.", "a.m.", "p.m."}
+
+
+def _is_abbreviation(sentence: str) -> bool:
+    """Whether a sentence "ends" on a title like Mr. or Dr. rather than a full stop"""
+    words = sentence.rstrip().split()
+    return bool(words) and words[-1].lower() in _ABBREVIATIONS
+
+
+def plain_text(ssml: str) -> str:
+    """Visible text of an SSML string (tags removed, whitespace collapsed)"""
+    return _WHITESPACE.sub(" ", _TAG.sub(" ", ssml)).strip()
+
+
+def split_ssml(text: str, min_chars: int = MIN_SEGMENT_CHARS) -> List[str]:
+    """
+    Split SSML into sentence segments without breaking tags
+
+    Segments end at sentence punctuation or after a `<break/>` tag, never
+    inside a paired tag such as `<spell>...</spell>`. Prosody tags
+    (emotion/speed/volume) in force when a segment starts are repeated at its
+    head, so each segment sounds the same when synthesized on its own.
+
+    Args:
+        text: Cartesia SSML (plain text works too)
+        min_chars: Minimum visible characters before a segment may end
+
+    Returns:
+        Segments whose concatenation (space-joined) speaks like `text`
+    """
+    segments: List[str] = []
+    state: Dict[str, str] = {}  # prosody tag name -> last tag seen
+    carried: Dict[str, str] = {}  # prosody to repeat at the head of the current segment
+    parts: List[str] = []
+    visible = 0
+    open_tags: List[str] = []
+    at_boundary = False  # a sentence ended; the segment closes before the next spoken text
+
+    def flush() -> None:
+        nonlocal parts, visible, carried, at_boundary
+        body = "".join(parts).strip()
+        if body:
+            segments.append("".join(carried.values()) + body)
+        parts, visible, at_boundary = [], 0, False
+        carried = dict(state)
+
+    def add_text(chunk: str) -> None:
+        nonlocal visible, at_boundary
+        position = 0
+        for end in _SENTENCE_END.finditer(chunk):
+            sentence = chunk[position:end.end()]
+            if at_boundary and sentence.strip():
+                flush()
+                sentence = sentence.lstrip()
+            parts.append(sentence)
+            visible += len(sentence.strip())
+            position = end.end()
+            if not open_tags and visible >= min_chars and not _is_abbreviation(sentence):
+                at_boundary = True
+        rest = chunk[position:]
+        if at_boundary and rest.strip():
+            flush()
+        if rest:
+            parts.append(rest if parts else rest.lstrip())
+            visible += len(rest.strip())
+
+    position = 0
+    for match in _TAG.finditer(text):
+        add_text(text[position:match.start()])
+        position = match.end()
+        tag = match.group(0)
+        name_match = _TAG_NAME.match(tag)
+        name = name_match.group(1).lower() if name_match else ""
+
+        if tag.startswith("</"):
+            parts.append(tag)
+            if name in open_tags:
+                del open_tags[len(open_tags) - 1 - open_tags[::-1].index(name):]
+        elif tag.endswith("/>") and name == "break":
+            # A pause belongs to the sentence before it
+            parts.append(tag)
+            if not open_tags and (at_boundary or visible >= min_chars):
+                flush()
+        else:
+            if at_boundary:
+                flush()
+            parts.append(tag)
+            if not tag.endswith("/>"):
+                open_tags.append(name)
+            elif name in PROSODY_TAGS:
+                state[name] = tag
+                if visible == 0:
+                    # The segment sets its own prosody before speaking
+                    carried.pop(name, None)
+    add_text(text[position:])
+
+    tail = "".join(parts).strip()
+    if tail and visible == 0 and segments:
+        # Trailing tags only: keep them with the last sentence
+        segments[-1] += tail
+    elif tail:
+        segments.append("".join(carried.values()) + tail)
+    return segments
+
+
+async def stream_ssml(text: str, min_chars: int = MIN_SEGMENT_CHARS) -> AsyncIterator[str]:
+    """
+    Yield `text` sentence by sentence for `agent.say`
+
+    Passing an async iterable lets the pipeline push each sentence to TTS as
+    its own input, so audio starts once the first sentence is synthesized.
+    """
+    segments = split_ssml(text, min_chars)
+    for index, segment in enumerate(segments):
+        yield segment if index == len(segments) - 1 else segment + " "
@@ -0,0 +1,90 @@
+"""
+Per-call stage timing for the You+ Agent
+Records when each startup stage ran so the critical path of a call is visible in logs
+"""
+
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CallTimeline:
+    """Start/end offsets (ms since call start) for named stages of one call"""
+
+    def __init__(self, call_id: str):
+        self.call_id = call_id
+        self._origin = time.perf_counter()
+        self.stages: Dict[str, Tuple[float, float]] = {}
+
+    def now_ms(self) -> float:
+        """Milliseconds elapsed since the call started"""
+        return (time.perf_counter() - self._origin) * 1000
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of (sync or async) code as one stage"""
+        start = self.now_ms()
+        try:
+            yield
+        finally:
+            self.stages[name] = (start, self.now_ms())
+
+    def mark(self, name: str) -> None:
+        """Record a zero-length milestone (e.g. agent_started)"""
+        now = self.now_ms()
+        self.stages[name] = (now, now)
+
+    def duration_ms(self, name: str) -> Optional[float]:
+        """Duration of a recorded stage, or None if it never ran"""
+        if name not in self.stages:
+            return None
+        start, end = self.stages[name]
+        return end - start
+
+    def critical_path(self, milestone: str) -> List[str]:
+        """
+        Stages that gated a milestone, latest-finishing first
+
+        Walks backwards from the milestone, each time picking the stage that
+        finished last before the current one started (the innermost one when
+        nested stages finish together).
+        """
+        if milestone not in self.stages:
+            return []
+
+        path = [milestone]
+        cursor = self.stages[milestone][0]
+        remaining = {k: v for k, v in self.stages.items() if k != milestone}
+        while True:
+            candidates = [
+                (end, start, name) for name, (start, end) in remaining.items()
+                if end <= cursor + 0.5 and end > start
+            ]
+            if not candidates:
+                break
+            latest_end = max(candidate[0] for candidate in candidates)
+            _, _, name = max(
+                (start, end, name) for end, start, name in candidates
+                if end >= latest_end - 0.5
+            )
+            path.append(name)
+            cursor = remaining.pop(name)[0]
+        return path
+
+    def summary(self) -> str:
+        """One line per stage, ordered by start time"""
+        lines = []
+        for name, (start, end) in sorted(self.stages.items(), key=lambda item: item[1]):
+            lines.append(f"   {name}: +{start:.0f}ms ({end - start:.0f}ms)")
+        return "\n".join(lines)
+
+    def log_summary(self, milestone: Optional[str] = None) -> None:
+        """Log all stage timings, plus the critical path to `milestone` if given"""
+        message = f"⏱️ Call timeline ({self.call_id}):\n{self.summary()}"
+        if milestone:
+            path = " ← ".join(self.critical_path(milestone))
+            message += f"\n   Critical path: {path}"
+        logger.info(message)
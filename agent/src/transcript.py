@@ -0,0 +1,114 @@
+"""
+Compact call transcript storage for You+ Agent
+One UTF-8 text buffer plus array-backed per-turn offsets, speakers and timestamps
+"""
+
+import time
+import bisect
+import logging
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Transcript:
+    """
+    Append-only transcript of a call
+
+    The buffer holds the rendered transcript ("speaker: text" lines joined by
+    newlines) so rendering is a single decode, and per-turn arrays hold byte
+    offsets into it. Speaker names are interned to small integer ids.
+    """
+
+    __slots__ = (
+        "_origin",
+        "_buffer",
+        "_speakers",
+        "_speaker_ids",
+        "_turn_speaker",
+        "_turn_time",
+        "_line_start",
+        "_text_start",
+    )
+
+    def __init__(self):
+        self._origin = time.monotonic()
+        self._buffer = bytearray()
+        self._speakers: List[str] = []
+        self._speaker_ids: Dict[str, int] = {}
+        self._turn_speaker = array("H")
+        self._turn_time = array("d")  # seconds since the transcript started
+        self._line_start = array("Q")  # byte offset of "speaker: text"
+        self._text_start = array("Q")  # byte offset of "text"
+
+    def append(self, speaker: str, text: str, timestamp: Optional[float] = None) -> int:
+        """
+        Add one utterance
+
+        Args:
+            speaker: Speaker label (e.g. "agent", "user")
+            text: Utterance text
+            timestamp: Seconds since call start (defaults to now)
+
+        Returns:
+            Index of the new turn
+        """
+        speaker_id = self._speaker_ids.get(speaker)
+        if speaker_id is None:
+            speaker_id = len(self._speakers)
+            self._speakers.append(speaker)
+            self._speaker_ids[speaker] = speaker_id
+
+        if self._buffer:
+            self._buffer += b"\n"
+        self._line_start.append(len(self._buffer))
+        self._buffer += speaker.encode("utf-8") + b": "
+        self._text_start.append(len(self._buffer))
+        self._buffer += text.encode("utf-8")
+
+        self._turn_speaker.append(speaker_id)
+        self._turn_time.append(
+            time.monotonic() - self._origin if timestamp is None else timestamp
+        )
+        return len(self._turn_speaker) - 1
+
+    def __len__(self) -> int:
+        return len(self._turn_speaker)
+
+    def __iter__(self) -> Iterator[Tuple[str, str, float]]:
+        for index in range(len(self)):
+            yield self.turn(index)
+
+    def turn(self, index: int) -> Tuple[str, str, float]:
+        """(speaker, text, timestamp) of one turn"""
+        end = self._turn_end(index)
+        text = self._buffer[self._text_start[index]:end].decode("utf-8")
+        return self._speakers[self._turn_speaker[index]], text, self._turn_time[index]
+
+    def render(self, start: int = 0, stop: Optional[int] = None) -> str:
+        """Turns [start, stop) as "speaker: text" lines joined by newlines"""
+        count = len(self)
+        stop = count if stop is None else min(stop, count)
+        if start >= stop:
+            return ""
+        if start == 0 and stop == count:
+            return self._buffer.decode("utf-8")
+        return self._buffer[self._line_start[start]:self._turn_end(stop - 1)].decode("utf-8")
+
+    def render_between(self, start_time: float, end_time: float) -> str:
+        """Turns whose timestamps fall within [start_time, end_time)"""
+        start = bisect.bisect_left(self._turn_time, start_time)
+        stop = bisect.bisect_left(self._turn_time, end_time)
+        return self.render(start, stop)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the transcript data"""
+        arrays = (self._turn_speaker, self._turn_time, self._line_start, self._text_start)
+        return len(self._buffer) + sum(a.itemsize * len(a) for a in arrays)
+
+    def _turn_end(self, index: int) -> int:
+        if index + 1 < len(self._line_start):
+            return self._line_start[index + 1] - 1  # exclude the separating newline
+        return len(self._buffer)
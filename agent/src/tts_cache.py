@@ -0,0 +1,335 @@
+"""
+Content-addressed TTS audio cache for You+ Agent
+Disk LRU of synthesized audio keyed on (voice, model, SSML text), served through a TTS wrapper
+"""
+
+import os
+import time
+import wave
+import asyncio
+import hashlib
+import itertools
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from livekit import rtc
+from livekit.agents import tts
+
+from call_plugins import MetricsRelay
+
+logger = logging.getLogger(__name__)
+
+# Cached audio is replayed in 20ms frames, like a live TTS stream
+FRAME_MS = 20
+
+# Pre-rendered utterances held in memory until their call plays them
+MAX_PRELOADED = 64
+
+_PLAYBACK_IDS = itertools.count()
+
+
+class CachedAudio:
+    """Decoded 16-bit PCM for one cached utterance"""
+
+    __slots__ = ("sample_rate", "num_channels", "pcm")
+
+    def __init__(self, sample_rate: int, num_channels: int, pcm: bytes):
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.pcm = pcm
+
+    def frames(self, frame_ms: int = FRAME_MS) -> List[rtc.AudioFrame]:
+        samples_per_frame = self.sample_rate * frame_ms // 1000
+        frame_bytes = samples_per_frame * self.num_channels * 2
+        frames = []
+        for offset in range(0, len(self.pcm), frame_bytes):
+            chunk = self.pcm[offset:offset + frame_bytes]
+            frames.append(rtc.AudioFrame(
+                data=chunk,
+                sample_rate=self.sample_rate,
+                num_channels=self.num_channels,
+                samples_per_channel=len(chunk) // (2 * self.num_channels),
+            ))
+        return frames
+
+
+def cache_key(voice: str, model: str, text: str) -> str:
+    """Content address of an utterance"""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in (voice, model, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class TTSCache:
+    """
+    On-disk LRU of synthesized utterances
+
+    Each entry is a WAV file named by its content address. Files are written
+    to a temporary name and renamed into place, so worker processes sharing
+    the directory never read partial audio. Each process evicts by its own
+    view of recency (file mtime, bumped on every hit) down to `max_bytes`.
+    All file I/O runs on one dedicated thread.
+
+    Only `register`ed phrases are cached: fixed utterances that recur across
+    calls (fallback openings, acknowledgments). Anything else, however
+    short, is one-off and personalised; it is streamed live and never
+    written. Audio rendered elsewhere (e.g. a backend-generated first
+    message) can be `preload`ed in memory for one playback. Without a
+    directory only preloads are served.
+    """
+
+    def __init__(self, directory: Optional[str], max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._phrases: Set[str] = set()
+        self._index: Optional["OrderedDict[str, int]"] = None  # key -> size, oldest first
+        self._bytes = 0
+        self._preloaded: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-cache")
+
+        self.hits = 0
+        self.misses = 0
+        self.preload_hits = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    def register(self, texts: Iterable[str]) -> None:
+        """Allow `texts` into the cache: fixed phrases that recur across calls"""
+        self._phrases.update(text for text in texts if text)
+
+    def cacheable(self, text: str) -> bool:
+        """Registered recurring phrases are cached; everything else is not"""
+        return bool(self.directory) and text in self._phrases
+
+    def preload(self, voice: str, model: str, text: str, audio: CachedAudio) -> None:
+        """Hold pre-rendered audio for the next `get` of this utterance"""
+        key = cache_key(voice, model, text)
+        self._preloaded[key] = audio
+        self._preloaded.move_to_end(key)
+        while len(self._preloaded) > MAX_PRELOADED:
+            self._preloaded.popitem(last=False)
+
+    def is_preloaded(self, voice: str, model: str, text: str) -> bool:
+        return cache_key(voice, model, text) in self._preloaded
+
+    async def get(self, voice: str, model: str, text: str) -> Optional[CachedAudio]:
+        key = cache_key(voice, model, text)
+        preloaded = self._preloaded.pop(key, None)
+        if preloaded is not None:
+            self.preload_hits += 1
+            return preloaded
+        audio = await self._run(self._read, key) if self.directory else None
+        if audio is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return audio
+
+    async def contains(self, voice: str, model: str, text: str) -> bool:
+        """Whether the utterance is on disk, without counting a hit or miss"""
+        if not self.cacheable(text):
+            return False
+        return bool(await self._run(self._contains, cache_key(voice, model, text)))
+
+    async def put(self, voice: str, model: str, text: str, audio: CachedAudio) -> None:
+        if self.cacheable(text) and await self._run(self._write, cache_key(voice, model, text), audio):
+            self.writes += 1
+
+    async def aclose(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "preload_hits": self.preload_hits,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "entries": len(self._index or ()),
+            "bytes": self._bytes,
+        }
+
+    # ------------------------------------------------------------------
+    # Files (cache thread only)
+    # ------------------------------------------------------------------
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, fn, *args)
+        except (OSError, EOFError, wave.Error) as e:
+            self.errors += 1
+            logger.error(f"❌ TTS cache error: {e}")
+            return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.wav")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            os.makedirs(self.directory, exist_ok=True)
+            for root, _, files in os.walk(self.directory):
+                for name in files:
+                    if name.endswith(".wav"):
+                        stat = os.stat(os.path.join(root, name))
+                        entries.append((stat.st_mtime, name[:-4], stat.st_size))
+            self._index = OrderedDict((key, size) for _, key, size in sorted(entries))
+            self._bytes = sum(self._index.values())
+            logger.info(f"♻️ TTS cache: {len(self._index)} entries ({self._bytes / 1e6:.1f} MB) in {self.directory}")
+        return self._index
+
+    def _contains(self, key: str) -> bool:
+        return key in self._load_index() or os.path.exists(self._path(key))
+
+    def _read(self, key: str) -> Optional[CachedAudio]:
+        index = self._load_index()
+        path = self._path(key)
+        try:
+            with wave.open(path, "rb") as wav:
+                audio = CachedAudio(wav.getframerate(), wav.getnchannels(), wav.readframes(wav.getnframes()))
+        except FileNotFoundError:
+            self._bytes -= index.pop(key, 0)
+            return None
+        # Written by another worker process since the index was built
+        if key not in index:
+            index[key] = os.path.getsize(path)
+            self._bytes += index[key]
+        index.move_to_end(key)
+        os.utime(path)
+        return audio
+
+    def _write(self, key: str, audio: CachedAudio) -> bool:
+        index = self._load_index()
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with wave.open(temp_path, "wb") as wav:
+            wav.setnchannels(audio.num_channels)
+            wav.setsampwidth(2)
+            wav.setframerate(audio.sample_rate)
+            wav.writeframes(audio.pcm)
+        os.replace(temp_path, path)
+
+        self._bytes -= index.pop(key, 0)
+        index[key] = os.path.getsize(path)
+        self._bytes += index[key]
+        while self._bytes > self.max_bytes and len(index) > 1:
+            old_key, size = index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+        return True
+
+
+class CachedTTS(tts.TTS):
+    """
+    TTS wrapper that serves `synthesize()` from a TTSCache
+
+    The pipeline uses `synthesize()` for whole strings passed to
+    `agent.say` (openings, canned phrases) and `stream()` for LLM output;
+    only the former is cached, streams go straight to the wrapped TTS.
+    The wrapped TTS's metrics for streams handed out unchanged are
+    re-emitted here, where the pipeline listens.
+    """
+
+    def __init__(self, inner: tts.TTS, cache: TTSCache, voice: str, model: str):
+        super().__init__(
+            capabilities=inner.capabilities,
+            sample_rate=inner.sample_rate,
+            num_channels=inner.num_channels,
+        )
+        self.inner = inner
+        self.cache = cache
+        self.voice = voice
+        self.model = model
+        self._warmed: Set[str] = set()  # Texts already rendered or being rendered by warm()
+        # Cached playbacks emit their own metrics; only pass-through streams are relayed
+        self._relay = MetricsRelay(inner, self)
+
+    def synthesize(self, text: str, **kwargs: Any) -> tts.ChunkedStream:
+        if not self.cache.cacheable(text) and not self.cache.is_preloaded(self.voice, self.model, text):
+            return self._relay.tap(self.inner.synthesize(text, **kwargs))
+        return CachedChunkedStream(tts=self, input_text=text, **kwargs)
+
+    def stream(self, **kwargs: Any) -> tts.SynthesizeStream:
+        return self._relay.tap(self.inner.stream(**kwargs))
+
+    async def warm(self, texts: Iterable[str]) -> int:
+        """Register `texts` and synthesize the uncached ones ahead of use; returns how many were rendered"""
+        texts = list(dict.fromkeys(texts))
+        self.cache.register(texts)
+        rendered = 0
+        for text in texts:
+            # The TTS is shared by every call with this voice; concurrent calls warm each text once
+            if text in self._warmed or not self.cache.cacheable(text):
+                continue
+            self._warmed.add(text)
+            if await self.cache.contains(self.voice, self.model, text):
+                continue
+            try:
+                pcm = bytearray()
+                sample_rate, num_channels = self.sample_rate, self.num_channels
+                async for audio in self.inner.synthesize(text):
+                    pcm += audio.frame.data.tobytes()
+                    sample_rate, num_channels = audio.frame.sample_rate, audio.frame.num_channels
+            except Exception as e:
+                self._warmed.discard(text)
+                logger.warning(f"⚠️ TTS cache warm-up failed for {text[:40]!r}: {e}")
+                continue
+            if pcm:
+                await self.cache.put(self.voice, self.model, text, CachedAudio(sample_rate, num_channels, bytes(pcm)))
+                rendered += 1
+        if rendered:
+            logger.info(f"♻️ TTS cache warmed with {rendered} phrases")
+        return rendered
+
+
+class CachedChunkedStream(tts.ChunkedStream):
+    """Replays cached audio, or synthesizes through the wrapped TTS and stores the result"""
+
+    def __init__(self, *, tts: CachedTTS, input_text: str, **kwargs: Any):
+        super().__init__(tts=tts, input_text=input_text, **kwargs)
+        self._cached_tts = tts
+
+    async def _run(self) -> None:
+        owner = self._cached_tts
+        # Unique per playback: calls sharing this TTS tell their metrics apart by request id
+        request_id = f"cache-{cache_key(owner.voice, owner.model, self.input_text)[:12]}-{next(_PLAYBACK_IDS)}"
+        started = time.perf_counter()
+
+        cached = await owner.cache.get(owner.voice, owner.model, self.input_text)
+        if cached is not None:
+            for frame in cached.frames():
+                self._event_ch.send_nowait(tts.SynthesizedAudio(request_id=request_id, frame=frame))
+            logger.debug(f"♻️ TTS cache hit ({(time.perf_counter() - started) * 1000:.0f}ms)")
+            return
+
+        pcm = bytearray()
+        sample_rate, num_channels = owner.sample_rate, owner.num_channels
+        async for audio in owner.inner.synthesize(self.input_text):
+            self._event_ch.send_nowait(audio)
+            pcm += audio.frame.data.tobytes()
+            sample_rate, num_channels = audio.frame.sample_rate, audio.frame.num_channels
+        if pcm and owner.cache.cacheable(self.input_text):
+            # Stored off the playback path; a failed write only costs a future miss
+            asyncio.ensure_future(owner.cache.put(
+                owner.voice, owner.model, self.input_text, CachedAudio(sample_rate, num_channels, bytes(pcm))
+            ))
+
+
+def init_tts_cache() -> TTSCache:
+    """Create the TTS cache from environment variables (TTS_CACHE_DIR empty keeps preloads only)"""
+    return TTSCache(
+        directory=os.getenv("TTS_CACHE_DIR", "/tmp/youplus-tts-cache") or None,
+        max_bytes=int(os.getenv("TTS_CACHE_MAX_BYTES", str(256 * 1024 * 1024))),
+    )